@@ -1,10 +1,12 @@
 import streamlit as st
-import gspread
 import pandas as pd
 import altair as alt
 from datetime import datetime
-from google.oauth2.service_account import Credentials
 from gspread.exceptions import SpreadsheetNotFound
+from clips_core.sheets_client import get_all_records_batch, get_worksheet, limpar_cache
+from clips_core.date_parsing import parse_dates
+from clips_core.vendas import processar_vendas
+from clips_core.moeda import formatar_colunas_reais
 
 # Configuração da página
 st.set_page_config(page_title="Clip's Burger - Sistema de Cadastro", layout="centered")
@@ -16,26 +18,30 @@ with col1:
 with col2:
     st.title("Clip's Burger - Sistema de Cadastro")
 
-def read_google_sheet(worksheet_name):
+def open_worksheet(worksheet_name):
+    """Handle compartilhado da aba (autenticação e open_by_key uma vez por processo), sem baixar os dados."""
     try:
-        SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 
-                  'https://www.googleapis.com/auth/spreadsheets.readonly', 
-                  'https://www.googleapis.com/auth/drive.readonly']
-        credentials_dict = st.secrets["google_credentials"]
-        creds = Credentials.from_service_account_info(credentials_dict, scopes=SCOPES)
-        gc = gspread.authorize(creds)
-        spreadsheet_id = '1NTScbiIna-iE7roQ9XBdjUOssRihTFFby4INAAQNXTg'
-        spreadsheet = gc.open_by_key(spreadsheet_id)
-        worksheet = spreadsheet.worksheet(worksheet_name)
-        rows = worksheet.get_all_records()
-        df = pd.DataFrame(rows)
-        return df, worksheet
+        return get_worksheet(st.secrets["google_credentials"], worksheet_name)
     except SpreadsheetNotFound:
+        limpar_cache()
         st.error(f"Planilha '{worksheet_name}' não encontrada.")
-        return pd.DataFrame(), None
     except Exception as e:
+        limpar_cache()
         st.error(f"Erro de autenticação: {e}")
-        return pd.DataFrame(), None
+    return None
+
+def read_google_sheets(worksheet_names):
+    """Lê várias abas numa única requisição e retorna {aba: DataFrame}."""
+    try:
+        registros = get_all_records_batch(st.secrets["google_credentials"], worksheet_names)
+        return {nome: pd.DataFrame(registros.get(nome, [])) for nome in worksheet_names}
+    except SpreadsheetNotFound:
+        limpar_cache()
+        st.error("Planilha não encontrada.")
+    except Exception as e:
+        limpar_cache()
+        st.error(f"Erro de autenticação: {e}")
+    return {nome: pd.DataFrame() for nome in worksheet_names}
 
 def add_data_to_sheet(row, worksheet):
     if worksheet is None:
@@ -48,14 +54,8 @@ def add_data_to_sheet(row, worksheet):
         st.error(f"Erro ao adicionar dados: {e}")
 
 def process_vendas(df):
-    if not df.empty:
-        for col in ['Cartão', 'Dinheiro', 'Pix']:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        df['Total'] = df['Cartão'].fillna(0) + df['Dinheiro'].fillna(0) + df['Pix'].fillna(0)
-        df['Data'] = pd.to_datetime(df['Data'], format='%d/%m/%Y', errors='coerce')
-        df['Ano'] = df['Data'].dt.year
-        df['Mês'] = df['Data'].dt.month
-        df['DataFormatada'] = df['Data'].dt.strftime('%d/%m/%Y')
+    df = processar_vendas(df)
+    df['DataFormatada'] = df['Data'].dt.strftime('%d/%m/%Y')
     return df
 
 def process_compras(df):
@@ -63,7 +63,7 @@ def process_compras(df):
         for col in ['Pão', 'Frios', 'Bebidas']:
             df[col] = pd.to_numeric(df[col], errors='coerce')
         df['Total'] = df[['Pão', 'Frios', 'Bebidas']].sum(axis=1)
-        df['Data'] = pd.to_datetime(df['Data'], format='%d/%m/%Y', errors='coerce')
+        df['Data'] = parse_dates(df['Data'], 'Compras')
         df['Ano'] = df['Data'].dt.year
         df['Mês'] = df['Data'].dt.month
         df['DataFormatada'] = df['Data'].dt.strftime('%d/%m/%Y')
@@ -74,9 +74,10 @@ def main():
 
     with st.sidebar:
         st.header("🔍 Filtros")
-        df_vendas_raw, _ = read_google_sheet('Vendas')
+        # Vendas e Compras chegam juntas numa única ida à API
+        abas = read_google_sheets(['Vendas', 'Compras'])
+        df_vendas_raw, df_compras_raw = abas['Vendas'], abas['Compras']
         df_vendas = process_vendas(df_vendas_raw.copy()) if not df_vendas_raw.empty else pd.DataFrame()
-        df_compras_raw, _ = read_google_sheet('Compras')
         df_compras = process_compras(df_compras_raw.copy()) if not df_compras_raw.empty else pd.DataFrame()
 
         anos = sorted(set(df_vendas['Ano'].unique()).union(df_compras['Ano'].unique()))
@@ -98,8 +99,7 @@ def main():
             if st.form_submit_button("Registrar Venda"):
                 if cartao + dinheiro + pix > 0:
                     formatted = data_venda.strftime('%d/%m/%Y')
-                    _, worksheet = read_google_sheet('Vendas')
-                    add_data_to_sheet([formatted, cartao, dinheiro, pix], worksheet)
+                    add_data_to_sheet([formatted, cartao, dinheiro, pix], open_worksheet('Vendas'))
                 else:
                     st.warning("Informe ao menos um valor de venda.")
 
@@ -116,8 +116,7 @@ def main():
             if st.form_submit_button("Registrar Compra"):
                 if pao + frios + bebidas > 0:
                     formatted = data_compra.strftime('%d/%m/%Y')
-                    _, worksheet = read_google_sheet('Compras')
-                    add_data_to_sheet([formatted, pao, frios, bebidas], worksheet)
+                    add_data_to_sheet([formatted, pao, frios, bebidas], open_worksheet('Compras'))
                 else:
                     st.warning("Informe ao menos um valor de compra.")
 
@@ -125,7 +124,8 @@ def main():
         st.header("Análise de Vendas")
         df = df_vendas[(df_vendas['Ano'].isin(selected_anos)) & (df_vendas['Mês'].isin(selected_meses))]
         if not df.empty:
-            st.dataframe(df[['DataFormatada', 'Cartão', 'Dinheiro', 'Pix', 'Total']], use_container_width=True)
+            st.dataframe(formatar_colunas_reais(df[['DataFormatada', 'Cartão', 'Dinheiro', 'Pix', 'Total']], ['Cartão', 'Dinheiro', 'Pix', 'Total']),
+                         use_container_width=True)
             st.subheader("Métodos de Pagamento")
             pagamento = pd.DataFrame({
                 'Método': ['Cartão', 'Dinheiro', 'Pix'],
@@ -156,7 +156,8 @@ def main():
         st.header("Análise de Compras")
         df = df_compras[(df_compras['Ano'].isin(selected_anos)) & (df_compras['Mês'].isin(selected_meses))]
         if not df.empty:
-            st.dataframe(df[['DataFormatada', 'Pão', 'Frios', 'Bebidas', 'Total']], use_container_width=True)
+            st.dataframe(formatar_colunas_reais(df[['DataFormatada', 'Pão', 'Frios', 'Bebidas', 'Total']], ['Pão', 'Frios', 'Bebidas', 'Total']),
+                         use_container_width=True)
             st.subheader("Categorias de Compra")
             categorias = pd.DataFrame({
                 'Categoria': ['Pão', 'Frios', 'Bebidas'],
@@ -1,10 +1,11 @@
 import streamlit as st
-import gspread
 import pandas as pd
 import altair as alt
 from datetime import datetime
-from google.oauth2.service_account import Credentials
 from gspread.exceptions import SpreadsheetNotFound
+from clips_core.sheets_client import SPREADSHEET_ID, get_worksheet, limpar_cache
+from clips_core.vendas import processar_vendas
+from clips_core.moeda import formatar_colunas_reais
 
 # Configuração da página
 st.set_page_config(page_title="Sistema de Registro de Vendas", layout="centered")
@@ -12,24 +13,20 @@ st.set_page_config(page_title="Sistema de Registro de Vendas", layout="centered"
 def read_google_sheet():
     """Função para ler os dados da planilha Google Sheets"""
     try:
-        SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 
-                 'https://www.googleapis.com/auth/spreadsheets.readonly', 
-                 'https://www.googleapis.com/auth/drive.readonly']
         credentials_dict = st.secrets["google_credentials"]
-        creds = Credentials.from_service_account_info(credentials_dict, scopes=SCOPES)
-        gc = gspread.authorize(creds)
-        spreadsheet_id = '1NTScbiIna-iE7roQ9XBdjUOssRihTFFby4INAAQNXTg'
         worksheet_name = 'Vendas'
         try:
-            spreadsheet = gc.open_by_key(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(worksheet_name)
+            # Cliente e handles compartilhados: autenticação e open_by_key uma vez por processo
+            worksheet = get_worksheet(credentials_dict, worksheet_name)
             rows = worksheet.get_all_records()
             df = pd.DataFrame(rows)
             return df, worksheet
         except SpreadsheetNotFound:
-            st.error(f"Planilha com ID {spreadsheet_id} não encontrada.")
+            limpar_cache()
+            st.error(f"Planilha com ID {SPREADSHEET_ID} não encontrada.")
             return pd.DataFrame(), None
     except Exception as e:
+        limpar_cache()
         st.error(f"Erro de autenticação: {e}")
         return pd.DataFrame(), None
 
@@ -47,23 +44,8 @@ def add_data_to_sheet(date, cartao, dinheiro, pix, worksheet):
 
 def process_data(df):
     """Função para processar e preparar os dados"""
-    if not df.empty:
-        for col in ['Cartão', 'Dinheiro', 'Pix']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        df['Total'] = df['Cartão'].fillna(0) + df['Dinheiro'].fillna(0) + df['Pix'].fillna(0)
-        if 'Data' in df.columns:
-            try:
-                df['Data'] = pd.to_datetime(df['Data'], format='%d/%m/%Y', errors='coerce')
-                df['Ano'] = df['Data'].dt.year
-                df['Mês'] = df['Data'].dt.month
-                df['MêsNome'] = df['Data'].dt.strftime('%B')
-                df['AnoMês'] = df['Data'].dt.strftime('%Y-%m')
-                df['DataFormatada'] = df['Data'].dt.strftime('%d/%m/%Y')
-            except ValueError:
-                st.warning("Formato de data inconsistente na planilha.")
-            except Exception as e:
-                st.error(f"Erro ao processar a coluna 'Data': {e}")
+    df = processar_vendas(df)
+    df['DataFormatada'] = df['Data'].dt.strftime('%d/%m/%Y')
     return df
 
 def main():
@@ -143,8 +125,9 @@ def main():
                 df_filtered = df_filtered[df_filtered['Mês'].isin(selected_meses)] if selected_meses else df_filtered
 
                 st.subheader("Dados Filtrados")
-                st.dataframe(df_filtered[['DataFormatada', 'Cartão', 'Dinheiro', 'Pix', 'Total']]
-                             if 'DataFormatada' in df_filtered.columns else df_filtered, 
+                st.dataframe(formatar_colunas_reais(df_filtered[['DataFormatada', 'Cartão', 'Dinheiro', 'Pix', 'Total']]
+                                                    if 'DataFormatada' in df_filtered.columns else df_filtered,
+                                                    ['Cartão', 'Dinheiro', 'Pix', 'Total']),
                              use_container_width=True,
                              height=300)
 
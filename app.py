@@ -1,21 +1,15 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
-from datetime import datetime
-import random
 import os
-import numpy as np
-import time
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch, cm
-from reportlab.pdfgen import canvas
-from io import BytesIO
-import matplotlib.pyplot as plt
-import io
 import base64
+from clips_core.combo_solver import (
+    CARDAPIOS, resolver_combo_exato, buscar_combinacao_combo,
+    buscar_combinacao_combo_paralelo, evaluate_fitness_combo, resolver_lote_combo
+)
+from clips_core.cache_combos import fingerprint_cardapio, obter_resultado, salvar_resultado
+from clips_core.financeiro import estimar_custos, format_currency
+from clips_core.moeda import formatar_colunas_reais
+from clips_core.transacoes import totais_por_forma
 
 # --- CONSTANTES E CONFIGURAÇÕES ---
 CONFIG = {
@@ -23,18 +17,14 @@ CONFIG = {
     "layout": "centered",
     "sidebar_state": "expanded",
     "excel_file": "recebimentos.xlsx",
+    "cache_db": "cache_combos.sqlite",
     "logo_path": "logo.png"
 }
 
-CARDAPIOS = {
-    "sanduiches": {
-        "JBC (Junior Bacon Cheese)": 10.00,
-        "Double Cheese Burger": 15.00,
-        "Cebola Adicional": 0.50
-    },
-    "bebidas": {
-        "Refri Lata": 15.00
-    }
+METODOS_BUSCA = {
+    "🎯 Exato (Programação Dinâmica)": "exato",
+    "🧬 Algoritmo Genético": "genetico",
+    "⚡ Algoritmo Genético Paralelo": "genetico_paralelo"
 }
 
 FORMAS_PAGAMENTO = {
@@ -49,11 +39,6 @@ FORMAS_PAGAMENTO = {
 }
 
 # --- FUNÇÕES UTILITÁRIAS ---
-def format_currency(value):
-    if pd.isna(value) or value is None:
-        return "R$ -"
-    return f"R$ {float(value):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
 def get_global_centered_styles():
     return [
         {'selector': 'th', 'props': [('text-align', 'center'), ('vertical-align', 'middle'), ('background-color', '#000033'), ('color', '#ffffff'), ('padding', '8px'), ('border', '1px solid #444')]},
@@ -86,290 +71,9 @@ def save_data(df):
     except Exception as e:
         st.error(f"Erro ao salvar dados: {e}")
 
-def round_to_50_or_00(value):
-    return int(round(value))
-
-def calculate_combination_value(combination, item_prices):
-    return sum(item_prices.get(name, 0) * quantity for name, quantity in combination.items())
-
-# --- FUNÇÕES PARA ALGORITMO GENÉTICO COM RESTRIÇÃO DE COMBO ---
-def create_individual_combo(item_prices, max_combos=100):
-    """
-    Cria um indivíduo respeitando a regra do combo:
-    - Número de JBC = Número de Refri Lata
-    - Cebola pode variar livremente
-    """
-    num_combos = random.randint(1, max_combos)
-    num_cebolas = random.randint(0, 50)
-    
-    individual = {
-        "JBC (Junior Bacon Cheese)": num_combos,
-        "Refri Lata": num_combos,
-        "Cebola Adicional": num_cebolas
-    }
-    
-    return individual
-
-def evaluate_fitness_combo(individual, target_value):
-    """Avalia fitness com penalização se JBC != Refri Lata"""
-    preco_jbc = CARDAPIOS["sanduiches"]["JBC (Junior Bacon Cheese)"]
-    preco_lata = CARDAPIOS["bebidas"]["Refri Lata"]
-    preco_cebola = CARDAPIOS["sanduiches"]["Cebola Adicional"]
-    
-    qty_jbc = individual.get("JBC (Junior Bacon Cheese)", 0)
-    qty_lata = individual.get("Refri Lata", 0)
-    qty_cebola = individual.get("Cebola Adicional", 0)
-    
-    # Penalização severa se JBC != Lata
-    if qty_jbc != qty_lata:
-        return 1_000_000 + abs(qty_jbc - qty_lata) * 1000
-    
-    total = (preco_jbc * qty_jbc) + (preco_lata * qty_lata) + (preco_cebola * qty_cebola)
-    
-    if total > target_value:
-        return 1_000_000 + (total - target_value)
-    
-    score = target_value - total
-    return score
-
-def crossover_combo(parent1, parent2):
-    """Crossover mantendo a regra do combo"""
-    # Combos vêm de um dos pais
-    if random.random() < 0.5:
-        num_combos = parent1.get("JBC (Junior Bacon Cheese)", 0)
-    else:
-        num_combos = parent2.get("JBC (Junior Bacon Cheese)", 0)
-    
-    # Cebolas podem ser média ou de um dos pais
-    if random.random() < 0.5:
-        num_cebolas = (parent1.get("Cebola Adicional", 0) + parent2.get("Cebola Adicional", 0)) // 2
-    else:
-        num_cebolas = parent1.get("Cebola Adicional", 0) if random.random() < 0.5 else parent2.get("Cebola Adicional", 0)
-    
-    return {
-        "JBC (Junior Bacon Cheese)": num_combos,
-        "Refri Lata": num_combos,
-        "Cebola Adicional": num_cebolas
-    }
-
-def mutate_combo(individual, mutation_rate=0.3):
-    """Mutação mantendo a regra do combo"""
-    new_individual = individual.copy()
-    
-    # Mutar número de combos
-    if random.random() < mutation_rate:
-        change = random.choice([-5, -3, -1, 1, 3, 5])
-        new_combos = max(0, new_individual["JBC (Junior Bacon Cheese)"] + change)
-        new_individual["JBC (Junior Bacon Cheese)"] = new_combos
-        new_individual["Refri Lata"] = new_combos  # Mantém igual!
-    
-    # Mutar cebolas
-    if random.random() < mutation_rate:
-        change = random.choice([-3, -2, -1, 1, 2, 3])
-        new_cebolas = max(0, new_individual.get("Cebola Adicional", 0) + change)
-        new_individual["Cebola Adicional"] = new_cebolas
-    
-    return new_individual
-
-def genetic_algorithm_combo(target_value, population_size=50, generations=100, max_combos=100):
-    """Algoritmo genético com restrição de combo"""
-    if target_value <= 0:
-        return {}
-    
-    population = [create_individual_combo(CARDAPIOS, max_combos) for _ in range(population_size)]
-    best_individual = {}
-    best_fitness = float('inf')
-    
-    for generation in range(generations):
-        fitness_scores = [(individual, evaluate_fitness_combo(individual, target_value)) 
-                         for individual in population]
-        fitness_scores.sort(key=lambda x: x[1])
-        
-        if fitness_scores[0][1] < best_fitness:
-            best_individual = fitness_scores[0][0].copy()
-            best_fitness = fitness_scores[0][1]
-        
-        if best_fitness == 0:
-            break
-        
-        # Elitismo
-        elite_size = max(5, population_size // 10)
-        next_generation = [ind[0].copy() for ind in fitness_scores[:elite_size]]
-        
-        # Criar nova geração
-        while len(next_generation) < population_size:
-            tournament_size = 3
-            tournament = random.sample(fitness_scores, tournament_size)
-            tournament.sort(key=lambda x: x[1])
-            parent1 = tournament[0][0]
-            parent2 = random.choice(fitness_scores[:10])[0]
-            
-            child = crossover_combo(parent1, parent2)
-            child = mutate_combo(child)
-            next_generation.append(child)
-        
-        population = next_generation
-    
-    # Limpar valores zero
-    final_combination = {k: int(v) for k, v in best_individual.items() if v > 0}
-    
-    return final_combination
-
-def buscar_combinacao_combo(target_value, max_time_seconds=5, population_size=100, generations=200):
-    """Busca a melhor combinação respeitando a regra do combo"""
-    start_time = time.time()
-    best_global_individual = {}
-    best_global_diff = float('inf')
-    attempts = 0
-    
-    while (time.time() - start_time) < max_time_seconds:
-        attempts += 1
-        current_result = genetic_algorithm_combo(target_value, population_size, generations)
-        current_fitness = evaluate_fitness_combo(current_result, target_value)
-        
-        if current_fitness == 0:
-            return current_result, attempts
-        
-        if current_fitness < best_global_diff:
-            best_global_diff = current_fitness
-            best_global_individual = current_result
-    
-    return best_global_individual, attempts
-
-# --- FUNÇÕES PARA GERAR PDF ---
-def create_watermark(canvas, logo_path, width=400, height=400, opacity=0.1):
-    try:
-        if os.path.exists(logo_path):
-            canvas.saveState()
-            canvas.setFillColorRGB(255, 255, 255, alpha=opacity)
-            canvas.drawImage(logo_path, (A4[0] - width) / 2, (A4[1] - height) / 2, 
-                             width=width, height=height, mask='auto', preserveAspectRatio=True)
-            canvas.restoreState()
-    except Exception as e:
-        print(f"Erro ao adicionar marca d'água: {e}")
-
-def fig_to_buffer(fig):
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-    buf.seek(0)
-    return buf
-
-def create_pdf_report(df, vendas, total_vendas, imposto_simples, custo_funcionario, 
-                    custo_contadora, total_custos, lucro_estimado, logo_path):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
-    styles = getSampleStyleSheet()
-    title_style = styles['Title']
-    heading_style = styles['Heading1']
-    subheading_style = styles['Heading2']
-    normal_style = styles['Normal']
-    elements = []
-    
-    try:
-        if os.path.exists(logo_path):
-            img = Image(logo_path, width=2*inch, height=1.5*inch)
-            img.hAlign = 'CENTER'
-            elements.append(img)
-            elements.append(Spacer(1, 0.5*inch))
-    except Exception as e:
-        print(f"Erro ao adicionar logo: {e}")
-    
-    elements.append(Paragraph("Relatório Financeiro - Clips Burger", title_style))
-    elements.append(Spacer(1, 0.5*inch))
-    elements.append(Paragraph(f"Data do relatório: {datetime.now().strftime('%d/%m/%Y')}", normal_style))
-    elements.append(Spacer(1, 0.25*inch))
-    elements.append(Paragraph("Resumo Financeiro", heading_style))
-    elements.append(Spacer(1, 0.1*inch))
-    
-    data = [
-        ["Métrica", "Valor"],
-        ["Faturamento Bruto", format_currency(total_vendas)],
-        ["Imposto Simples (6%)", format_currency(imposto_simples)],
-        ["Custo Funcionário CLT", format_currency(custo_funcionario)],
-        ["Custo Contadora", format_currency(custo_contadora)],
-        ["Total de Custos", format_currency(total_custos)],
-        ["Lucro Estimado", format_currency(lucro_estimado)]
-    ]
-    
-    table = Table(data, colWidths=[doc.width/2.5, doc.width/2.5])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (1, 0), 12),
-        ('BACKGROUND', (0, -1), (1, -1), colors.lightgrey),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-    ]))
-    elements.append(table)
-    elements.append(Spacer(1, 0.5*inch))
-    
-    elements.append(Paragraph("Análise de Vendas", heading_style))
-    elements.append(Spacer(1, 0.1*inch))
-    
-    try:
-        fig, ax = plt.subplots(figsize=(8, 5))
-        vendas.plot(kind='bar', x='Forma', y='Valor', ax=ax, color='steelblue')
-        ax.set_title('Vendas por Forma de Pagamento')
-        ax.set_ylabel('Valor (R$)')
-        ax.set_xlabel('')
-        plt.tight_layout()
-        img_buf = fig_to_buffer(fig)
-        img = Image(img_buf, width=doc.width, height=4*inch)
-        elements.append(img)
-        elements.append(Spacer(1, 0.25*inch))
-        plt.close(fig)
-    except Exception as e:
-        elements.append(Paragraph(f"Erro ao gerar gráfico de vendas: {e}", normal_style))
-    
-    try:
-        custos_df = pd.DataFrame({
-            'Item': ['Impostos', 'Funcionário', 'Contadora'],
-            'Valor': [imposto_simples, custo_funcionario, custo_contadora]
-        })
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.pie(custos_df['Valor'], labels=custos_df['Item'], autopct='%1.1f%%', startangle=90, shadow=True)
-        ax.set_title('Composição dos Custos')
-        plt.tight_layout()
-        img_buf = fig_to_buffer(fig)
-        img = Image(img_buf, width=doc.width, height=4*inch)
-        elements.append(img)
-        plt.close(fig)
-    except Exception as e:
-        elements.append(Paragraph(f"Erro ao gerar gráfico de custos: {e}", normal_style))
-    
-    elements.append(Spacer(1, 0.5*inch))
-    elements.append(Paragraph("Detalhamento por Forma de Pagamento", subheading_style))
-    elements.append(Spacer(1, 0.1*inch))
-    
-    data = [["Forma de Pagamento", "Valor"]]
-    for _, row in vendas.iterrows():
-        data.append([row['Forma'], format_currency(row['Valor'])])
-    
-    table = Table(data, colWidths=[doc.width/2, doc.width/4])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-    ]))
-    elements.append(table)
-    elements.append(Spacer(1, inch))
-    footer_text = "Este relatório foi gerado automaticamente pelo Sistema de Gestão da Clips Burger."
-    elements.append(Paragraph(footer_text, normal_style))
-    
-    def add_watermark(canvas, doc):
-        create_watermark(canvas, logo_path, width=300, height=300, opacity=0.1)
-    
-    doc.build(elements, onFirstPage=add_watermark, onLaterPages=add_watermark)
-    buffer.seek(0)
-    return buffer
 
 def create_altair_chart(data, chart_type, x_col, y_col, color_col=None, title=None, interactive=True):
+    import altair as alt  # só as abas com gráfico pagam o import
     if chart_type == 'line':
         chart = alt.Chart(data).mark_line(point=True).encode(
             x=alt.X(f'{x_col}:T', title=x_col),
@@ -398,16 +102,17 @@ def create_altair_chart(data, chart_type, x_col, y_col, color_col=None, title=No
     return chart.interactive() if interactive else chart
 
 # --- LÓGICA DE PROCESSAMENTO GENÉTICO (SEPARADA) ---
-def gerar_dados_geneticos_combo(valor_alvo_total, pop_size, n_gens):
-    """Gera dados usando o algoritmo genético com restrição de combo"""
-    combinacao, ciclos = buscar_combinacao_combo(
-        valor_alvo_total, 
-        max_time_seconds=5, 
-        population_size=pop_size, 
-        generations=n_gens
-    )
-    
-    # Separar sanduíches e bebidas
+def parametros_solver(metodo, pop_size, n_gens, n_workers=None):
+    """Parâmetros do solver que entram na chave do cache de resultados"""
+    parametros = {}
+    if metodo != "exato":
+        parametros = {"pop_size": pop_size, "n_gens": n_gens}
+        if metodo == "genetico_paralelo":
+            parametros["n_workers"] = n_workers
+    return parametros
+
+def montar_dados_combo(valor_alvo_total, combinacao, exato, ciclos_por_worker, metodo):
+    """Separa a combinação em sanduíches e bebidas e calcula os totais exibidos"""
     sanduiches = {}
     bebidas = {}
     
@@ -428,13 +133,137 @@ def gerar_dados_geneticos_combo(valor_alvo_total, pop_size, n_gens):
         'val_sand': val_sand,
         'val_beb': val_beb,
         'val_total': val_total,
-        'alvo': valor_alvo_total,
-        'ciclos': ciclos
+        'alvo': float(valor_alvo_total),
+        'ciclos_por_worker': ciclos_por_worker,
+        'metodo': metodo,
+        'exato': exato
     }
 
+def deve_guardar_no_cache(metodo, exato):
+    """
+    Só respostas definitivas vão para o cache em disco: as exatas e as do solver
+    exato (o melhor possível abaixo do alvo). Um genético que errou o alvo pode
+    acertar na próxima tentativa, então não fica gravado.
+    """
+    return exato or metodo == "exato"
+
+def gerar_dados_geneticos_combo(valor_alvo_total, pop_size, n_gens, metodo="genetico", n_workers=None):
+    """
+    Gera dados usando o solver exato ou o algoritmo genético (sequencial ou paralelo) com restrição de combo.
+    Resultados definitivos ficam no cache em disco, então alvos repetidos voltam instantaneamente.
+    """
+    parametros = parametros_solver(metodo, pop_size, n_gens, n_workers)
+    fingerprint = fingerprint_cardapio(CARDAPIOS)
+    
+    dados_cache = obter_resultado(CONFIG["cache_db"], valor_alvo_total, fingerprint, metodo, parametros)
+    # Caches antigos podem ter erros do genético gravados; esses são recalculados
+    if dados_cache is not None and deve_guardar_no_cache(metodo, dados_cache['exato']):
+        dados_cache['em_cache'] = True
+        return dados_cache
+    
+    if metodo == "exato":
+        combinacao, exato = resolver_combo_exato(valor_alvo_total)
+        ciclos_por_worker = [1]
+    else:
+        if metodo == "genetico_paralelo":
+            combinacao, ciclos_por_worker = buscar_combinacao_combo_paralelo(
+                valor_alvo_total, 
+                max_time_seconds=5, 
+                population_size=pop_size, 
+                generations=n_gens,
+                max_workers=n_workers
+            )
+        else:
+            combinacao, ciclos = buscar_combinacao_combo(
+                valor_alvo_total, 
+                max_time_seconds=5, 
+                population_size=pop_size, 
+                generations=n_gens
+            )
+            ciclos_por_worker = [ciclos]
+        exato = bool(evaluate_fitness_combo(combinacao, valor_alvo_total) == 0)
+    
+    dados = montar_dados_combo(valor_alvo_total, combinacao, exato, ciclos_por_worker, metodo)
+    if deve_guardar_no_cache(metodo, exato):
+        salvar_resultado(CONFIG["cache_db"], valor_alvo_total, fingerprint, metodo, parametros, dados)
+    return dados
+
+def gerar_dados_combo_lote(valores_alvo, pop_size, n_gens, metodo="genetico", n_workers=None):
+    """
+    Resolve todos os valores alvo de uma vez. Alvos já conhecidos vêm do cache em disco;
+    os demais são resolvidos numa única chamada em lote (um alvo por processo nos modos genéticos).
+    """
+    # No lote o paralelismo é entre alvos: cada um roda o genético sequencial
+    metodo_alvo = "exato" if metodo == "exato" else "genetico"
+    parametros = parametros_solver(metodo_alvo, pop_size, n_gens)
+    fingerprint = fingerprint_cardapio(CARDAPIOS)
+    
+    resultados = [
+        obter_resultado(CONFIG["cache_db"], valor, fingerprint, metodo_alvo, parametros)
+        for valor in valores_alvo
+    ]
+    resultados = [dados if dados is not None and deve_guardar_no_cache(metodo_alvo, dados['exato']) else None
+                  for dados in resultados]
+    for dados in resultados:
+        if dados is not None:
+            dados['em_cache'] = True
+    
+    pendentes = [i for i, dados in enumerate(resultados) if dados is None]
+    if pendentes:
+        solucoes = resolver_lote_combo(
+            [valores_alvo[i] for i in pendentes],
+            metodo=metodo_alvo,
+            max_time_seconds=5,
+            population_size=pop_size,
+            generations=n_gens,
+            max_workers=n_workers
+        )
+        for i, (combinacao, exato, ciclos_por_worker) in zip(pendentes, solucoes):
+            dados = montar_dados_combo(valores_alvo[i], combinacao, exato, ciclos_por_worker, metodo_alvo)
+            if deve_guardar_no_cache(metodo_alvo, exato):
+                salvar_resultado(CONFIG["cache_db"], valores_alvo[i], fingerprint, metodo_alvo, parametros, dados)
+            resultados[i] = dados
+    
+    return resultados
+
+def renderizar_resultados_lote(formas, resultados):
+    """Mostra o resultado de todas as formas de pagamento numa única tabela"""
+    df_lote = pd.DataFrame({
+        'Forma': formas,
+        'Valor': [dados['alvo'] for dados in resultados],
+        'Combos': [dados['sanduiches'].get("JBC (Junior Bacon Cheese)", 0) for dados in resultados],
+        'Cebolas': [dados['sanduiches'].get("Cebola Adicional", 0) for dados in resultados],
+        'Total Encontrado': [dados['val_total'] for dados in resultados],
+        'Diferença': [dados['alvo'] - dados['val_total'] for dados in resultados],
+        'Exato': ["✅" if dados['exato'] else "⚠️" for dados in resultados]
+    })
+    
+    df_exibicao = formatar_colunas_reais(df_lote, ['Valor', 'Total Encontrado', 'Diferença'])
+    html_lote = df_exibicao.style.format({
+        'Combos': '{:.0f}', 'Cebolas': '{:.0f}'
+    }).set_table_styles(get_global_centered_styles()).hide(axis='index').to_html()
+    st.markdown(html_lote, unsafe_allow_html=True)
+    
+    st.write("")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Alvo", format_currency(df_lote['Valor'].sum()))
+    col2.metric("Total Encontrado", format_currency(df_lote['Total Encontrado'].sum()))
+    col3.metric("Formas Exatas", f"{int((df_lote['Exato'] == '✅').sum())}/{len(df_lote)}")
+
 def renderizar_resultados(dados):
     st.subheader(f"Valor Alvo: {format_currency(dados['alvo'])}")
-    st.caption(f"🤖 O algoritmo realizou {dados['ciclos']} ciclos completos de evolução.")
+    if dados.get('metodo') == "exato":
+        st.caption("🎯 Solução exata por programação dinâmica (resultado determinístico).")
+        if not dados['exato']:
+            st.warning("Nenhuma combinação soma exatamente o valor alvo. Exibindo o maior total possível abaixo dele.")
+    elif len(dados['ciclos_por_worker']) > 1:
+        ciclos_por_worker = dados['ciclos_por_worker']
+        detalhes = ", ".join(f"P{i + 1}: {ciclos}" for i, ciclos in enumerate(ciclos_por_worker))
+        st.caption(f"⚡ {len(ciclos_por_worker)} processos realizaram {sum(ciclos_por_worker)} ciclos completos de evolução ({detalhes}).")
+    else:
+        st.caption(f"🤖 O algoritmo realizou {dados['ciclos_por_worker'][0]} ciclos completos de evolução.")
+    if dados.get('em_cache'):
+        st.caption("💾 Resultado recuperado do cache de combinações já calculadas.")
     
     # Verificar se a regra do combo foi respeitada
     qty_jbc = dados['sanduiches'].get("JBC (Junior Bacon Cheese)", 0)
@@ -455,7 +284,7 @@ def renderizar_resultados(dados):
                 'Subtotal': [CARDAPIOS["sanduiches"][k]*v for k,v in dados['sanduiches'].items()]
             })
             df_s = df_s.sort_values('Subtotal', ascending=False)
-            html_s = df_s.style.format({'Qnt':'{:.0f}', 'Preço Unitário':'R$ {:.2f}', 'Subtotal':'R$ {:.2f}'})\
+            html_s = formatar_colunas_reais(df_s, ['Preço Unitário', 'Subtotal']).style.format({'Qnt':'{:.0f}'})\
                 .set_table_styles(get_global_centered_styles()).hide(axis='index').to_html()
             st.markdown(html_s, unsafe_allow_html=True)
             st.write("")
@@ -473,7 +302,7 @@ def renderizar_resultados(dados):
                 'Subtotal': [CARDAPIOS["bebidas"][k]*v for k,v in dados['bebidas'].items()]
             })
             df_b = df_b.sort_values('Subtotal', ascending=False)
-            html_b = df_b.style.format({'Qnt':'{:.0f}', 'Preço Unitário':'R$ {:.2f}', 'Subtotal':'R$ {:.2f}'})\
+            html_b = formatar_colunas_reais(df_b, ['Preço Unitário', 'Subtotal']).style.format({'Qnt':'{:.0f}'})\
                 .set_table_styles(get_global_centered_styles()).hide(axis='index').to_html()
             st.markdown(html_b, unsafe_allow_html=True)
             st.write("")
@@ -676,14 +505,14 @@ st.markdown("""
 init_data_file()
 if 'df_receipts' not in st.session_state:
     st.session_state.df_receipts = load_data()
-if 'uploaded_data' not in st.session_state:
-    st.session_state.uploaded_data = None
 if 'vendas_data' not in st.session_state:
     st.session_state.vendas_data = None
 if 'resultado_arquivo' not in st.session_state:
     st.session_state.resultado_arquivo = None
 if 'resultado_pix' not in st.session_state:
     st.session_state.resultado_pix = None
+if 'resultado_lote' not in st.session_state:
+    st.session_state.resultado_lote = None
 
 # --- INTERFACE PRINCIPAL ---
 
@@ -708,25 +537,48 @@ st.markdown("""
 with st.sidebar:
     st.header("⚙️ Configurações do Algoritmo")
     
-    st.info("🧬 Algoritmo Genético com Restrição de Combo")
-    
-    population_size = st.slider(
-        "Tamanho da População", 
-        min_value=20, 
-        max_value=200, 
-        value=100, 
-        step=10,
-        help="Maior população = melhor resultado, mas mais lento"
+    metodo_label = st.radio(
+        "Método de Busca",
+        list(METODOS_BUSCA.keys()),
+        help="O método exato responde em milissegundos e indica quando não existe combinação exata"
     )
+    metodo_busca = METODOS_BUSCA[metodo_label]
     
-    generations = st.slider(
-        "Número de Gerações", 
-        min_value=10, 
-        max_value=500, 
-        value=200, 
-        step=10,
-        help="Mais gerações = melhor convergência"
-    )
+    population_size, generations, n_workers = 100, 200, None
+    if metodo_busca in ("genetico", "genetico_paralelo"):
+        if metodo_busca == "genetico_paralelo":
+            st.info("⚡ Algoritmo Genético Paralelo com Restrição de Combo")
+            
+            n_workers = st.slider(
+                "Número de Processos", 
+                min_value=1, 
+                max_value=max(os.cpu_count() or 1, 2), 
+                value=os.cpu_count() or 1, 
+                step=1,
+                help="Cada processo executa reinícios independentes com sua própria semente"
+            )
+        else:
+            st.info("🧬 Algoritmo Genético com Restrição de Combo")
+        
+        population_size = st.slider(
+            "Tamanho da População", 
+            min_value=20, 
+            max_value=200, 
+            value=100, 
+            step=10,
+            help="Maior população = melhor resultado, mas mais lento"
+        )
+        
+        generations = st.slider(
+            "Número de Gerações", 
+            min_value=10, 
+            max_value=500, 
+            value=200, 
+            step=10,
+            help="Mais gerações = melhor convergência"
+        )
+    else:
+        st.info("🎯 Solver Exato com Restrição de Combo")
     
     st.divider()
     
@@ -748,42 +600,19 @@ if escolha_menu == "📈 Resumo das Vendas":
     if arquivo:
         try:
             with st.spinner("Processando arquivo..."):
-                if arquivo.name.endswith(".csv"):
-                    try:
-                        df = pd.read_csv(arquivo, sep=';', encoding='utf-8', dtype=str)
-                    except pd.errors.ParserError:
-                        arquivo.seek(0)
-                        try:
-                            df = pd.read_csv(arquivo, sep=',', encoding='utf-8', dtype=str)
-                        except:
-                            arquivo.seek(0)
-                            df = pd.read_csv(arquivo, engine='python', dtype=str)
-                else:
-                    df = pd.read_excel(arquivo, dtype=str)
-                
-                required_cols = ['Tipo', 'Bandeira', 'Valor']
-                if not all(col in df.columns for col in required_cols):
-                    st.error(f"Erro: O arquivo precisa conter as colunas: {', '.join(required_cols)}")
+                try:
+                    # Leitura em blocos, já somando por forma de pagamento (ver clips_core.transacoes)
+                    vendas, n_transacoes = totais_por_forma(arquivo, arquivo.name, FORMAS_PAGAMENTO)
+                except ValueError as e:
+                    st.error(f"Erro: {e}")
                     st.stop()
-
-                df['Tipo'] = df['Tipo'].str.lower().str.strip().fillna('desconhecido')
-                df['Bandeira'] = df['Bandeira'].str.lower().str.strip().fillna('desconhecida')
-                df['Valor'] = pd.to_numeric(
-                    df['Valor'].str.replace('.', '').str.replace(',', '.'), 
-                    errors='coerce')
-                df = df.dropna(subset=['Valor'])
-                
-                df['Forma'] = (df['Tipo'] + ' ' + df['Bandeira']).map(FORMAS_PAGAMENTO)
-                df = df.dropna(subset=['Forma'])
                 
-                if df.empty:
+                if n_transacoes == 0:
                     st.warning("Nenhuma transação válida encontrada.")
                     st.stop()
 
-                vendas = df.groupby('Forma')['Valor'].sum().reset_index()
                 total_vendas = vendas['Valor'].sum()
                 
-                st.session_state.uploaded_data = df
                 st.session_state.vendas_data = vendas
                 st.session_state.total_vendas = total_vendas
             
@@ -808,22 +637,18 @@ if escolha_menu == "📈 Resumo das Vendas":
             
             st.header("💰 Resultados Financeiros")
             
+            custos = estimar_custos(total_vendas, salario_minimo, custo_contadora)
+            imposto_simples, custo_funcionario = custos['imposto_simples'], custos['custo_funcionario']
+            total_custos, lucro_estimado = custos['total_custos'], custos['lucro_estimado']
+
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric("Faturamento Bruto", format_currency(total_vendas))
             with col2:
-                imposto_simples = total_vendas * 0.06
                 st.metric("Imposto Simples (6%)", format_currency(imposto_simples))
             with col3:
-                fgts = salario_minimo * 0.08
-                ferias = (salario_minimo / 12) * (4/3)
-                decimo_terceiro = salario_minimo / 12
-                custo_funcionario = salario_minimo + fgts + ferias + decimo_terceiro
                 st.metric("Custo Funcionário CLT", format_currency(custo_funcionario))
             
-            total_custos = imposto_simples + custo_funcionario + custo_contadora
-            lucro_estimado = total_vendas - total_custos
-            
             col1, col2 = st.columns(2)
             with col1:
                 st.metric("Total de Custos", format_currency(total_custos))
@@ -862,6 +687,7 @@ if escolha_menu == "📈 Resumo das Vendas":
                     'Valor': [imposto_simples, custo_funcionario, custo_contadora]
                 })
                 
+                import altair as alt
                 graf_composicao = alt.Chart(custos_df).mark_arc().encode(
                     theta='Valor',
                     color='Item',
@@ -875,8 +701,10 @@ if escolha_menu == "📈 Resumo das Vendas":
             st.header("📑 Relatório")
             if st.button("Gerar Relatório PDF"):
                 with st.spinner("Gerando relatório..."):
+                    # reportlab/matplotlib só carregam aqui (ver clips_core.relatorio_pdf)
+                    from clips_core.relatorio_pdf import create_pdf_report
                     pdf_buffer = create_pdf_report(
-                        df, vendas, total_vendas, imposto_simples, custo_funcionario, 
+                        vendas, total_vendas, imposto_simples, custo_funcionario, 
                         custo_contadora, total_custos, lucro_estimado, CONFIG["logo_path"]
                     )
                     b64_pdf = base64.b64encode(pdf_buffer.getvalue()).decode()
@@ -904,15 +732,53 @@ elif escolha_menu == "🧩 Análise com Arquivo":
         
         valor_selecionado = vendas.loc[vendas['Forma'] == forma_selecionada, 'Valor'].iloc[0]
         
-        if st.button("🔎 Analisar Combinação", type="primary", use_container_width=True):
+        # Chave do lote: muda quando o arquivo ou as configurações do solver mudam
+        chave_lote = (
+            tuple(vendas['Forma']), tuple(vendas['Valor']),
+            metodo_busca, population_size, generations, n_workers
+        )
+        
+        col_unica, col_todas = st.columns(2)
+        with col_unica:
+            analisar_uma = st.button("🔎 Analisar Combinação", type="primary", use_container_width=True)
+        with col_todas:
+            analisar_todas = st.button("⚡ Resolver Todas", use_container_width=True,
+                                       help="Calcula as combinações de todas as formas de pagamento de uma vez")
+        
+        if analisar_uma:
             with st.spinner("Calculando a melhor combinação com Combo 1..."):
                 dados = gerar_dados_geneticos_combo(
                     valor_selecionado, 
                     population_size, 
-                    generations
+                    generations,
+                    metodo_busca,
+                    n_workers
                 )
                 st.session_state.resultado_arquivo = dados
         
+        if analisar_todas:
+            lote = st.session_state.resultado_lote
+            if lote is None or lote['chave'] != chave_lote:
+                with st.spinner(f"Calculando as combinações de {len(vendas)} formas de pagamento..."):
+                    resultados = gerar_dados_combo_lote(
+                        vendas['Valor'].tolist(),
+                        population_size,
+                        generations,
+                        metodo_busca,
+                        n_workers
+                    )
+                st.session_state.resultado_lote = {
+                    'chave': chave_lote,
+                    'formas': vendas['Forma'].tolist(),
+                    'resultados': resultados
+                }
+        
+        lote = st.session_state.resultado_lote
+        if lote is not None and lote['chave'] == chave_lote:
+            st.divider()
+            st.subheader("📋 Todas as Formas de Pagamento")
+            renderizar_resultados_lote(lote['formas'], lote['resultados'])
+        
         if st.session_state.resultado_arquivo:
             st.divider()
             renderizar_resultados(st.session_state.resultado_arquivo)
@@ -944,7 +810,9 @@ elif escolha_menu == "💸 Calculadora PIX":
                     dados = gerar_dados_geneticos_combo(
                         valor_pix_input, 
                         population_size, 
-                        generations
+                        generations,
+                        metodo_busca,
+                        n_workers
                     )
                     st.session_state.resultado_pix = dados
             else:
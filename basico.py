@@ -1,20 +1,30 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
-import gspread
 import pandas as pd
 import altair as alt
 import numpy as np
 from datetime import datetime, timedelta
-from google.oauth2.service_account import Credentials
 from gspread.exceptions import SpreadsheetNotFound
 import warnings
+import os
+from clips_core import sheets_client
+from clips_core.sheets_sync import LeitorIncrementalPlanilha
+from clips_core.espelho_vendas import EspelhoVendas
+from clips_core.fila_escrita import FilaEscrita
+from clips_core.vendas import dias_semana_ordem, meses_ordem, processar_vendas
+from clips_core.financeiro import calculate_financial_results, format_currency
+from clips_core.moeda import formatar_colunas_reais, formatar_reais
+from clips_core.rollups import (LIMITE_PONTOS, agrupar_serie, construir_cubos, construir_heatmaps, escolher_resolucao,
+                     fatiar, lttb, reagrupar, serie_diaria)
 
 # Suprimir warnings específicos do pandas
 warnings.filterwarnings('ignore', category=FutureWarning, message='.*observed=False.*')
 
 # --- Configurações Globais e Constantes ---
-SPREADSHEET_ID = '1NTScbiIna-iE7roQ9XBdjUOssRihTFFby4INAAQNXTg'
 WORKSHEET_NAME = 'Vendas'
+SNAPSHOT_PATH = os.path.join('dados', 'vendas_basico.parquet')
+SNAPSHOT_REFRESH_SECONDS = 300
+QUEUE_PATH = os.path.join('dados', 'fila_vendas_basico.sqlite')
 
 # Configuração da página Streamlit
 st.set_page_config(page_title="Sistema Financeiro - Clips Burger", layout="wide", page_icon="🍔")
@@ -22,13 +32,17 @@ st.set_page_config(page_title="Sistema Financeiro - Clips Burger", layout="wide"
 # Configuração de tema para gráficos mais bonitos
 alt.data_transformers.enable('json')
 
+# Resolução dos gráficos temporais (None = automática, pelo limite de pontos)
+OPCOES_RESOLUCAO = {"Automática": None, "Diária": 'dia', "Semanal": 'semana', "Mensal": 'mes'}
+ROTULOS_RESOLUCAO = {
+    'dia': {'nome': 'diária', 'tooltip': 'Data', 'formato': '%d/%m/%Y', 'eixo': '%d/%m', 'venda': 'Venda do Dia (R$)'},
+    'semana': {'nome': 'semanal', 'tooltip': 'Semana de', 'formato': '%d/%m/%Y', 'eixo': '%d/%m', 'venda': 'Venda da Semana (R$)'},
+    'mes': {'nome': 'mensal', 'tooltip': 'Mês', 'formato': '%m/%Y', 'eixo': '%m/%Y', 'venda': 'Venda do Mês (R$)'}
+}
+
 # Paleta de cores otimizada para modo escuro
 CORES_MODO_ESCURO = ['#4c78a8', '#54a24b', '#f58518', '#e45756', '#72b7b2', '#ff9da6', '#9d755d', '#bab0ac']
 
-# Define a ordem correta dos dias da semana e meses
-dias_semana_ordem = ["Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira", "Sexta-feira", "Sábado", "Domingo"]
-meses_ordem = ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
-
 # CSS para melhorar a aparência
 def inject_css():
     st.markdown("""
@@ -87,80 +101,44 @@ def inject_css():
 
 inject_css()
 
-# --- Funções de Cache para Acesso ao Google Sheets ---
-@st.cache_resource
-def get_google_auth():
-    """Autoriza o acesso ao Google Sheets e retorna o cliente gspread."""
-    SCOPES = ['https://www.googleapis.com/auth/spreadsheets',
-              'https://www.googleapis.com/auth/spreadsheets.readonly',
-              'https://www.googleapis.com/auth/drive.readonly']
-    try:
-        if "google_credentials" not in st.secrets:
-            st.error("Credenciais do Google ('google_credentials') não encontradas em st.secrets. Configure o arquivo .streamlit/secrets.toml")
-            return None
-        
-        credentials_dict = st.secrets["google_credentials"]
-        if not credentials_dict:
-            st.error("As credenciais do Google em st.secrets estão vazias.")
-            return None
-            
-        creds = Credentials.from_service_account_info(credentials_dict, scopes=SCOPES)
-        gc = gspread.authorize(creds)
-        return gc
-    except Exception as e:
-        st.error(f"Erro de autenticação com Google: {e}")
+# --- Acesso ao Google Sheets (cliente e abas compartilhados em clips_core.sheets_client) ---
+def get_google_credentials():
+    """Credenciais do Google em st.secrets, ou None com o erro exibido."""
+    if "google_credentials" not in st.secrets:
+        st.error("Credenciais do Google ('google_credentials') não encontradas em st.secrets. Configure o arquivo .streamlit/secrets.toml")
+        return None
+    credentials_dict = st.secrets["google_credentials"]
+    if not credentials_dict:
+        st.error("As credenciais do Google em st.secrets estão vazias.")
         return None
+    return credentials_dict
 
-@st.cache_resource
 def get_worksheet():
-    """Retorna o objeto worksheet da planilha especificada."""
-    gc = get_google_auth()
-    if gc:
-        try:
-            spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-            worksheet = spreadsheet.worksheet(WORKSHEET_NAME)
-            return worksheet
-        except SpreadsheetNotFound:
-            st.error(f"Planilha com ID '{SPREADSHEET_ID}' não encontrada.")
-            return None
-        except Exception as e:
-            st.error(f"Erro ao acessar a planilha '{WORKSHEET_NAME}': {e}")
-            return None
+    """Retorna o objeto worksheet da planilha; autenticação e open_by_key acontecem uma vez por processo."""
+    credentials_dict = get_google_credentials()
+    if credentials_dict is None:
+        return None
+    try:
+        return sheets_client.get_worksheet(credentials_dict, WORKSHEET_NAME)
+    except SpreadsheetNotFound:
+        sheets_client.limpar_cache()
+        st.error(f"Planilha com ID '{sheets_client.SPREADSHEET_ID}' não encontrada.")
+    except Exception as e:
+        sheets_client.limpar_cache()
+        st.error(f"Erro ao acessar a planilha '{WORKSHEET_NAME}': {e}")
     return None
 
-@st.cache_data
-def read_sales_data():
-    """Lê todos os registros da planilha de vendas e retorna como DataFrame."""
+@st.cache_resource
+def get_sales_reader():
+    """Leitor incremental da aba de vendas, compartilhado entre sessões e reruns."""
     worksheet = get_worksheet()
-    if worksheet:
-        try:
-            rows = worksheet.get_all_records()
-            if not rows:
-                st.info("A planilha de vendas está vazia.")
-                return pd.DataFrame()
-
-            df = pd.DataFrame(rows)
-            
-            for col in ['Cartão', 'Dinheiro', 'Pix']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                else:
-                    df[col] = 0
-            
-            if 'Data' not in df.columns:
-                df['Data'] = pd.NaT
-
-            return df
-        except Exception as e:
-            st.error(f"Erro ao ler dados da planilha: {e}")
-            return pd.DataFrame()
-    return pd.DataFrame()
+    return LeitorIncrementalPlanilha(worksheet) if worksheet else None
 
 # --- Funções de Manipulação de Dados ---
-def add_data_to_sheet(date, cartao, dinheiro, pix, worksheet_obj):
-    """Adiciona uma nova linha de dados à planilha Google Sheets."""
-    if worksheet_obj is None:
-        st.error("Não foi possível acessar a planilha para adicionar dados.")
+def add_data_to_sheet(date, cartao, dinheiro, pix, fila):
+    """Registra a venda na fila local; o envio à planilha Google Sheets é feito em segundo plano."""
+    if fila is None:
+        st.error("Não foi possível acessar a fila de registros para adicionar dados.")
         return False
     try:
         cartao_val = float(cartao) if cartao else 0.0
@@ -168,7 +146,7 @@ def add_data_to_sheet(date, cartao, dinheiro, pix, worksheet_obj):
         pix_val = float(pix) if pix else 0.0
         
         new_row = [date, cartao_val, dinheiro_val, pix_val]
-        worksheet_obj.append_row(new_row)
+        fila.enfileirar(new_row)
         st.success("Dados registrados com sucesso! ✅")
         return True
     except ValueError as ve:
@@ -178,87 +156,76 @@ def add_data_to_sheet(date, cartao, dinheiro, pix, worksheet_obj):
         st.error(f"Erro ao adicionar dados na planilha: {e}")
         return False
 
-@st.cache_data
-def process_data(df_input):
-    """Processa e prepara os dados de vendas para análise."""
-    df = df_input.copy()
-    
-    cols_to_ensure_numeric = ['Cartão', 'Dinheiro', 'Pix', 'Total']
-    cols_to_ensure_date_derived = ['Ano', 'Mês', 'MêsNome', 'AnoMês', 'DataFormatada', 'DiaSemana', 'DiaDoMes']
-    
-    if df.empty:
-        all_expected_cols = ['Data'] + cols_to_ensure_numeric + cols_to_ensure_date_derived
-        empty_df = pd.DataFrame(columns=all_expected_cols)
-        for col in cols_to_ensure_numeric:
-            empty_df[col] = pd.Series(dtype='float')
-        for col in cols_to_ensure_date_derived:
-            empty_df[col] = pd.Series(dtype='object' if col in ['MêsNome', 'AnoMês', 'DataFormatada', 'DiaSemana'] else 'float')
-        empty_df['Data'] = pd.Series(dtype='datetime64[ns]')
-        return empty_df
-
-    for col in ['Cartão', 'Dinheiro', 'Pix']:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        else:
-            df[col] = 0
-
-    df['Total'] = df['Cartão'] + df['Dinheiro'] + df['Pix']
-
-    if 'Data' in df.columns and not df['Data'].isnull().all():
-        try:
-            if pd.api.types.is_string_dtype(df['Data']):
-                df['Data'] = pd.to_datetime(df['Data'], dayfirst=True, errors='coerce')
-                if df['Data'].isnull().all():
-                    df['Data'] = pd.to_datetime(df_input['Data'], errors='coerce')
-            elif not pd.api.types.is_datetime64_any_dtype(df['Data']):
-                df['Data'] = pd.to_datetime(df['Data'], errors='coerce')
-            
-            df.dropna(subset=['Data'], inplace=True)
+# --- Espelho Local (Parquet) da Tabela de Vendas ---
+@st.cache_resource
+def get_sales_mirror():
+    """Snapshot local dos dados processados, atualizado em segundo plano a partir da planilha."""
+    return EspelhoVendas.para_leitor(get_sales_reader(), SNAPSHOT_PATH, SNAPSHOT_REFRESH_SECONDS)
 
-            if not df.empty:
-                df['Ano'] = df['Data'].dt.year
-                df['Mês'] = df['Data'].dt.month
+@st.cache_resource
+def get_write_queue():
+    """Fila durável de vendas a enviar, descarregada em lotes (append_rows) por uma thread."""
+    return FilaEscrita.para_planilha(QUEUE_PATH, get_google_credentials(), WORKSHEET_NAME, get_sales_mirror())
+
+def render_queue_status():
+    """Mostra quantas vendas ainda aguardam envio à planilha."""
+    status = get_write_queue().status()
+    if status['pendentes']:
+        mensagem = f"⏳ {status['pendentes']} venda(s) aguardando envio à planilha."
+        if status['ultimo_erro'] and status['proxima_tentativa']:
+            proxima = datetime.fromtimestamp(status['proxima_tentativa']).strftime('%H:%M:%S')
+            mensagem += f" Nova tentativa às {proxima} (erro: {status['ultimo_erro']})."
+        st.warning(mensagem)
+    else:
+        st.caption(f"✅ Todas as vendas foram enviadas à planilha ({status['enviados']} pela fila local).")
 
-                try:
-                    df['MêsNome'] = df['Data'].dt.strftime('%B').str.capitalize()
-                    if not df['MêsNome'].dtype == 'object' or df['MêsNome'].str.isnumeric().any():
-                         df['MêsNome'] = df['Mês'].map(lambda x: meses_ordem[int(x)-1] if pd.notna(x) and 1 <= int(x) <= 12 else "Inválido")
-                except Exception:
-                    df['MêsNome'] = df['Mês'].map(lambda x: meses_ordem[int(x)-1] if pd.notna(x) and 1 <= int(x) <= 12 else "Inválido")
+def load_sales_snapshot():
+    """Retorna (dados processados, data do snapshot) lendo do disco; só vai à planilha se não houver snapshot."""
+    try:
+        return get_sales_mirror().ler_ou_carregar()
+    except Exception as e:
+        st.error(f"Erro ao ler dados da planilha: {e}")
+        return processar_vendas(pd.DataFrame()), None
+
+@st.cache_data(max_entries=4)
+def get_sales_rollups(_df_processed, versao):
+    """Cubos dia/mês/dia da semana, recalculados só quando a versão dos dados muda."""
+    return construir_cubos(_df_processed)
+
+@st.cache_data(max_entries=4)
+def get_sales_heatmaps(_df_processed, versao):
+    """Grades 53×7 por ano do heatmap de atividade, recalculadas só quando a versão dos dados muda."""
+    return construir_heatmaps(_df_processed)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_chart_spec(tipo, versao, filtros, _construir, _dados):
+    """
+    Spec Vega-Lite pronto de um gráfico, com os dados embutidos.
+    Só é reconstruído quando muda (tipo, versão dos dados, filtros); widgets que não
+    afetam o gráfico apenas reemitem o spec em cache.
+    """
+    chart = _construir(_dados)
+    if chart is None:
+        return None
+    # Dados embutidos no spec (o transformer 'json' global gravaria arquivos em disco)
+    with alt.data_transformers.enable('default', max_rows=None):
+        return chart.to_dict()
 
-                df['AnoMês'] = df['Data'].dt.strftime('%Y-%m')
-                df['DataFormatada'] = df['Data'].dt.strftime('%d/%m/%Y')
-                
-                day_map = {0: "Segunda-feira", 1: "Terça-feira", 2: "Quarta-feira", 3: "Quinta-feira", 4: "Sexta-feira", 5: "Sábado", 6: "Domingo"}
-                df['DiaSemana'] = df['Data'].dt.dayofweek.map(day_map)
-                df['DiaDoMes'] = df['Data'].dt.day
-
-                df['DiaSemana'] = pd.Categorical(df['DiaSemana'], categories=[d for d in dias_semana_ordem if d in df['DiaSemana'].unique()], ordered=True)
-            else:
-                for col in cols_to_ensure_date_derived:
-                    df[col] = pd.Series(dtype='object' if col in ['MêsNome', 'AnoMês', 'DataFormatada', 'DiaSemana'] else 'float')
-        except Exception as e:
-            st.error(f"Erro crítico ao processar a coluna 'Data': {e}. Verifique o formato das datas na planilha.")
-            for col in cols_to_ensure_date_derived:
-                df[col] = pd.Series(dtype='object' if col in ['MêsNome', 'AnoMês', 'DataFormatada', 'DiaSemana'] else 'float')
-    else:
-        if 'Data' not in df.columns:
-            st.warning("Coluna 'Data' não encontrada no DataFrame. Algumas análises temporais não estarão disponíveis.")
-            df['Data'] = pd.NaT
-        for col in cols_to_ensure_date_derived:
-            df[col] = pd.Series(dtype='object' if col in ['MêsNome', 'AnoMês', 'DataFormatada', 'DiaSemana'] else 'float')
-            
-    return df
+def versao_dos_dados(df_processed, dados_de):
+    """Versão usada como chave dos cubos: data do snapshot ou, sem snapshot, hash do conteúdo."""
+    if dados_de is not None:
+        return dados_de
+    return int(pd.util.hash_pandas_object(df_processed, index=False).sum()) if not df_processed.empty else 0
 
 # --- Funções de Gráficos Interativos em Altair ---
-def create_radial_plot(df):
-    """Cria um gráfico radial plot substituindo o gráfico de pizza."""
-    if df.empty or not any(col in df.columns for col in ['Cartão', 'Dinheiro', 'Pix']):
+def create_radial_plot(cubo_mes):
+    """Cria um gráfico radial plot substituindo o gráfico de pizza (a partir do cubo mensal filtrado)."""
+    if cubo_mes.empty or not any(col in cubo_mes.columns for col in ['Cartão', 'Dinheiro', 'Pix']):
         return None
     
     payment_data = pd.DataFrame({
         'Método': ['Cartão', 'Dinheiro', 'PIX'],
-        'Valor': [df['Cartão'].sum(), df['Dinheiro'].sum(), df['Pix'].sum()]
+        'Valor': [cubo_mes['Cartão'].sum(), cubo_mes['Dinheiro'].sum(), cubo_mes['Pix'].sum()]
     })
     payment_data = payment_data[payment_data['Valor'] > 0]
     
@@ -296,8 +263,12 @@ def create_radial_plot(df):
 
     return radial_plot
 
-def create_cumulative_area_chart(df):
-    """Cria gráfico de área ACUMULADO com gradiente.""" # Modificado
+def create_cumulative_area_chart(df, resolucao='dia', limite_pontos=None):
+    """Cria gráfico de área ACUMULADO com gradiente.
+
+    'df' é a série já na resolução escolhida (uma linha por dia/semana/mês). Com
+    'limite_pontos', a curva acumulada é reduzida por LTTB antes de ir ao navegador.
+    """ # Modificado
     # Validação da entrada: Verifica se o DataFrame está vazio ou se as colunas necessárias estão ausentes
     if df.empty or 'Data' not in df.columns or 'Total' not in df.columns:
         st.warning("Dados insuficientes ou colunas 'Data'/'Total' ausentes para gerar o gráfico de evolução acumulada.")
@@ -321,6 +292,10 @@ def create_cumulative_area_chart(df):
 
     # Calcula o total acumulado
     df_sorted['Total_Acumulado'] = df_sorted['Total'].cumsum()
+    if limite_pontos and len(df_sorted) > limite_pontos:
+        # Mantém a forma da curva (o acumulado é calculado antes, sobre todos os pontos)
+        df_sorted = df_sorted.iloc[lttb(df_sorted['Data'].astype('int64'), df_sorted['Total_Acumulado'], limite_pontos)]
+    rotulos = ROTULOS_RESOLUCAO[resolucao]
 
     # Cria o gráfico Altair
     area_chart = alt.Chart(df_sorted).mark_area(
@@ -338,7 +313,7 @@ def create_cumulative_area_chart(df):
         x=alt.X(
             'Data:T', # 'T' especifica o tipo de dado temporal
             #title='Data',
-            axis=alt.Axis(format='%d/%m', labelAngle=-45, labelFontSize=12) # Formata os rótulos do eixo x
+            axis=alt.Axis(format=rotulos['eixo'], labelAngle=-45, labelFontSize=12) # Formata os rótulos do eixo x
         ),
         y=alt.Y(
             'Total_Acumulado:Q', # 'Q' especifica o tipo de dado quantitativo
@@ -346,8 +321,8 @@ def create_cumulative_area_chart(df):
             axis=alt.Axis(labelFontSize=12) # Formata os rótulos do eixo y
         ),
         tooltip=[ # Define o que aparece ao passar o mouse
-            alt.Tooltip('Data:T', title='Data', format='%d/%m/%Y'), # Formata a data no tooltip
-            alt.Tooltip('Total:Q', title='Venda do Dia (R$)', format=',.2f'),
+            alt.Tooltip('Data:T', title=rotulos['tooltip'], format=rotulos['formato']), # Formata a data no tooltip
+            alt.Tooltip('Total:Q', title=rotulos['venda'], format=',.2f'),
             alt.Tooltip('Total_Acumulado:Q', title='Total Acumulado (R$)', format=',.2f')
         ]
     ).properties(
@@ -366,8 +341,8 @@ def create_cumulative_area_chart(df):
 
     return area_chart
 
-def create_advanced_daily_sales_chart(df):
-    """Cria um gráfico de vendas diárias sem animação."""
+def create_advanced_daily_sales_chart(df, resolucao='dia'):
+    """Cria um gráfico de vendas diárias sem animação (ou por semana/mês, conforme a resolução da série)."""
     if df.empty or 'Data' not in df.columns:
         return None
     
@@ -377,7 +352,7 @@ def create_advanced_daily_sales_chart(df):
         return None
     
     df_melted = df_sorted.melt(
-        id_vars=['Data', 'DataFormatada', 'Total'],
+        id_vars=['Data', 'Total'],
         value_vars=['Cartão', 'Dinheiro', 'Pix'],
         var_name='Método',
         value_name='Valor'
@@ -388,6 +363,7 @@ def create_advanced_daily_sales_chart(df):
     if df_melted.empty:
         return None
     
+    rotulos = ROTULOS_RESOLUCAO[resolucao]
     bars = alt.Chart(df_melted).mark_bar(
         size=20,
         stroke='white',     # Cor da borda
@@ -395,8 +371,8 @@ def create_advanced_daily_sales_chart(df):
     ).encode(
         x=alt.X(
             'Data:T',
-            title='Data',
-            axis=alt.Axis(format='%d/%m', labelAngle=-45, labelFontSize=12)
+            title=rotulos['tooltip'],
+            axis=alt.Axis(format=rotulos['eixo'], labelAngle=-45, labelFontSize=12)
         ),
         y=alt.Y(
             'Valor:Q',
@@ -410,7 +386,7 @@ def create_advanced_daily_sales_chart(df):
             legend=None
         ),
         tooltip=[
-            alt.Tooltip('DataFormatada:N', title='Data'),
+            alt.Tooltip('Data:T', title=rotulos['tooltip'], format=rotulos['formato']),
             alt.Tooltip('Método:N', title='Método'),
             alt.Tooltip('Valor:Q', title='Valor (R$)', format=',.2f')
         ]
@@ -426,24 +402,14 @@ def create_advanced_daily_sales_chart(df):
     
     return bars
 
-def create_enhanced_weekday_analysis(df):
-    """Cria análise de vendas por dia da semana sem animação."""
-    if df.empty or 'DiaSemana' not in df.columns or 'Total' not in df.columns:
+def create_enhanced_weekday_analysis(cubo_dia_semana):
+    """Cria análise de vendas por dia da semana sem animação (a partir do cubo por dia da semana filtrado)."""
+    if cubo_dia_semana.empty:
         return None, None
     
-    df_copy = df.copy()
-    df_copy['Total'] = pd.to_numeric(df_copy['Total'], errors='coerce')
-    df_copy.dropna(subset=['Total', 'DiaSemana'], inplace=True)
-    
-    if df_copy.empty:
-        return None, None
-    
-    weekday_stats = df_copy.groupby('DiaSemana', observed=True).agg({
-        'Total': ['mean', 'sum', 'count']
-    }).round(2)
-    
+    weekday_stats = reagrupar(cubo_dia_semana, ['DiaSemana'])
+    weekday_stats = weekday_stats[['Total_media', 'Total', 'Registros']].round(2)
     weekday_stats.columns = ['Média', 'Total', 'Dias_Vendas']
-    weekday_stats = weekday_stats.reindex([d for d in dias_semana_ordem if d in weekday_stats.index])
     weekday_stats = weekday_stats.reset_index()
     
     total_media_geral = weekday_stats['Média'].sum()
@@ -540,20 +506,13 @@ def create_sales_histogram(df, title="Distribuição dos Valores de Venda Diári
     
     return histogram
 
-def analyze_sales_by_weekday(df):
-    """Analisa vendas por dia da semana."""
-    if df.empty or 'DiaSemana' not in df.columns or 'Total' not in df.columns or df['DiaSemana'].isnull().all() or df['Total'].isnull().all():
+def analyze_sales_by_weekday(cubo_dia_semana):
+    """Analisa vendas por dia da semana (a partir do cubo por dia da semana filtrado)."""
+    if cubo_dia_semana.empty:
         return None, None
     
     try:
-        df_copy = df.copy()
-        df_copy['Total'] = pd.to_numeric(df_copy['Total'], errors='coerce')
-        df_copy.dropna(subset=['Total', 'DiaSemana'], inplace=True)
-        
-        if df_copy.empty:
-            return None, None
-        
-        avg_sales_weekday = df_copy.groupby('DiaSemana', observed=True)['Total'].mean().reindex(dias_semana_ordem).dropna()
+        avg_sales_weekday = reagrupar(cubo_dia_semana, ['DiaSemana'])['Total_media'].dropna()
         
         if not avg_sales_weekday.empty:
             best_day = avg_sales_weekday.idxmax()
@@ -564,197 +523,96 @@ def analyze_sales_by_weekday(df):
         st.error(f"Erro ao analisar vendas por dia da semana: {e}")
         return None, None
 
-# --- Funções de Cálculos Financeiros ---
-def calculate_financial_results(df, salario_minimo, custo_contadora, custo_fornecedores_percentual):
-    """Calcula os resultados financeiros com base nos dados de vendas seguindo normas contábeis."""
-    results = {
-        'receita_bruta': 0, 'receita_tributavel': 0, 'receita_nao_tributavel': 0,
-        'impostos_sobre_vendas': 0, 'receita_liquida': 0, 'custo_produtos_vendidos': 0,
-        'lucro_bruto': 0, 'margem_bruta': 0, 'despesas_administrativas': 0,
-        'despesas_com_pessoal': 0, 'despesas_contabeis': custo_contadora,
-        'total_despesas_operacionais': 0, 'lucro_operacional': 0, 'margem_operacional': 0,
-        'lucro_antes_ir': 0, 'lucro_liquido': 0, 'margem_liquida': 0,
-        'diferenca_tributavel_nao_tributavel': 0
-    }
-    
-    if df.empty: 
-        return results
-    
-    results['receita_bruta'] = df['Total'].sum()
-    results['receita_tributavel'] = df['Cartão'].sum() + df['Pix'].sum()
-    results['receita_nao_tributavel'] = df['Dinheiro'].sum()
-    results['impostos_sobre_vendas'] = results['receita_tributavel'] * 0.06
-    results['receita_liquida'] = results['receita_bruta'] - results['impostos_sobre_vendas']
-    results['custo_produtos_vendidos'] = results['receita_bruta'] * (custo_fornecedores_percentual / 100)
-    results['lucro_bruto'] = results['receita_liquida'] - results['custo_produtos_vendidos']
-    
-    if results['receita_liquida'] > 0:
-        results['margem_bruta'] = (results['lucro_bruto'] / results['receita_liquida']) * 100
-    
-    results['despesas_com_pessoal'] = salario_minimo * 1.55
-    results['despesas_contabeis'] = custo_contadora
-    results['despesas_administrativas'] = 0
-    results['total_despesas_operacionais'] = (
-        results['despesas_com_pessoal'] + 
-        results['despesas_contabeis'] + 
-        results['despesas_administrativas']
+# Linhas do DRE: (rótulo, chave em resultados, estilo, modelo do valor);
+# sem chave, o modelo é o próprio texto da coluna de valor
+LINHAS_DRE = [
+    ("RECEITA BRUTA", 'receita_bruta', 'titulo', "{}"),
+    ("(-) DEDUÇÕES", None, 'titulo', ""),
+    ("Simples Nacional", 'impostos_sobre_vendas', 'item', "({})"),
+    ("RECEITA LÍQUIDA", 'receita_liquida', 'titulo', "{}"),
+    ("(-) CUSTO DOS PRODUTOS VENDIDOS", 'custo_produtos_vendidos', 'titulo', "({})"),
+    ("LUCRO BRUTO", 'lucro_bruto', 'titulo', "{}"),
+    ("(-) DESPESAS OPERACIONAIS", None, 'titulo', ""),
+    ("Despesas com Pessoal", 'despesas_com_pessoal', 'item', "({})"),
+    ("Serviços Contábeis", 'despesas_contabeis', 'item', "({})"),
+    ("LUCRO OPERACIONAL", 'lucro_operacional', 'titulo', "{}"),
+    ("LUCRO ANTES DO IMPOSTO DE RENDA", 'lucro_antes_ir', 'titulo', "{}"),
+    ("(-) Provisão para Imposto de Renda", None, 'titulo', "-"),
+    ("RESULTADO LÍQUIDO DO EXERCÍCIO", 'lucro_liquido', 'resultado', "{}"),
+]
+ESTILOS_DRE = {
+    'titulo': "font-weight: bold;",
+    'item': "padding-left: 2em;",
+    'resultado': "font-weight: bold; font-size: 1.6rem; padding-top: 0.8rem;",
+}
+
+def montar_dre_html(resultados_ano, ano_dre):
+    """DRE inteiro (cabeçalho e linhas) como uma única tabela HTML, enviada ao navegador de uma vez."""
+    chaves = [chave for _, chave, _, _ in LINHAS_DRE if chave]
+    # Todas as linhas formatadas numa só passada (reais inteiros, sem "R$")
+    valores = dict(zip(chaves, formatar_reais([resultados_ano[chave] for chave in chaves], casas=0, prefixo='')))
+
+    linhas = []
+    for rotulo, chave, estilo, modelo in LINHAS_DRE:
+        valor = modelo.format(valores[chave]) if chave else modelo
+        css = ESTILOS_DRE[estilo]
+        # Itens: só o rótulo recuado; o valor segue o estilo da linha sem recuo
+        css_valor = "" if estilo == 'item' else css
+        linhas.append(f'<tr><td style="{css} border: none;">{rotulo}</td>'
+                      f'<td style="{css_valor} border: none; text-align: right; white-space: nowrap;">{valor}</td></tr>')
+
+    # Sem recuo no início das linhas, para o markdown não tratar o HTML como bloco de código
+    return (
+        '<div style="text-align: center; margin-bottom: 30px;">'
+        '<h3 style="margin: 0; font-weight: normal;">DEMONSTRAÇÃO DO RESULTADO DO EXERCÍCIO</h3>'
+        f'<p style="margin: 5px 0; font-style: italic;">Clips Burger - Exercício {ano_dre}</p>'
+        '</div>\n'
+        '<table style="width: 100%; border-collapse: collapse; border: none;">'
+        '<colgroup><col style="width: 75%;"><col style="width: 25%;"></colgroup>'
+        '<tr><td style="border: none;"></td>'
+        '<td style="border: none; text-align: right; font-weight: bold;">Em R$</td></tr>'
+        + ''.join(linhas) +
+        '</table>'
     )
-    
-    results['lucro_operacional'] = results['lucro_bruto'] - results['total_despesas_operacionais']
-    if results['receita_liquida'] > 0:
-        results['margem_operacional'] = (results['lucro_operacional'] / results['receita_liquida']) * 100
-    
-    results['lucro_antes_ir'] = results['lucro_operacional']
-    results['lucro_liquido'] = results['lucro_antes_ir']
-    if results['receita_liquida'] > 0:
-        results['margem_liquida'] = (results['lucro_liquido'] / results['receita_liquida']) * 100
-    
-    results['diferenca_tributavel_nao_tributavel'] = results['receita_nao_tributavel']
-    
-    return results
 
-def create_dre_textual(resultados, df_processed, selected_anos_filter):
-    """Cria uma apresentação textual do DRE no estilo tradicional contábil usando dados anuais."""
-    def format_val(value):
-        return f"{value:,.0f}".replace(",", ".")
-
-    def calc_percent(value, base):
-        if base == 0:
-            return 0
-        return (value / base) * 100
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_dre_anual_html(ano_dre, parametros, versao, _df_processed):
+    """
+    HTML do DRE do ano completo, reconstruído só quando muda (ano, parâmetros da
+    simulação, versão dos dados). None se não houver vendas no ano.
+    """
+    if _df_processed.empty or 'Ano' not in _df_processed.columns:
+        return None
+    df_ano = _df_processed[_df_processed['Ano'] == ano_dre]
+    if df_ano.empty:
+        return None
+    salario, contadora_mensal, fornecedores = parametros
+    resultados_ano = calculate_financial_results(df_ano, salario, contadora_mensal * 12, fornecedores)  # custo anual
+    return montar_dre_html(resultados_ano, ano_dre)
 
+def create_dre_textual(resultados, df_processed, selected_anos_filter, versao_dados):
+    """Cria uma apresentação textual do DRE no estilo tradicional contábil usando dados anuais."""
     # Determinar o ano para o DRE
     if selected_anos_filter and len(selected_anos_filter) == 1:
         ano_dre = selected_anos_filter[0]
     else:
         ano_dre = datetime.now().year
 
-    # Filtrar dados APENAS por ano (ignorar filtro de mês)
-    if not df_processed.empty and 'Ano' in df_processed.columns:
-        df_ano = df_processed[df_processed['Ano'] == ano_dre].copy()
-        
-        # Recalcular resultados com dados do ano completo
-        if not df_ano.empty:
-            resultados_ano = calculate_financial_results(
-                df_ano, 
-                st.session_state.get('salario_tab4', 1550.0), 
-                st.session_state.get('contadora_tab4', 316.0) * 12, # Custo anual
-                st.session_state.get('fornecedores_tab4', 30.0)
-            )
-        else:
-            # Se não houver dados para o ano, usar os resultados filtrados (pode ser de outro período)
-            # Ou zerar? Melhor usar os filtrados para não mostrar tudo zero.
-            resultados_ano = resultados # Mantém os resultados do filtro atual se não houver dados do ano
+    parametros = (
+        st.session_state.get('salario_tab4', 1550.0),
+        st.session_state.get('contadora_tab4', 316.0),
+        st.session_state.get('fornecedores_tab4', 30.0),
+    )
+    # Recalcula com os dados do ano completo (ignora o filtro de mês)
+    dre_html = get_dre_anual_html(ano_dre, parametros, versao_dados, df_processed)
+    if dre_html is None:
+        # Sem vendas no ano: mostra os resultados do filtro atual em vez de tudo zerado
+        if not df_processed.empty and 'Ano' in df_processed.columns:
             st.warning(f"⚠️ Não há dados de vendas registrados para o ano {ano_dre}. O DRE abaixo pode refletir um período diferente.")
-    else:
-        resultados_ano = resultados # Usa resultados filtrados se df_processed estiver vazio
+        dre_html = montar_dre_html(resultados, ano_dre)
 
-    # Cabeçalho centralizado
-    st.markdown(f"""
-    <div style="text-align: center; margin-bottom: 30px;">
-        <h3 style="margin: 0; font-weight: normal;">DEMONSTRAÇÃO DO RESULTADO DO EXERCÍCIO</h3>
-        <p style="margin: 5px 0; font-style: italic;">Clips Burger - Exercício {ano_dre}</p>
-    """, unsafe_allow_html=True)
+    st.markdown(dre_html, unsafe_allow_html=True)
 
-    # Criar 2 colunas - descrição e valor
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("")
-    with col2:
-        st.markdown("**Em R$**")
-    
-    # RECEITA BRUTA
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("**RECEITA BRUTA**")
-    with col2:
-        st.markdown(f"**{format_val(resultados_ano['receita_bruta'])}**")
-    
-    # DEDUÇÕES
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("**(-) DEDUÇÕES**")
-    with col2:
-        st.markdown("")
-    
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("&nbsp;&nbsp;&nbsp;&nbsp;Simples Nacional")
-    with col2:
-        st.markdown(f"({format_val(resultados_ano['impostos_sobre_vendas'])})")
-    
-    # RECEITA LÍQUIDA
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("**RECEITA LÍQUIDA**")
-    with col2:
-        st.markdown(f"**{format_val(resultados_ano['receita_liquida'])}**")
-    
-    # CUSTO DOS PRODUTOS VENDIDOS
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("**(-) CUSTO DOS PRODUTOS VENDIDOS**")
-    with col2:
-        st.markdown(f"**({format_val(resultados_ano['custo_produtos_vendidos'])})**")
-    
-    # LUCRO BRUTO
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("**LUCRO BRUTO**")
-    with col2:
-        st.markdown(f"**{format_val(resultados_ano['lucro_bruto'])}**")
-    
-    # DESPESAS OPERACIONAIS
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("**(-) DESPESAS OPERACIONAIS**")
-    with col2:
-        st.markdown("")
-    
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("&nbsp;&nbsp;&nbsp;&nbsp;Despesas com Pessoal")
-    with col2:
-        # Ajuste para mostrar despesa anual
-        st.markdown(f"({format_val(resultados_ano['despesas_com_pessoal'])})") 
-    
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("&nbsp;&nbsp;&nbsp;&nbsp;Serviços Contábeis")
-    with col2:
-         # Ajuste para mostrar despesa anual
-        st.markdown(f"({format_val(resultados_ano['despesas_contabeis'])})")
-    
-    # LUCRO OPERACIONAL
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("**LUCRO OPERACIONAL**")
-    with col2:
-        st.markdown(f"**{format_val(resultados_ano['lucro_operacional'])}**")
-    
-    # RESULTADO ANTES DO IMPOSTO DE RENDA
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("**LUCRO ANTES DO IMPOSTO DE RENDA**")
-    with col2:
-        st.markdown(f"**{format_val(resultados_ano['lucro_antes_ir'])}**")
-    
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("**(-) Provisão para Imposto de Renda**")
-    with col2:
-        st.markdown("**-**")
-    
-    # Linha de separação
-    #st.markdown("---")
-    
-    # RESULTADO LÍQUIDO - destacado
-    col1, col2 = st.columns([6, 2])
-    with col1:
-        st.markdown("## **RESULTADO LÍQUIDO DO EXERCÍCIO**")
-    with col2:
-        st.markdown(f"## **{format_val(resultados_ano['lucro_liquido'])}**")
-    
     # Nota explicativa
     st.info(f"📅 **Nota:** Este DRE apresenta os resultados consolidados do exercício {ano_dre}, independente do filtro de mês aplicado nas outras análises.")
 
@@ -833,15 +691,16 @@ def create_financial_dashboard_altair(resultados):
     return chart
 
 # --- Dashboard Premium Functions ---
-def create_premium_kpi_cards(df):
-    """Cria cards KPI premium com emoticons DENTRO dos boxes."""
-    if df.empty:
+def create_premium_kpi_cards(cubo_dia):
+    """Cria cards KPI premium com emoticons DENTRO dos boxes (a partir do cubo diário filtrado)."""
+    if cubo_dia.empty:
         return
     
-    total_vendas = df['Total'].sum()
-    media_diaria = df['Total'].mean()
-    melhor_dia = df.loc[df['Total'].idxmax(), 'DataFormatada'] if not df.empty and 'DataFormatada' in df.columns else "N/A"
-    crescimento = ((df['Total'].tail(7).mean() - df['Total'].head(7).mean()) / df['Total'].head(7).mean() * 100) if len(df) >= 14 and df['Total'].head(7).mean() != 0 else 0.0
+    vendas_por_dia = reagrupar(cubo_dia, ['Data'])['Total']
+    total_vendas = vendas_por_dia.sum()
+    media_diaria = vendas_por_dia.mean()
+    melhor_dia = vendas_por_dia.idxmax().strftime('%d/%m/%Y')
+    crescimento = ((vendas_por_dia.tail(7).mean() - vendas_por_dia.head(7).mean()) / vendas_por_dia.head(7).mean() * 100) if len(vendas_por_dia) >= 14 and vendas_por_dia.head(7).mean() != 0 else 0.0
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -849,7 +708,7 @@ def create_premium_kpi_cards(df):
         with st.container():
             st.metric(
                 label="💰 Faturamento Total",
-                value=format_brl(total_vendas),
+                value=format_currency(total_vendas),
                 delta=f"{crescimento:+.1f}% vs período anterior" if crescimento != 0 else None
             )
     
@@ -857,7 +716,7 @@ def create_premium_kpi_cards(df):
         with st.container():
             st.metric(
                 label="📊 Média Diária",
-                value=format_brl(media_diaria),
+                value=format_currency(media_diaria),
                 # delta="+8.2% vs período anterior" # Placeholder delta
             )
     
@@ -877,83 +736,38 @@ def create_premium_kpi_cards(df):
                 delta="Crescimento" if crescimento > 0 else "Estável/Declínio" if crescimento == 0 else "Declínio"
             )
 # --- NOVA FUNÇÃO: Gráfico Heatmap de Atividade ---
-def create_activity_heatmap(df_input):
-    """Cria um gráfico de heatmap estilo GitHub para a atividade de vendas - IGNORA FILTRO DE MÊS."""
-    if df_input.empty or 'Data' not in df_input.columns or 'Total' not in df_input.columns:
-        st.info("Dados insuficientes para gerar o heatmap de atividade.")
-        return None
+def create_activity_heatmap(heatmaps):
+    """Cria um gráfico de heatmap estilo GitHub para a atividade de vendas - IGNORA FILTRO DE MÊS.
 
-    # MODIFICAÇÃO: Recarregar dados completos ignorando filtros
-    df_completo = read_sales_data()  # Busca dados completos da planilha
-    if df_completo.empty:
-        st.info("Sem dados disponíveis para o heatmap.")
-        return None
-    
-    # Processar os dados completos
-    df_completo = process_data(df_completo)
-    
-    df = df_completo.copy()
-    df['Data'] = pd.to_datetime(df['Data'], errors='coerce')
-    df.dropna(subset=['Data'], inplace=True)
-    
-    if df.empty:
-        st.info("Dados insuficientes após processamento para gerar o heatmap de atividade.")
+    Recebe as grades 53×7 por ano de rollups.construir_heatmaps (calculadas uma vez por versão dos dados).
+    """
+    if not heatmaps:
+        st.info("Dados insuficientes para gerar o heatmap de atividade.")
         return None
 
-    # Determinar o ano atual ou mais recente dos dados
-    current_year = df['Data'].dt.year.max()
-    df = df[df['Data'].dt.year == current_year]
-
-    if df.empty:
-        st.info(f"Sem dados para o ano {current_year} para gerar o heatmap.")
-        return None
+    # Ano mais recente dos dados
+    current_year = max(heatmaps)
+    grades = heatmaps[current_year]
+
+    # Só as células que são dias do ano; coordenadas e somas já vêm prontas
+    dentro_do_ano = ~np.isnat(grades['datas'])
+    day_name_map = np.array(['Dom', 'Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb'])
+    full_df = pd.DataFrame({
+        'Data': grades['datas'][dentro_do_ano],
+        'week_corrected': grades['semana'][dentro_do_ano],
+        'day_display_name': day_name_map[grades['dia_semana'][dentro_do_ano]],
+        'Total': grades['Total'][dentro_do_ano],
+        'Cartao': grades['Cartão'][dentro_do_ano],
+        'Dinheiro': grades['Dinheiro'][dentro_do_ano],
+        'Pix': grades['Pix'][dentro_do_ano]
+    })
 
-    # Criar todas as datas do ano selecionado
-    start_date = datetime(current_year, 1, 1)
-    end_date = datetime(current_year, 12, 31)
-    all_dates = pd.date_range(start=start_date, end=end_date, freq='D')
-
-    # DataFrame com todas as datas
-    full_df = pd.DataFrame({'Data': all_dates})
-    # Certificar que as colunas existem antes de mergear
-    cols_to_merge = ['Data', 'Total', 'Cartao', 'Dinheiro', 'Pix']
-    cols_present = [col for col in cols_to_merge if col in df.columns]
-    full_df = full_df.merge(df[cols_present], on='Data', how='left')
-    
-    # Preencher NaNs e garantir colunas
-    for col in ['Total', 'Cartao', 'Dinheiro', 'Pix']:
-        if col not in full_df.columns:
-            full_df[col] = 0
-        else:
-            full_df[col] = full_df[col].fillna(0)
-
-    # Ajuste para o estilo GitHub
-    full_df['day_of_week'] = full_df['Data'].dt.dayofweek # Seg=0, Dom=6
-    full_df['day_name'] = full_df['Data'].dt.strftime('%a') # Abreviação do dia
-    # Mapear para ordem correta no gráfico (Dom=0)
-    day_order_map = {'Mon': 1, 'Tue': 2, 'Wed': 3, 'Thu': 4, 'Fri': 5, 'Sat': 6, 'Sun': 0}
-    full_df['day_sort_order'] = full_df['Data'].dt.weekday.map(lambda x: (x + 1) % 7) # Dom=0, Seg=1...
-    day_name_map = {0: 'Dom', 1: 'Seg', 2: 'Ter', 3: 'Qua', 4: 'Qui', 5: 'Sex', 6: 'Sáb'}
-    full_df['day_display_name'] = full_df['day_sort_order'].map(day_name_map)
-    
-    full_df['week'] = full_df['Data'].dt.isocalendar().week
-    full_df['month'] = full_df['Data'].dt.month
-    full_df['month_name'] = full_df['Data'].dt.strftime('%b')
-
-    # Corrigir semanas de dezembro que aparecem como 1 no isocalendar
-    full_df.loc[(full_df['Data'].dt.month == 12) & (full_df['week'] <= 4), 'week'] = full_df['week'].max() + 1
-    # Corrigir semanas de janeiro que aparecem como 52/53
-    full_df.loc[(full_df['Data'].dt.month == 1) & (full_df['week'] >= 52), 'week'] = 0
-    
-    # Recalcular week para garantir ordem correta após ajustes
-    first_day_of_year = pd.Timestamp(f'{current_year}-01-01')
-    full_df['week_corrected'] = ((full_df['Data'] - first_day_of_year).dt.days // 7)
-    
-    # Encontrar a primeira semana (corrigida) de cada mês para os rótulos
-    month_labels = full_df.groupby('month').agg(
-        week_corrected=('week_corrected', 'min'),
-        month_name=('month_name', 'first')
-    ).reset_index()
+    # Primeira semana (corrigida) de cada mês para os rótulos
+    inicio_meses = np.arange(f'{current_year}-01', f'{current_year + 1}-01', dtype='datetime64[M]').astype('datetime64[D]')
+    month_labels = pd.DataFrame({
+        'week_corrected': (inicio_meses - np.datetime64(f'{current_year}-01-01', 'D')).astype(int) // 7,
+        'month_name': pd.DatetimeIndex(inicio_meses).strftime('%b')
+    })
 
     # Labels dos meses
     months_chart = alt.Chart(month_labels).mark_text(
@@ -1028,10 +842,6 @@ def create_activity_heatmap(df_input):
 
     return final_chart
 
-# Função para formatar valores em moeda brasileira
-def format_brl(value):
-    return f"R$ {value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
-
 # --- Interface Principal da Aplicação ---
 def main():
     # --- MODIFICAÇÃO DO LOGO E TÍTULO ---
@@ -1140,8 +950,9 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
-    df_raw = read_sales_data()
-    df_processed = process_data(df_raw)
+    df_processed, dados_de = load_sales_snapshot()
+    if dados_de is not None:
+        st.caption(f"🕒 Dados de {dados_de.strftime('%d/%m/%Y %H:%M:%S')} (atualização automática a cada {SNAPSHOT_REFRESH_SECONDS // 60} min)")
 
     # Criar 5 tabs incluindo o Dashboard Premium
     tab1, tab2, tab3, tab4 = st.tabs([
@@ -1197,7 +1008,7 @@ def main():
         <div style="text-align: center; padding: 0.7rem 1rem; background: linear-gradient(90deg, #4c78a8, #54a24b); border-radius: 10px; color: white; margin: 0.5rem 0; box-shadow: 0 4px 12px rgba(0,0,0,0.2); height: 3rem; display: flex; align-items: center; justify-content: center;">
             <div>
                 <span style="font-size: 1.8rem; margin-right: 0.5rem; text-shadow: 1px 1px 3px rgba(0,0,0,0.3);">💰</span>
-                <span style="font-size: 2.2rem; font-weight: bold; text-shadow: 1px 1px 3px rgba(0,0,0,0.3);">Total: {format_brl(total_venda_form)}</span>
+                <span style="font-size: 2.2rem; font-weight: bold; text-shadow: 1px 1px 3px rgba(0,0,0,0.3);">Total: {format_currency(total_venda_form)}</span>
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -1206,18 +1017,13 @@ def main():
         if st.button("✅ Registrar Venda", type="primary", use_container_width=True):
             if total_venda_form > 0:
                 formatted_date = data_input.strftime("%d/%m/%Y")
-                worksheet_obj = get_worksheet()
-                if worksheet_obj and add_data_to_sheet(formatted_date, cartao_val, dinheiro_val, pix_val, worksheet_obj):
-                    # Limpar caches relevantes após adicionar dados
-                    get_worksheet.clear()
-                    read_sales_data.clear()
-                    process_data.clear()
-                    st.success("✅ Venda registrada e dados recarregados!")
+                # A venda vai para a fila local; caches e snapshot são recarregados após o envio
+                if add_data_to_sheet(formatted_date, cartao_val, dinheiro_val, pix_val, get_write_queue()):
                     st.rerun()
-                elif not worksheet_obj: 
-                    st.error("❌ Falha ao conectar à planilha. Venda não registrada.")
             else: 
                 st.warning("⚠️ O valor total da venda deve ser maior que zero.")
+        
+        render_queue_status()
 
     # --- SIDEBAR COM FILTROS ---
     selected_anos_filter, selected_meses_filter = [], []
@@ -1267,6 +1073,12 @@ def main():
         if selected_meses_filter and 'Mês' in df_filtered.columns: 
             df_filtered = df_filtered[df_filtered['Mês'].isin(selected_meses_filter)]
 
+    # Cubos pré-agregados fatiados pelos mesmos filtros (gráficos leem daqui, não das linhas)
+    versao_dados = versao_dos_dados(df_processed, dados_de)
+    filtros_grafico = (tuple(selected_anos_filter), tuple(selected_meses_filter))
+    cubos = get_sales_rollups(df_processed, versao_dados) if not df_processed.empty else {}
+    cubos_filtrados = {nome: fatiar(cubo, selected_anos_filter, selected_meses_filter) for nome, cubo in cubos.items()}
+
     # Mostrar informações dos filtros aplicados na sidebar
     if not df_filtered.empty:
         total_registros_filtrados = len(df_filtered)
@@ -1274,22 +1086,25 @@ def main():
         st.sidebar.markdown("---")
         st.sidebar.markdown("### 📈 Resumo dos Filtros Aplicados")
         st.sidebar.metric("Registros Filtrados", total_registros_filtrados)
-        st.sidebar.metric("Faturamento Filtrado", format_brl(total_faturamento_filtrado))
+        st.sidebar.metric("Faturamento Filtrado", format_currency(total_faturamento_filtrado))
     elif not df_processed.empty:
         st.sidebar.markdown("---")
         st.sidebar.info("Nenhum registro corresponde aos filtros selecionados.")
     
     with tab2:
         st.header("🔎 Análise Detalhada de Vendas")
-        if not df_filtered.empty and 'DataFormatada' in df_filtered.columns:
+        if not df_filtered.empty and 'Data' in df_filtered.columns:
             st.subheader("🧾 Tabela de Vendas Filtradas")
-            cols_to_display_tab2 = ['DataFormatada', 'DiaSemana', 'DiaDoMes', 'Cartão', 'Dinheiro', 'Pix', 'Total']
+            cols_to_display_tab2 = ['Data', 'DiaSemana', 'DiaDoMes', 'Cartão', 'Dinheiro', 'Pix', 'Total']
             cols_existentes_tab2 = [col for col in cols_to_display_tab2 if col in df_filtered.columns]
             
             if cols_existentes_tab2: 
                 # Ordenar pela data mais recente primeiro
-                df_display_tab2 = df_filtered.sort_values(by='Data', ascending=False)
-                st.dataframe(df_display_tab2[cols_existentes_tab2], use_container_width=True, height=600, hide_index=True)
+                df_display_tab2 = df_filtered.sort_values(by='Data', ascending=False)[cols_existentes_tab2]
+                st.dataframe(
+                    formatar_colunas_reais(df_display_tab2, ['Cartão', 'Dinheiro', 'Pix', 'Total']), use_container_width=True, height=600, hide_index=True,
+                    column_config={'Data': st.column_config.DateColumn('Data', format='DD/MM/YYYY')}
+                )
             else: 
                 st.info("Colunas necessárias para a tabela de dados filtrados não estão disponíveis.")
 
@@ -1308,22 +1123,23 @@ def main():
 
             with col_metrics1:
                 st.metric("🔢 Total de Registros", f"{total_registros}")
-                st.metric("⬆️ Maior Venda Diária", format_brl(maior_venda_diaria))
+                st.metric("⬆️ Maior Venda Diária", format_currency(maior_venda_diaria))
 
             with col_metrics2:
-                st.metric("💵 Faturamento Total", format_brl(total_faturamento))
-                st.metric("⬇️ Menor Venda Diária (>0)", format_brl(menor_venda_diaria))
+                st.metric("💵 Faturamento Total", format_currency(total_faturamento))
+                st.metric("⬇️ Menor Venda Diária (>0)", format_currency(menor_venda_diaria))
 
             with col_metrics3:
-                st.metric("📈 Média por Registro", format_brl(media_por_registro))
+                st.metric("📈 Média por Registro", format_currency(media_por_registro))
             
            # st.divider()
 
             # --- INTEGRAÇÃO DO HEATMAP --- 
             st.subheader("📅 Heatmap de Atividade Anual")
-            heatmap_chart = create_activity_heatmap(df_filtered) # Passa dados filtrados
-            if heatmap_chart:
-                st.altair_chart(heatmap_chart, use_container_width=True)
+            heatmap_spec = get_chart_spec('heatmap', versao_dados, None, create_activity_heatmap,
+                                          get_sales_heatmaps(df_processed, versao_dados)) # Ano completo, sem filtro
+            if heatmap_spec:
+                st.vega_lite_chart(heatmap_spec, use_container_width=True)
             else:
                 st.info("Não foi possível gerar o heatmap de atividade para o período/ano selecionado.")
             # --- FIM DA INTEGRAÇÃO DO HEATMAP ---
@@ -1333,9 +1149,38 @@ def main():
             # Coluna 1: Gráfico Acumulado e Heatmap
             
             st.subheader("Gráfico de Área Acumulado")
-            cumulative_chart = create_cumulative_area_chart(df_filtered)
-            if cumulative_chart:
-                st.altair_chart(cumulative_chart, use_container_width=True)
+
+            # Resolução dos gráficos temporais: acima do limite de pontos agrupa por semana/mês
+            # (barras) ou reduz por LTTB (curva acumulada); a janela permite voltar ao diário
+            serie_periodo = serie_diaria(cubos_filtrados['dia'])
+            col_resolucao, col_janela = st.columns([1, 2])
+            with col_resolucao:
+                opcao_resolucao = st.radio(
+                    "🔍 Resolução", list(OPCOES_RESOLUCAO), horizontal=True, key="resolucao_graficos",
+                    help=f"Automática: diária até {LIMITE_PONTOS} pontos; acima disso semanal ou mensal."
+                )
+            janela = (serie_periodo['Data'].min().date(), serie_periodo['Data'].max().date())
+            with col_janela:
+                if janela[0] < janela[1]:
+                    janela = st.slider("📆 Janela dos gráficos", min_value=janela[0], max_value=janela[1],
+                                       value=janela, format="DD/MM/YYYY")
+            serie_janela = serie_diaria(cubos_filtrados['dia'], *janela)
+            resolucao = OPCOES_RESOLUCAO[opcao_resolucao] or escolher_resolucao(serie_janela)
+            serie_grafico = agrupar_serie(serie_janela, resolucao)
+            chave_serie = filtros_grafico + (opcao_resolucao,) + janela
+            st.caption(f"Resolução {ROTULOS_RESOLUCAO[resolucao]['nome']}: {len(serie_grafico)} pontos de "
+                       f"{janela[0].strftime('%d/%m/%Y')} a {janela[1].strftime('%d/%m/%Y')}.")
+
+            if OPCOES_RESOLUCAO[opcao_resolucao] is None:
+                # Automática: a curva usa os dias e é reduzida por LTTB, preservando picos e vales
+                cumulative_spec = get_chart_spec('acumulado', versao_dados, chave_serie,
+                                                 lambda serie: create_cumulative_area_chart(serie, 'dia', LIMITE_PONTOS),
+                                                 serie_janela)
+            else:
+                cumulative_spec = get_chart_spec('acumulado', versao_dados, chave_serie,
+                                                 lambda serie: create_cumulative_area_chart(serie, resolucao), serie_grafico)
+            if cumulative_spec:
+                st.vega_lite_chart(cumulative_spec, use_container_width=True)
             else:
                 st.info("Sem dados suficientes para o gráfico de evolução acumulada.")
             # --- FIM DA INTEGRAÇÃO DO GRAFICO DE MONHATANHA ---
@@ -1344,9 +1189,10 @@ def main():
 
             # Seção de métodos de pagamento com cards lado a lado
             st.subheader("💳 Métodos de Pagamento (Visão Geral)")
-            cartao_total = df_filtered['Cartão'].sum() if 'Cartão' in df_filtered else 0
-            dinheiro_total = df_filtered['Dinheiro'].sum() if 'Dinheiro' in df_filtered else 0
-            pix_total = df_filtered['Pix'].sum() if 'Pix' in df_filtered else 0
+            cubo_mes = cubos_filtrados['mes']
+            cartao_total = cubo_mes['Cartão'].sum()
+            dinheiro_total = cubo_mes['Dinheiro'].sum()
+            pix_total = cubo_mes['Pix'].sum()
             total_pagamentos_geral = cartao_total + dinheiro_total + pix_total
 
             if total_pagamentos_geral > 0:
@@ -1361,7 +1207,7 @@ def main():
                     st.markdown(f"""
                     <div style="text-align: center; padding: 1rem; background: linear-gradient(135deg, #4c78a8, #5a8bb8); border-radius: 10px; color: white; margin-bottom: 1rem;">
                         <h3 style="margin: 0; font-size: 1.5rem;">💳 Cartão</h3>
-                        <h2 style="margin: 0.5rem 0; font-size: 1.8rem;">{format_brl(cartao_total)}</h2>
+                        <h2 style="margin: 0.5rem 0; font-size: 1.8rem;">{format_currency(cartao_total)}</h2>
                         <p style="margin: 0; font-size: 1.2rem; opacity: 0.9;">{cartao_pct:.1f}% do total</p>
                     </div>
                     """, unsafe_allow_html=True)
@@ -1370,7 +1216,7 @@ def main():
                     st.markdown(f"""
                     <div style="text-align: center; padding: 1rem; background: linear-gradient(135deg, #54a24b, #64b25b); border-radius: 10px; color: white; margin-bottom: 1rem;">
                         <h3 style="margin: 0; font-size: 1.5rem;">💵 Dinheiro</h3>
-                        <h2 style="margin: 0.5rem 0; font-size: 1.8rem;">{format_brl(dinheiro_total)}</h2>
+                        <h2 style="margin: 0.5rem 0; font-size: 1.8rem;">{format_currency(dinheiro_total)}</h2>
                         <p style="margin: 0; font-size: 1.2rem; opacity: 0.9;">{dinheiro_pct:.1f}% do total</p>
                     </div>
                     """, unsafe_allow_html=True)
@@ -1379,7 +1225,7 @@ def main():
                     st.markdown(f"""
                     <div style="text-align: center; padding: 1rem; background: linear-gradient(135deg, #f58518, #ff9528); border-radius: 10px; color: white; margin-bottom: 1rem;">
                         <h3 style="margin: 0; font-size: 1.5rem;">📱 PIX</h3>
-                        <h2 style="margin: 0.5rem 0; font-size: 1.8rem;">{format_brl(pix_total)}</h2>
+                        <h2 style="margin: 0.5rem 0; font-size: 1.8rem;">{format_currency(pix_total)}</h2>
                         <p style="margin: 0; font-size: 1.2rem; opacity: 0.9;">{pix_pct:.1f}% do total</p>
                     </div>
                     """, unsafe_allow_html=True)
@@ -1394,168 +1240,166 @@ def main():
             
             with col_chart1:
                 # Gráfico de vendas diárias (2/3 do espaço)
-                daily_chart = create_advanced_daily_sales_chart(df_filtered)
-                if daily_chart:
-                    st.altair_chart(daily_chart, use_container_width=True)
+                daily_spec = get_chart_spec('diario', versao_dados, chave_serie,
+                                            lambda serie: create_advanced_daily_sales_chart(serie, resolucao), serie_grafico)
+                if daily_spec:
+                    st.vega_lite_chart(daily_spec, use_container_width=True)
                 else:
                     st.info("Gráfico de vendas diárias indisponível.")
             
             with col_chart2:
                 # Gráfico radial (1/3 do espaço)
-                radial_chart = create_radial_plot(df_filtered)
-                if radial_chart:
-                    st.altair_chart(radial_chart, use_container_width=True)
+                radial_spec = get_chart_spec('radial', versao_dados, filtros_grafico, create_radial_plot, cubos_filtrados['mes'])
+                if radial_spec:
+                    st.vega_lite_chart(radial_spec, use_container_width=True)
                 else:
                     st.info("Gráfico radial de pagamentos indisponível.")
             
             #st.markdown("---")
 
             # Análise melhorada de dias da semana com percentuais
-            weekday_chart, best_day = create_enhanced_weekday_analysis(df_filtered)
-            if weekday_chart:
-                st.altair_chart(weekday_chart, use_container_width=False)
+            weekday_spec = get_chart_spec('dia_semana', versao_dados, filtros_grafico,
+                                          lambda cubo: create_enhanced_weekday_analysis(cubo)[0], cubos_filtrados['dia_semana'])
+            if weekday_spec:
+                st.vega_lite_chart(weekday_spec, use_container_width=False)
                 
                 # Análise detalhada dos dias da semana
-                if not df_filtered.empty and 'DiaSemana' in df_filtered.columns:
-                    df_weekday_analysis = df_filtered.copy()
-                    df_weekday_analysis['Total'] = pd.to_numeric(df_weekday_analysis['Total'], errors='coerce')
-                    df_weekday_analysis = df_weekday_analysis.dropna(subset=['Total', 'DiaSemana'])
+                cubo_dia_semana = cubos_filtrados['dia_semana']
+                if not cubo_dia_semana.empty:
+                    # Calcular médias por dia da semana (excluindo domingo)
+                    dias_trabalho = ["Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira", "Sexta-feira", "Sábado"]
+                    cubo_trabalho = cubo_dia_semana[cubo_dia_semana['DiaSemana'].isin(dias_trabalho)]
                     
-                    if not df_weekday_analysis.empty:
-                        # Calcular médias por dia da semana (excluindo domingo)
-                        dias_trabalho = ["Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira", "Sexta-feira", "Sábado"]
-                        df_trabalho = df_weekday_analysis[df_weekday_analysis['DiaSemana'].isin(dias_trabalho)]
+                    if not cubo_trabalho.empty:
+                        medias_por_dia = reagrupar(cubo_trabalho, ['DiaSemana'])[['Total_media', 'Registros']].round(2)
+                        medias_por_dia.columns = ['mean', 'count']
+                        medias_por_dia = medias_por_dia.sort_values('mean', ascending=False)
                         
-                        if not df_trabalho.empty:
-                            medias_por_dia = df_trabalho.groupby('DiaSemana', observed=True)['Total'].agg(['mean', 'count']).round(2)
-                            medias_por_dia = medias_por_dia.reindex([d for d in dias_trabalho if d in medias_por_dia.index])
-                            medias_por_dia = medias_por_dia.sort_values('mean', ascending=False)
+                        st.subheader("📊 Ranking dos Dias da Semana (Seg-Sáb)")
+                        
+                        # Criar colunas para o ranking
+                        col_ranking1, col_ranking2 = st.columns(2)
+                        
+                        with col_ranking1:
+                            st.markdown("### 🏆 **Melhores Dias**")
+                            if len(medias_por_dia) >= 1:
+                                primeiro = medias_por_dia.index[0]
+                                st.success(f"🥇 **1º lugar:** {primeiro}")
+                                st.write(f"   Média: {format_currency(medias_por_dia.loc[primeiro, 'mean'])} ({int(medias_por_dia.loc[primeiro, 'count'])} dias)")
                             
-                            st.subheader("📊 Ranking dos Dias da Semana (Seg-Sáb)")
+                            if len(medias_por_dia) >= 2:
+                                segundo = medias_por_dia.index[1]
+                                st.info(f"🥈 **2º lugar:** {segundo}")
+                                st.write(f"   Média: {format_currency(medias_por_dia.loc[segundo, 'mean'])} ({int(medias_por_dia.loc[segundo, 'count'])} dias)")
+                        
+                        with col_ranking2:
+                            st.markdown("### 📉 **Piores Dias**")
+                            if len(medias_por_dia) >= 2:
+                                penultimo_idx = -2 if len(medias_por_dia) > 1 else -1 # Handle case with only 1 day
+                                penultimo = medias_por_dia.index[penultimo_idx]
+                                st.warning(f"📊 **Penúltimo:** {penultimo}")
+                                st.write(f"   Média: {format_currency(medias_por_dia.loc[penultimo, 'mean'])} ({int(medias_por_dia.loc[penultimo, 'count'])} dias)")
                             
-                            # Criar colunas para o ranking
-                            col_ranking1, col_ranking2 = st.columns(2)
+                            if len(medias_por_dia) >= 1:
+                                ultimo = medias_por_dia.index[-1]
+                                st.error(f"🔻 **Último lugar:** {ultimo}")
+                                st.write(f"   Média: {format_currency(medias_por_dia.loc[ultimo, 'mean'])} ({int(medias_por_dia.loc[ultimo, 'count'])} dias)")
+                        
+                        #st.divider()
+                        
+                        # Análise de frequência de trabalho
+                        st.subheader("📅 Análise de Frequência de Trabalho")
+                        
+                        # Calcular dias do período filtrado
+                        if not df_filtered.empty and 'Data' in df_filtered.columns:
+                            data_inicio = df_filtered['Data'].min()
+                            data_fim = df_filtered['Data'].max()
                             
-                            with col_ranking1:
-                                st.markdown("### 🏆 **Melhores Dias**")
-                                if len(medias_por_dia) >= 1:
-                                    primeiro = medias_por_dia.index[0]
-                                    st.success(f"🥇 **1º lugar:** {primeiro}")
-                                    st.write(f"   Média: {format_brl(medias_por_dia.loc[primeiro, 'mean'])} ({int(medias_por_dia.loc[primeiro, 'count'])} dias)")
+                            if pd.notna(data_inicio) and pd.notna(data_fim):
+                                # Calcular total de dias no período
+                                total_dias_periodo = (data_fim - data_inicio).days + 1
                                 
-                                if len(medias_por_dia) >= 2:
-                                    segundo = medias_por_dia.index[1]
-                                    st.info(f"🥈 **2º lugar:** {segundo}")
-                                    st.write(f"   Média: {format_brl(medias_por_dia.loc[segundo, 'mean'])} ({int(medias_por_dia.loc[segundo, 'count'])} dias)")
-                            
-                            with col_ranking2:
-                                st.markdown("### 📉 **Piores Dias**")
-                                if len(medias_por_dia) >= 2:
-                                    penultimo_idx = -2 if len(medias_por_dia) > 1 else -1 # Handle case with only 1 day
-                                    penultimo = medias_por_dia.index[penultimo_idx]
-                                    st.warning(f"📊 **Penúltimo:** {penultimo}")
-                                    st.write(f"   Média: {format_brl(medias_por_dia.loc[penultimo, 'mean'])} ({int(medias_por_dia.loc[penultimo, 'count'])} dias)")
+                                # Calcular domingos no período
+                                domingos_periodo = 0
+                                data_atual = data_inicio
+                                while data_atual <= data_fim:
+                                    if data_atual.weekday() == 6:  # Domingo = 6
+                                        domingos_periodo += 1
+                                    data_atual += timedelta(days=1)
                                 
-                                if len(medias_por_dia) >= 1:
-                                    ultimo = medias_por_dia.index[-1]
-                                    st.error(f"🔻 **Último lugar:** {ultimo}")
-                                    st.write(f"   Média: {format_brl(medias_por_dia.loc[ultimo, 'mean'])} ({int(medias_por_dia.loc[ultimo, 'count'])} dias)")
-                            
-                            #st.divider()
-                            
-                            # Análise de frequência de trabalho
-                            st.subheader("📅 Análise de Frequência de Trabalho")
-                            
-                            # Calcular dias do período filtrado
-                            if not df_filtered.empty and 'Data' in df_filtered.columns:
-                                data_inicio = df_filtered['Data'].min()
-                                data_fim = df_filtered['Data'].max()
+                                # Dias úteis esperados (excluindo domingos)
+                                dias_uteis_esperados = total_dias_periodo - domingos_periodo
                                 
-                                if pd.notna(data_inicio) and pd.notna(data_fim):
-                                    # Calcular total de dias no período
-                                    total_dias_periodo = (data_fim - data_inicio).days + 1
-                                    
-                                    # Calcular domingos no período
-                                    domingos_periodo = 0
-                                    data_atual = data_inicio
-                                    while data_atual <= data_fim:
-                                        if data_atual.weekday() == 6:  # Domingo = 6
-                                            domingos_periodo += 1
-                                        data_atual += timedelta(days=1)
-                                    
-                                    # Dias úteis esperados (excluindo domingos)
-                                    dias_uteis_esperados = total_dias_periodo - domingos_periodo
-                                    
-                                    # Dias efetivamente trabalhados (registros únicos por data)
-                                    dias_trabalhados = df_filtered['Data'].nunique()
-                                    
-                                    # Dias de falta
-                                    dias_falta = max(0, dias_uteis_esperados - dias_trabalhados) # Não pode ser negativo
-                                    
-                                    # Exibir métricas
-                                    col_freq1, col_freq2, col_freq3, col_freq4 = st.columns(4)
-                                    
-                                    with col_freq1:
-                                        st.metric(
-                                            "📅 Período Analisado",
-                                            f"{total_dias_periodo} dias",
-                                            help=f"De {data_inicio.strftime('%d/%m/%Y')} até {data_fim.strftime('%d/%m/%Y')}"
-                                        )
-                                    
-                                    with col_freq2:
+                                # Dias efetivamente trabalhados (registros únicos por data)
+                                dias_trabalhados = df_filtered['Data'].nunique()
+                                
+                                # Dias de falta
+                                dias_falta = max(0, dias_uteis_esperados - dias_trabalhados) # Não pode ser negativo
+                                
+                                # Exibir métricas
+                                col_freq1, col_freq2, col_freq3, col_freq4 = st.columns(4)
+                                
+                                with col_freq1:
+                                    st.metric(
+                                        "📅 Período Analisado",
+                                        f"{total_dias_periodo} dias",
+                                        help=f"De {data_inicio.strftime('%d/%m/%Y')} até {data_fim.strftime('%d/%m/%Y')}"
+                                    )
+                                
+                                with col_freq2:
+                                    st.metric(
+                                        "🏢 Dias Trabalhados",
+                                        f"{dias_trabalhados} dias",
+                                        help="Dias com registro de vendas"
+                                    )
+                                
+                                with col_freq3:
+                                    st.metric(
+                                        "🏖️ Domingos (Folga)",
+                                        f"{domingos_periodo} dias",
+                                        help="Domingos no período (não trabalhamos)"
+                                    )
+                                
+                                with col_freq4:
+                                    if dias_falta > 0:
                                         st.metric(
-                                            "🏢 Dias Trabalhados",
-                                            f"{dias_trabalhados} dias",
-                                            help="Dias com registro de vendas"
+                                            "❌ Dias de Falta",
+                                            f"{dias_falta} dias",
+                                            help="Dias úteis sem registro de vendas",
+                                            delta=f"-{dias_falta}",
+                                            delta_color="inverse"
                                         )
-                                    
-                                    with col_freq3:
+                                    else:
                                         st.metric(
-                                            "🏖️ Domingos (Folga)",
-                                            f"{domingos_periodo} dias",
-                                            help="Domingos no período (não trabalhamos)"
+                                            "✅ Frequência",
+                                            "100%",
+                                            help="Todos os dias úteis trabalhados!"
                                         )
+                                
+                                # Calcular taxa de frequência
+                                if dias_uteis_esperados > 0:
+                                    taxa_frequencia = (dias_trabalhados / dias_uteis_esperados) * 100
                                     
-                                    with col_freq4:
-                                        if dias_falta > 0:
-                                            st.metric(
-                                                "❌ Dias de Falta",
-                                                f"{dias_falta} dias",
-                                                help="Dias úteis sem registro de vendas",
-                                                delta=f"-{dias_falta}",
-                                                delta_color="inverse"
-                                            )
-                                        else:
-                                            st.metric(
-                                                "✅ Frequência",
-                                                "100%",
-                                                help="Todos os dias úteis trabalhados!"
-                                            )
-                                    
-                                    # Calcular taxa de frequência
-                                    if dias_uteis_esperados > 0:
-                                        taxa_frequencia = (dias_trabalhados / dias_uteis_esperados) * 100
-                                        
-                                        if taxa_frequencia >= 95:
-                                            st.success(f"🎯 **Excelente frequência:** {taxa_frequencia:.1f}% dos dias úteis trabalhados!")
-                                        elif taxa_frequencia >= 80:
-                                            st.info(f"👍 **Boa frequência:** {taxa_frequencia:.1f}% dos dias úteis trabalhados")
-                                        else:
-                                            st.warning(f"⚠️ **Atenção à frequência:** {taxa_frequencia:.1f}% dos dias úteis trabalhados")
-                                else:
-                                    st.info("Não foi possível calcular a frequência (sem dias úteis no período?).")
+                                    if taxa_frequencia >= 95:
+                                        st.success(f"🎯 **Excelente frequência:** {taxa_frequencia:.1f}% dos dias úteis trabalhados!")
+                                    elif taxa_frequencia >= 80:
+                                        st.info(f"👍 **Boa frequência:** {taxa_frequencia:.1f}% dos dias úteis trabalhados")
+                                    else:
+                                        st.warning(f"⚠️ **Atenção à frequência:** {taxa_frequencia:.1f}% dos dias úteis trabalhados")
+                            else:
+                                st.info("Não foi possível calcular a frequência (sem dias úteis no período?).")
             else:
                 st.info("📊 Dados insuficientes para calcular a análise por dia da semana.")
             
             #st.divider()
 
-            sales_histogram_chart = create_sales_histogram(df_filtered)
-            if sales_histogram_chart: 
-                st.altair_chart(sales_histogram_chart, use_container_width=False)
+            sales_histogram_spec = get_chart_spec('histograma', versao_dados, filtros_grafico, create_sales_histogram, df_filtered)
+            if sales_histogram_spec: 
+                st.vega_lite_chart(sales_histogram_spec, use_container_width=False)
             else: 
                 st.info("Dados insuficientes para o Histograma de Vendas.")
         else:
-            if df_processed.empty and df_raw.empty and get_worksheet() is None: 
+            if df_processed.empty and get_worksheet() is None: 
                 st.warning("Não foi possível carregar os dados da planilha.")
             elif df_processed.empty: 
                 st.info("Não há dados processados para exibir estatísticas.")
@@ -1621,14 +1465,17 @@ def main():
             # === DRE TEXTUAL (Anual) ===
             with st.container(border=True):
                  # Passa df_processed para ter acesso a todos os dados do ano
-                create_dre_textual(resultados_filtrados, df_processed, selected_anos_filter)
+                create_dre_textual(resultados_filtrados, df_processed, selected_anos_filter, versao_dados)
 
             #st.markdown("---")
 
             # === DASHBOARD VISUAL (Período Filtrado) ===
-            financial_dashboard = create_financial_dashboard_altair(resultados_filtrados)
-            if financial_dashboard:
-                st.altair_chart(financial_dashboard, use_container_width=True)
+            # Depende dos parâmetros da simulação, que entram na chave
+            parametros_simulacao = (salario_minimo_input, custo_contadora_input, custo_fornecedores_percentual)
+            financial_spec = get_chart_spec('financeiro', versao_dados, filtros_grafico + parametros_simulacao,
+                                            create_financial_dashboard_altair, resultados_filtrados)
+            if financial_spec:
+                st.vega_lite_chart(financial_spec, use_container_width=True)
 
             #st.markdown("---")
 
@@ -1684,22 +1531,22 @@ def main():
                 
                 with col_exec1:
                     st.markdown("**💰 Receitas:**")
-                    st.write(f"• Receita Bruta: {format_brl(resultados_filtrados['receita_bruta'])}")
-                    st.write(f"• Receita Líquida: {format_brl(resultados_filtrados['receita_liquida'])}")
-                    st.write(f"• Receita Tributável: {format_brl(resultados_filtrados['receita_tributavel'])}")
-                    st.write(f"• Receita Não Tributável: {format_brl(resultados_filtrados['receita_nao_tributavel'])}")
+                    st.write(f"• Receita Bruta: {format_currency(resultados_filtrados['receita_bruta'])}")
+                    st.write(f"• Receita Líquida: {format_currency(resultados_filtrados['receita_liquida'])}")
+                    st.write(f"• Receita Tributável: {format_currency(resultados_filtrados['receita_tributavel'])}")
+                    st.write(f"• Receita Não Tributável: {format_currency(resultados_filtrados['receita_nao_tributavel'])}")
                     
                     st.markdown("**📊 Resultados:**")
-                    st.write(f"• Lucro Bruto: {format_brl(resultados_filtrados['lucro_bruto'])}")
-                    st.write(f"• Lucro Operacional: {format_brl(resultados_filtrados['lucro_operacional'])}")
-                    st.write(f"• Lucro Líquido: {format_brl(resultados_filtrados['lucro_liquido'])}")
+                    st.write(f"• Lucro Bruto: {format_currency(resultados_filtrados['lucro_bruto'])}")
+                    st.write(f"• Lucro Operacional: {format_currency(resultados_filtrados['lucro_operacional'])}")
+                    st.write(f"• Lucro Líquido: {format_currency(resultados_filtrados['lucro_liquido'])}")
                 
                 with col_exec2:
                     st.markdown("**💸 Custos e Despesas:**")
-                    st.write(f"• Impostos s/ Vendas: {format_brl(resultados_filtrados['impostos_sobre_vendas'])}")
-                    st.write(f"• Custo dos Produtos: {format_brl(resultados_filtrados['custo_produtos_vendidos'])}")
-                    st.write(f"• Despesas com Pessoal: {format_brl(resultados_filtrados['despesas_com_pessoal'])} (Ref. período)")
-                    st.write(f"• Serviços Contábeis: {format_brl(resultados_filtrados['despesas_contabeis'])} (Ref. período)")
+                    st.write(f"• Impostos s/ Vendas: {format_currency(resultados_filtrados['impostos_sobre_vendas'])}")
+                    st.write(f"• Custo dos Produtos: {format_currency(resultados_filtrados['custo_produtos_vendidos'])}")
+                    st.write(f"• Despesas com Pessoal: {format_currency(resultados_filtrados['despesas_com_pessoal'])} (Ref. período)")
+                    st.write(f"• Serviços Contábeis: {format_currency(resultados_filtrados['despesas_contabeis'])} (Ref. período)")
                     
                     st.markdown("**🎯 Indicadores-Chave:**")
                     if resultados_filtrados['margem_bruta'] >= 50:
@@ -1710,9 +1557,9 @@ def main():
                         st.error(f"❌ Margem Bruta Baixa: {resultados_filtrados['margem_bruta']:.1f}% (Período)")
                     
                     if resultados_filtrados['lucro_liquido'] > 0:
-                        st.success(f"✅ Resultado Positivo: {format_brl(resultados_filtrados['lucro_liquido'])} (Período)")
+                        st.success(f"✅ Resultado Positivo: {format_currency(resultados_filtrados['lucro_liquido'])} (Período)")
                     else:
-                        st.error(f"❌ Resultado Negativo: {format_brl(resultados_filtrados['lucro_liquido'])} (Período)")
+                        st.error(f"❌ Resultado Negativo: {format_currency(resultados_filtrados['lucro_liquido'])} (Período)")
 
             # Nota final
             st.info("""
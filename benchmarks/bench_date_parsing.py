@@ -0,0 +1,73 @@
+"""
+Benchmark da conversão da coluna 'Data' (10k–100k linhas).
+
+Compara o parsing antigo de process_data (inferência com dayfirst=True e
+segunda tentativa quando tudo vira NaT) com date_parsing.parse_dates
+(formato detectado uma vez e strptime vetorizado do Arrow).
+
+Uso: python benchmarks/bench_date_parsing.py [--repeticoes 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from clips_core import date_parsing  # noqa: E402
+from clips_core.date_parsing import parse_dates  # noqa: E402
+
+TAMANHOS = [10_000, 50_000, 100_000]
+
+def gerar_datas(n, seed=42):
+    """Datas dd/mm/aaaa como vêm da planilha, com algumas células vazias."""
+    rng = np.random.default_rng(seed)
+    inicio = pd.Timestamp('1900-01-01')
+    datas = inicio + pd.to_timedelta(np.sort(rng.integers(0, 60_000, n)), unit='D')
+    serie = pd.Series(datas.strftime('%d/%m/%Y'), dtype=object)
+    serie[rng.random(n) < 0.01] = ''
+    return serie
+
+def parse_antigo(serie):
+    """Caminho anterior de basico.process_data."""
+    datas = pd.to_datetime(serie, dayfirst=True, errors='coerce')
+    if datas.isnull().all():
+        datas = pd.to_datetime(serie, errors='coerce')
+    return datas
+
+def parse_novo_frio(serie):
+    """parse_dates sem formato em cache (primeira leitura do processo)."""
+    date_parsing._formatos_detectados.clear()
+    return parse_dates(serie)
+
+def medir(funcao, serie, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(serie)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"pandas {pd.__version__}")
+    print(f"{'linhas':>8} {'antigo (s)':>11} {'novo frio (s)':>14} {'novo cache (s)':>15} {'ganho':>7}")
+    for n in TAMANHOS:
+        serie = gerar_datas(n)
+        esperado = parse_antigo(serie)
+        obtido = parse_novo_frio(serie)
+        assert esperado.equals(obtido.astype(esperado.dtype)), "resultados divergentes"
+
+        antigo = medir(parse_antigo, serie, args.repeticoes)
+        frio = medir(parse_novo_frio, serie, args.repeticoes)
+        parse_dates(serie)  # aquece o cache de formato
+        quente = medir(parse_dates, serie, args.repeticoes)
+        print(f"{n:>8} {antigo:>11.4f} {frio:>14.4f} {quente:>15.4f} {antigo / quente:>6.1f}x")
+
+if __name__ == '__main__':
+    main()
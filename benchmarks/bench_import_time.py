@@ -0,0 +1,140 @@
+"""
+Benchmark do tempo de inicialização (imports) dos apps e do clips_core.
+
+Para um script (alvo terminado em .py) mede só os imports de nível de módulo,
+que são o que um processo novo paga antes de desenhar a primeira tela; imports
+dentro de funções e botões (ex.: o relatório PDF do app.py) ficam de fora.
+Para um módulo (ex.: clips_core.vendas) mede o próprio `import`.
+
+Cada alvo roda num processo novo com `python -X importtime`, algumas vezes, e
+fica o menor tempo. Registra o total, os pacotes mais pesados e se o
+reportlab/matplotlib entraram no caminho de inicialização.
+
+    python benchmarks/bench_import_time.py --saida antes.json
+    (muda o código)
+    python benchmarks/bench_import_time.py --saida depois.json --comparar antes.json --tolerancia 20
+
+Com --tolerancia, sai com código 1 se algum alvo ficou mais lento que isso (%).
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALVOS_PADRAO = ["app.py", "basico.py", "dashboard.py", "clips_core.combo_solver", "clips_core.vendas"]
+PESADOS = ["reportlab", "matplotlib"]
+
+# "import time:  self [us] | cumulative | imported package"
+LINHA_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+def imports_do_script(caminho):
+    """Código só com os imports de nível de módulo do script."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        arvore = ast.parse(arquivo.read(), filename=caminho)
+    return "\n".join(ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom)))
+
+def codigo_do_alvo(alvo):
+    if alvo.endswith(".py"):
+        return imports_do_script(os.path.join(RAIZ, alvo))
+    return f"import {alvo}"
+
+def medir_uma_vez(codigo):
+    """{pacote de primeiro nível: tempo acumulado em µs} e os módulos carregados."""
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ,
+                              capture_output=True, text=True)
+    if processo.returncode != 0:
+        raise RuntimeError(processo.stderr.strip().splitlines()[-1])
+    primeiro_nivel, modulos = {}, set()
+    for linha in processo.stderr.splitlines():
+        casamento = LINHA_IMPORTTIME.match(linha)
+        if not casamento:
+            continue
+        _, acumulado, recuo, modulo = casamento.groups()
+        modulos.add(modulo)
+        if len(recuo) == 1:  # importado direto pelo alvo, não por outro módulo
+            raiz = modulo.split(".")[0]
+            primeiro_nivel[raiz] = primeiro_nivel.get(raiz, 0) + int(acumulado)
+    return primeiro_nivel, modulos
+
+def medir(alvo, repeticoes, top):
+    codigo = codigo_do_alvo(alvo)
+    melhor, modulos = None, set()
+    for _ in range(repeticoes):
+        primeiro_nivel, modulos = medir_uma_vez(codigo)
+        if melhor is None or sum(primeiro_nivel.values()) < sum(melhor.values()):
+            melhor = primeiro_nivel
+    ranking = sorted(melhor.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "total_ms": round(sum(melhor.values()) / 1000, 1),
+        "modulos": len(modulos),
+        "mais_pesados_ms": {pacote: round(us / 1000, 1) for pacote, us in ranking},
+        "carrega": {pacote: any(m == pacote or m.startswith(pacote + ".") for m in modulos) for pacote in PESADOS},
+    }
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def comparar(atual, anterior, tolerancia=None):
+    """Imprime a variação do total de cada alvo; retorna os alvos acima da tolerância (%)."""
+    print(f"\nComparação com {anterior['meta'].get('commit')} -> {atual['meta'].get('commit')}")
+    print(f"{'alvo':<28}{'antes (ms)':>12}{'depois (ms)':>13}{'variação':>10}")
+    regressoes = []
+    for alvo, depois in atual["resultados"].items():
+        antes = anterior["resultados"].get(alvo)
+        if antes is None:
+            continue
+        variacao = (depois["total_ms"] / antes["total_ms"] - 1) * 100 if antes["total_ms"] else 0.0
+        print(f"{alvo:<28}{antes['total_ms']:>12}{depois['total_ms']:>13}{variacao:>+9.0f}%")
+        if tolerancia is not None and variacao > tolerancia:
+            regressoes.append(alvo)
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("alvos", nargs="*", default=ALVOS_PADRAO, help="scripts (.py) ou módulos")
+    parser.add_argument("--repeticoes", type=int, default=5, help="processos por alvo (fica o menor tempo)")
+    parser.add_argument("--top", type=int, default=8, help="pacotes mais pesados listados por alvo")
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, help="com --comparar, piora máxima aceita (%%)")
+    args = parser.parse_args()
+
+    resultado = {
+        "meta": {
+            "commit": commit_atual(),
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "repeticoes": args.repeticoes,
+        },
+        "resultados": {},
+    }
+    for alvo in args.alvos:
+        resultado["resultados"][alvo] = medir(alvo, args.repeticoes, args.top)
+        print(f"{alvo}: {resultado['resultados'][alvo]['total_ms']} ms", file=sys.stderr)
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            regressoes = comparar(resultado, json.load(arquivo), args.tolerancia)
+        if regressoes:
+            print(f"\nMais lentos que a tolerância de {args.tolerancia}%: {', '.join(regressoes)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
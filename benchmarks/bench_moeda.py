@@ -0,0 +1,125 @@
+"""
+Benchmark da conversão de valores em reais (coluna 'Valor' do upload e
+Cartão/Dinheiro/Pix da planilha), 10k–1M linhas.
+
+Compara o caminho antigo (dois .str.replace seguidos de pd.to_numeric) com
+moeda.decodificar_centavos (regex do Arrow direto para centavos inteiros).
+Antes de medir, confere o decodificador contra uma referência em Python puro
+em valores aleatórios nos formatos aceitos (milhar com ponto, "R$", negativos
+com sinal ou entre parênteses, células vazias e inválidas).
+
+No sentido inverso, compara formatar um valor por vez (financeiro.format_currency
+via Series.map) com moeda.formatar_reais sobre a coluna inteira.
+
+Uso: python benchmarks/bench_moeda.py [--repeticoes 5]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from clips_core.financeiro import format_currency  # noqa: E402
+from clips_core.moeda import decodificar_centavos, formatar_reais  # noqa: E402
+
+TAMANHOS = [10_000, 100_000, 1_000_000]
+
+def formatar_brl(centavos):
+    inteiro, fracao = divmod(abs(centavos), 100)
+    return f"{inteiro:,}".replace(',', '.') + f",{fracao:02d}"
+
+def gerar_valores(n, seed=42, variados=False):
+    """
+    Valores como vêm do arquivo da maquininha ("1.234,56"). Com variados=True
+    mistura "R$", negativos, parênteses, vazios e textos inválidos.
+    """
+    rng = np.random.default_rng(seed)
+    centavos = rng.integers(1, 10_000_000, n) * np.where(rng.random(n) < 0.05, -1, 1)
+    textos = [formatar_brl(c) for c in centavos]
+    if not variados:
+        textos = [f"-{t}" if c < 0 else t for t, c in zip(textos, centavos)]
+        return pd.Series(textos, dtype='str'), centavos
+
+    esperado = centavos.astype(object)
+    for i, (texto, c) in enumerate(zip(textos, centavos)):
+        sorteio = rng.random()
+        if c < 0:
+            textos[i] = [f"({texto})", f"-{texto}", f"R$ ({texto})", f"R$ -{texto}"][int(sorteio * 4)]
+        elif sorteio < 0.3:
+            textos[i] = f"R$ {texto}"
+        elif sorteio < 0.32:
+            textos[i], esperado[i] = '', None
+        elif sorteio < 0.34:
+            textos[i], esperado[i] = 'estorno', None
+        elif sorteio < 0.36:
+            # Separadores fora do lugar: "12.5.6", "1.23,45", "1,234"
+            textos[i], esperado[i] = [f"{c % 100}.{c % 10}.{c % 7}", f"{c % 10}.{c % 100:02d},45",
+                                      f"{c % 10},{c % 1000:03d}"][int((sorteio - 0.34) * 150)], None
+    return pd.Series(textos, dtype='str'), esperado
+
+def referencia(texto):
+    """Decodificação de um valor pt-BR em Python puro, para conferência."""
+    casamento = re.fullmatch(r'(?:R\$ )?(\()?(-)?([0-9.]+(?:,[0-9]{1,2})?)(?(1)\))', texto)
+    if not casamento or not re.fullmatch(r'([0-9]{1,3}(\.[0-9]{3})+|[0-9]+)(,[0-9]*)?', casamento[3]):
+        return None
+    negativo = bool(casamento[1] or casamento[2])
+    inteiro, _, fracao = casamento[3].replace('.', '').partition(',')
+    centavos = int(inteiro) * 100 + int(fracao.ljust(2, '0') or 0)
+    return -centavos if negativo else centavos
+
+def decodificar_antigo(valores):
+    """Caminho anterior do upload (reais em float; sem suporte a "R$" e parênteses)."""
+    return pd.to_numeric(valores.str.replace('.', '').str.replace(',', '.'), errors='coerce')
+
+def conferir(n=20_000):
+    textos, esperado = gerar_valores(n, seed=7, variados=True)
+    obtido = decodificar_centavos(textos)
+    for texto, e, o in zip(textos, esperado, obtido):
+        o = None if pd.isna(o) else int(o)
+        assert o == e == referencia(texto), f"{texto!r}: esperado {e}, obtido {o}"
+
+def formatar_antigo(valores):
+    """Um format_currency por célula, como nas tabelas e no PDF antes."""
+    return valores.map(format_currency)
+
+def medir(funcao, serie, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(serie)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    conferir()
+    print(f"pandas {pd.__version__}; decodificador conferido contra a referência")
+    print(f"{'linhas':>9} {'antigo (s)':>11} {'novo (s)':>10} {'ganho':>7}")
+    for n in TAMANHOS:
+        serie, centavos = gerar_valores(n)
+        assert (decodificar_centavos(serie).to_numpy() == centavos).all(), "resultados divergentes"
+        assert np.allclose(decodificar_antigo(serie).to_numpy(), centavos / 100)
+
+        antigo = medir(decodificar_antigo, serie, args.repeticoes)
+        novo = medir(decodificar_centavos, serie, args.repeticoes)
+        print(f"{n:>9} {antigo:>11.4f} {novo:>10.4f} {antigo / novo:>6.1f}x")
+
+    print("\nformatação (reais -> \"R$ 1.234,56\")")
+    print(f"{'linhas':>9} {'antigo (s)':>11} {'novo (s)':>10} {'ganho':>7}")
+    for n in TAMANHOS:
+        reais = pd.Series(gerar_valores(n)[1] / 100)
+        assert (formatar_reais(reais) == formatar_antigo(reais)).all(), "formatações divergentes"
+
+        antigo = medir(formatar_antigo, reais, args.repeticoes)
+        novo = medir(formatar_reais, reais, args.repeticoes)
+        print(f"{n:>9} {antigo:>11.4f} {novo:>10.4f} {antigo / novo:>6.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmark dos solvers de combinação, com sementes fixas e métricas de qualidade.
+
+Roda cada solver sobre um corpus fixo de valores-alvo (gerado a partir de uma
+semente) e registra, por solver:
+- tempo total e por alvo;
+- avaliações de fitness por segundo;
+- taxa de acerto exato (total da combinação == alvo);
+- resíduo médio |alvo - total| e quantas respostas passaram do alvo.
+
+Solvers:
+- menu_ga_sanduiches / menu_ga_bebidas: menu_solver.genetic_algorithm sem tabela
+  (a evolução em si, não a consulta à tabela de alcançáveis);
+- menu_local_sanduiches / menu_local_bebidas: menu_solver.busca_local;
+- combo_ga: combo_solver.genetic_algorithm_combo (uma execução, sem reinícios);
+- combo_exato: combo_solver.resolver_combo_exato (referência de qualidade).
+
+Roda offline, sem Streamlit. A saída é JSON, para comparar dois commits:
+
+    python benchmarks/bench_solvers.py --saida antes.json
+    (muda o código)
+    python benchmarks/bench_solvers.py --saida depois.json --comparar antes.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from clips_core import combo_solver  # noqa: E402
+from clips_core import menu_solver  # noqa: E402
+
+SEMENTE_CORPUS = 2024
+TOLERANCIA = 0.005  # reais; abaixo disso o acerto é exato
+
+def gerar_corpus(n, minimo, maximo, semente=SEMENTE_CORPUS):
+    """Valores-alvo múltiplos de R$ 0,50, sempre os mesmos para a mesma semente."""
+    rng = np.random.default_rng(semente)
+    return [float(v) for v in np.round(rng.uniform(minimo, maximo, n) * 2) / 2]
+
+class ContadorAvaliacoes:
+    """Envolve uma função de fitness contando quantos indivíduos ela avaliou."""
+
+    def __init__(self, modulo, nome, em_lote=False):
+        self.modulo, self.nome, self.em_lote = modulo, nome, em_lote
+        self.original = getattr(modulo, nome)
+        self.total = 0
+
+    def __call__(self, individuo, *args, **kwargs):
+        self.total += len(individuo) if self.em_lote else 1
+        return self.original(individuo, *args, **kwargs)
+
+    def __enter__(self):
+        setattr(self.modulo, self.nome, self)
+        return self
+
+    def __exit__(self, *exc):
+        setattr(self.modulo, self.nome, self.original)
+
+def valor_combo(combinacao):
+    precos = {**combo_solver.CARDAPIOS["sanduiches"], **combo_solver.CARDAPIOS["bebidas"]}
+    return sum(precos[item] * qtd for item, qtd in combinacao.items())
+
+def solvers(args):
+    """{nome: (corpus, função(alvo, semente) -> total da combinação, contador ou None)}"""
+    sanduiches = menu_solver.CARDAPIOS["sanduiches"]
+    bebidas = menu_solver.CARDAPIOS["bebidas"]
+    corpus_sanduiches = gerar_corpus(args.alvos, 20, 2000)
+    corpus_bebidas = gerar_corpus(args.alvos, 5, 500)
+    corpus_combo = gerar_corpus(args.alvos, 25, 2000)
+
+    def menu(precos, funcao):
+        def rodar(alvo, semente):
+            random.seed(semente)
+            return menu_solver.calculate_combination_value(funcao(precos, alvo), precos)
+        return rodar
+
+    ga = lambda precos, alvo: menu_solver.genetic_algorithm(
+        precos, alvo, population_size=args.populacao, generations=args.geracoes, combination_size=args.tipos)
+    local = lambda precos, alvo: menu_solver.busca_local(precos, alvo, args.iteracoes, args.tipos)
+    contador_menu = lambda: ContadorAvaliacoes(menu_solver, "evaluate_fitness")
+
+    return {
+        "menu_ga_sanduiches": (corpus_sanduiches, menu(sanduiches, ga), contador_menu),
+        "menu_ga_bebidas": (corpus_bebidas, menu(bebidas, ga), contador_menu),
+        "menu_local_sanduiches": (corpus_sanduiches, menu(sanduiches, local), contador_menu),
+        "menu_local_bebidas": (corpus_bebidas, menu(bebidas, local), contador_menu),
+        "combo_ga": (
+            corpus_combo,
+            lambda alvo, semente: valor_combo(combo_solver.genetic_algorithm_combo(
+                alvo, population_size=args.populacao_combo, generations=args.geracoes_combo, seed=semente)),
+            lambda: ContadorAvaliacoes(combo_solver, "evaluate_fitness_combo_batch", em_lote=True)
+        ),
+        "combo_exato": (
+            corpus_combo,
+            lambda alvo, semente: valor_combo(combo_solver.resolver_combo_exato(alvo)[0]),
+            None
+        ),
+    }
+
+def medir(corpus, rodar, novo_contador, semente):
+    residuos, acima, tempos, avaliacoes = [], 0, [], 0
+    for i, alvo in enumerate(corpus):
+        contador = novo_contador() if novo_contador else None
+        inicio = time.perf_counter()
+        if contador:
+            with contador:
+                total = rodar(alvo, semente + i)
+            avaliacoes += contador.total
+        else:
+            total = rodar(alvo, semente + i)
+        tempos.append(time.perf_counter() - inicio)
+        residuos.append(abs(alvo - total))
+        acima += total > alvo + TOLERANCIA
+
+    tempo_total = sum(tempos)
+    residuos = np.array(residuos)
+    return {
+        "alvos": len(corpus),
+        "tempo_total_s": round(tempo_total, 4),
+        "tempo_medio_s": round(tempo_total / len(corpus), 5),
+        "avaliacoes": avaliacoes if novo_contador else None,
+        "avaliacoes_por_s": round(avaliacoes / tempo_total) if novo_contador and tempo_total > 0 else None,
+        "taxa_acerto_exato": round(float((residuos < TOLERANCIA).mean()), 4),
+        "residuo_medio": round(float(residuos.mean()), 4),
+        "residuo_maximo": round(float(residuos.max()), 4),
+        "acima_do_alvo": int(acima),
+    }
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def comparar(atual, anterior):
+    """Imprime a variação de cada métrica em relação a um JSON anterior."""
+    metricas = ["tempo_total_s", "avaliacoes_por_s", "taxa_acerto_exato", "residuo_medio"]
+    print(f"\nComparação com {anterior['meta'].get('commit')} -> {atual['meta'].get('commit')}")
+    print(f"{'solver':<24}" + "".join(f"{m:>26}" for m in metricas))
+    for nome, depois in atual["resultados"].items():
+        antes = anterior["resultados"].get(nome)
+        if antes is None:
+            continue
+        celulas = []
+        for m in metricas:
+            a, d = antes.get(m), depois.get(m)
+            celulas.append(f"{'-':>26}" if a is None or d is None else f"{a:>11} -> {d:<11}")
+        print(f"{nome:<24}" + "".join(celulas))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alvos", type=int, default=20, help="valores-alvo por solver")
+    parser.add_argument("--semente", type=int, default=42, help="semente dos solvers (alvo i usa semente + i)")
+    parser.add_argument("--populacao", type=int, default=50)
+    parser.add_argument("--geracoes", type=int, default=100)
+    parser.add_argument("--tipos", type=int, default=5, help="máximo de tipos de item por combinação")
+    parser.add_argument("--iteracoes", type=int, default=10000, help="iterações da busca local")
+    parser.add_argument("--populacao-combo", type=int, default=100)
+    parser.add_argument("--geracoes-combo", type=int, default=200)
+    parser.add_argument("--solvers", nargs="*", help="roda só estes solvers")
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    resultado = {
+        "meta": {
+            "commit": commit_atual(),
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "parametros": {k: v for k, v in vars(args).items() if k not in ("saida", "comparar", "solvers")},
+        },
+        "resultados": {},
+    }
+    for nome, (corpus, rodar, contador) in solvers(args).items():
+        if args.solvers and nome not in args.solvers:
+            continue
+        resultado["resultados"][nome] = medir(corpus, rodar, contador, args.semente)
+        print(f"{nome}: {resultado['resultados'][nome]}", file=sys.stderr)
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            comparar(resultado, json.load(arquivo))
+
+if __name__ == "__main__":
+    main()
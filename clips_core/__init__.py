@@ -0,0 +1,8 @@
+"""
+Núcleo do Clips Burger sem Streamlit: solvers de combinação, leitura e escrita
+da planilha, processamento das vendas e cálculos financeiros.
+
+Os apps Streamlit (basico.py, dashboard.py, app.py, ...) são só a interface
+sobre estes módulos. Jobs em lote, benchmarks e processos de trabalho
+importam daqui sem carregar o Streamlit.
+"""
@@ -0,0 +1,82 @@
+"""
+Cache persistente (SQLite) dos resultados do solver de combos.
+
+A chave é (alvo em centavos, impressão digital dos preços do cardápio, método,
+parâmetros do solver). Entradas de cardápios antigos são descartadas
+automaticamente e o tamanho é limitado por LRU (último acesso).
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing
+
+from .centavos import para_centavos
+
+LIMITE_ENTRADAS = 5000
+
+def fingerprint_cardapio(cardapios):
+    """Hash SHA-256 estável dos itens e preços do cardápio."""
+    conteudo = json.dumps(cardapios, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+def _conectar(caminho):
+    conn = sqlite3.connect(caminho, timeout=10)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS resultados (
+            alvo_centavos INTEGER NOT NULL,
+            fingerprint TEXT NOT NULL,
+            metodo TEXT NOT NULL,
+            parametros TEXT NOT NULL,
+            resultado TEXT NOT NULL,
+            ultimo_acesso REAL NOT NULL,
+            PRIMARY KEY (alvo_centavos, fingerprint, metodo, parametros)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ultimo_acesso ON resultados (ultimo_acesso)")
+    return conn
+
+def _chave(alvo, fingerprint, metodo, parametros):
+    return (para_centavos(alvo), fingerprint, metodo,
+            json.dumps(parametros or {}, sort_keys=True))
+
+def obter_resultado(caminho, alvo, fingerprint, metodo, parametros=None):
+    """Retorna o resultado salvo (dict) ou None, atualizando o último acesso."""
+    chave = _chave(alvo, fingerprint, metodo, parametros)
+    try:
+        with closing(_conectar(caminho)) as conn, conn:
+            linha = conn.execute(
+                "SELECT resultado FROM resultados WHERE alvo_centavos = ? AND fingerprint = ? "
+                "AND metodo = ? AND parametros = ?", chave
+            ).fetchone()
+            if linha is None:
+                return None
+            conn.execute(
+                "UPDATE resultados SET ultimo_acesso = ? WHERE alvo_centavos = ? AND fingerprint = ? "
+                "AND metodo = ? AND parametros = ?", (time.time(),) + chave
+            )
+        return json.loads(linha[0])
+    except sqlite3.Error:
+        return None
+
+def salvar_resultado(caminho, alvo, fingerprint, metodo, parametros, resultado, limite=LIMITE_ENTRADAS):
+    """
+    Grava o resultado, remove entradas de outros cardápios (preços alterados)
+    e despeja as menos usadas recentemente quando passa do limite.
+    """
+    chave = _chave(alvo, fingerprint, metodo, parametros)
+    try:
+        with closing(_conectar(caminho)) as conn, conn:
+            conn.execute("DELETE FROM resultados WHERE fingerprint <> ?", (fingerprint,))
+            conn.execute(
+                "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?)",
+                chave + (json.dumps(resultado, ensure_ascii=False), time.time())
+            )
+            conn.execute(
+                "DELETE FROM resultados WHERE rowid IN ("
+                "SELECT rowid FROM resultados ORDER BY ultimo_acesso DESC LIMIT -1 OFFSET ?)",
+                (limite,)
+            )
+    except sqlite3.Error:
+        # O cache é apenas uma otimização: falhas de disco não devem derrubar o app
+        pass
@@ -0,0 +1,31 @@
+"""
+Aritmética de dinheiro em centavos inteiros.
+
+Valores monetários circulam como int (ou arrays int64) de centavos: somas,
+impostos e comparações ficam exatas. Reais em float só na entrada
+(para_centavos) e na exibição (para_reais). Só depende do numpy, para que os
+solvers e seus processos importem sem carregar o pandas.
+"""
+import numpy as np
+
+def para_centavos(reais):
+    """Reais (número ou array) -> centavos inteiros, arredondando ao centavo."""
+    centavos = np.rint(np.asarray(reais, dtype='float64') * 100).astype('int64')
+    return int(centavos) if centavos.ndim == 0 else centavos
+
+def para_reais(centavos):
+    """Centavos inteiros (número ou array) -> reais em float, para exibir."""
+    return np.asarray(centavos) / 100 if np.ndim(centavos) else centavos / 100
+
+def aplicar_percentual(centavos, percentual):
+    """
+    Fração de um valor em centavos (ex.: 0.06 do Simples), arredondada ao
+    centavo com metade para cima. O percentual vira centésimos de ponto
+    percentual, então a conta é toda inteira.
+    """
+    pontos = round(percentual * 10_000)
+    return (centavos * pontos + 5_000) // 10_000
+
+def dividir(centavos, partes):
+    """Divisão inteira arredondada ao centavo (metade para cima)."""
+    return (centavos * 2 + partes) // (2 * partes)
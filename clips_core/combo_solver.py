@@ -0,0 +1,367 @@
+"""
+Solvers da regra do Combo 1 (JBC = Refri Lata, cebolas livres).
+
+Módulo sem dependência do Streamlit para poder ser importado pelos
+processos do modo paralelo.
+"""
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import repeat
+
+import numpy as np
+
+from .centavos import para_centavos
+
+CARDAPIOS = {
+    "sanduiches": {
+        "JBC (Junior Bacon Cheese)": 10.00,
+        "Double Cheese Burger": 15.00,
+        "Cebola Adicional": 0.50
+    },
+    "bebidas": {
+        "Refri Lata": 15.00
+    }
+}
+
+# Preços, alvos e fitness em centavos inteiros: o acerto exato é fitness == 0
+# sem tolerância de ponto flutuante. As penalidades equivalem a R$ 1.000.000,00
+# (passar do alvo) e R$ 1.000,00 por unidade de diferença entre JBC e Lata.
+PENALIDADE = 100_000_000
+PENALIDADE_DESBALANCEADO = 100_000
+
+# --- SOLVER EXATO (PROGRAMAÇÃO DINÂMICA) ---
+def montar_pecas_combo():
+    """
+    Retorna as peças indivisíveis do problema do combo, com preço em centavos:
+    - Combo 1 = 1 JBC + 1 Refri Lata
+    - Cebola Adicional avulsa
+    """
+    preco_combo = (para_centavos(CARDAPIOS["sanduiches"]["JBC (Junior Bacon Cheese)"]) +
+                   para_centavos(CARDAPIOS["bebidas"]["Refri Lata"]))
+    preco_cebola = para_centavos(CARDAPIOS["sanduiches"]["Cebola Adicional"])
+    return [
+        ({"JBC (Junior Bacon Cheese)": 1, "Refri Lata": 1}, preco_combo),
+        ({"Cebola Adicional": 1}, preco_cebola)
+    ]
+
+def tabela_min_pecas(precos, limite):
+    """
+    Programação dinâmica de troco ilimitado: para cada valor v em 0..limite
+    guarda o menor número de peças que somam exatamente v e a última peça usada
+    (-1 quando v não é alcançável).
+    """
+    inalcancavel = limite + 1
+    minimo = [inalcancavel] * (limite + 1)
+    ultima = [-1] * (limite + 1)
+    minimo[0] = 0
+    
+    for v in range(1, limite + 1):
+        for i, preco in enumerate(precos):
+            if preco <= v and minimo[v - preco] + 1 < minimo[v]:
+                minimo[v] = minimo[v - preco] + 1
+                ultima[v] = i
+    
+    return minimo, ultima
+
+def resolver_combo_exato(target_value):
+    """
+    Resolve o problema do combo de forma exata e determinística.
+    Retorna (combinação, exato): a combinação com menos peças (ou seja, mais combos)
+    cujo total é o maior valor alcançável <= alvo, e se esse total é exatamente o alvo.
+    """
+    if target_value <= 0:
+        return {}, False
+    
+    pecas = montar_pecas_combo()
+    unidade = reduce(math.gcd, [preco for _, preco in pecas])
+    precos = [preco // unidade for _, preco in pecas]
+    alvo_centavos = para_centavos(target_value)
+    limite = alvo_centavos // unidade
+    
+    _, ultima = tabela_min_pecas(precos, limite)
+    
+    # Maior valor alcançável que não ultrapassa o alvo
+    valor = limite
+    while valor > 0 and ultima[valor] < 0:
+        valor -= 1
+    exato = valor > 0 and valor * unidade == alvo_centavos
+    
+    # Reconstrói a combinação percorrendo as peças usadas
+    combinacao = {}
+    while valor > 0:
+        composicao, _ = pecas[ultima[valor]]
+        for nome, qty in composicao.items():
+            combinacao[nome] = combinacao.get(nome, 0) + qty
+        valor -= precos[ultima[valor]]
+    
+    return combinacao, exato
+
+# --- FUNÇÕES PARA ALGORITMO GENÉTICO COM RESTRIÇÃO DE COMBO ---
+# A população é uma matriz inteira (indivíduos x itens) com as colunas em ITENS_COMBO
+ITENS_COMBO = ["JBC (Junior Bacon Cheese)", "Refri Lata", "Cebola Adicional"]
+
+def precos_itens_combo():
+    """Vetor de preços em centavos na mesma ordem das colunas da população"""
+    return para_centavos([
+        CARDAPIOS["sanduiches"]["JBC (Junior Bacon Cheese)"],
+        CARDAPIOS["bebidas"]["Refri Lata"],
+        CARDAPIOS["sanduiches"]["Cebola Adicional"]
+    ])
+
+def create_population_combo(rng, population_size, max_combos=100):
+    """
+    Cria a população inicial respeitando a regra do combo:
+    - Número de JBC = Número de Refri Lata
+    - Cebola pode variar livremente
+    """
+    num_combos = rng.integers(1, max_combos + 1, population_size)
+    num_cebolas = rng.integers(0, 51, population_size)
+    return np.column_stack((num_combos, num_combos, num_cebolas))
+
+def evaluate_fitness_combo(individual, target_value):
+    """Avalia fitness (em centavos) com penalização se JBC != Refri Lata"""
+    qty_jbc = individual.get("JBC (Junior Bacon Cheese)", 0)
+    qty_lata = individual.get("Refri Lata", 0)
+    qty_cebola = individual.get("Cebola Adicional", 0)
+    
+    # Penalização severa se JBC != Lata
+    if qty_jbc != qty_lata:
+        return PENALIDADE + abs(qty_jbc - qty_lata) * PENALIDADE_DESBALANCEADO
+    
+    preco_jbc, preco_lata, preco_cebola = (int(preco) for preco in precos_itens_combo())
+    total = (preco_jbc * qty_jbc) + (preco_lata * qty_lata) + (preco_cebola * qty_cebola)
+    alvo = para_centavos(target_value)
+    
+    if total > alvo:
+        return PENALIDADE + (total - alvo)
+    
+    score = alvo - total
+    return score
+
+def evaluate_fitness_combo_batch(population, precos, alvo_centavos):
+    """
+    Versão vetorizada de evaluate_fitness_combo para a população inteira
+    (preços e alvo já em centavos)
+    """
+    score = alvo_centavos - (population @ precos)
+    fitness = np.where(score < 0, PENALIDADE - score, score)
+    
+    # Penalização severa se JBC != Lata
+    desbalanceado = population[:, 0] != population[:, 1]
+    if desbalanceado.any():
+        diff_combo = np.abs(population[:, 0] - population[:, 1])
+        fitness = np.where(desbalanceado, PENALIDADE + diff_combo * PENALIDADE_DESBALANCEADO, fitness)
+    
+    return fitness
+
+def crossover_combo_batch(parents1, parents2, sorteio):
+    """
+    Crossover em lote mantendo a regra do combo.
+    `sorteio` traz 3 linhas de números uniformes em [0, 1), uma por decisão.
+    Retorna os vetores (combos, cebolas) dos filhos.
+    """
+    # Combos vêm de um dos pais
+    num_combos = np.where(sorteio[0] < 0.5, parents1[:, 0], parents2[:, 0])
+    
+    # Cebolas podem ser média ou de um dos pais
+    media = (parents1[:, 2] + parents2[:, 2]) // 2
+    de_um_pai = np.where(sorteio[1] < 0.5, parents1[:, 2], parents2[:, 2])
+    num_cebolas = np.where(sorteio[2] < 0.5, media, de_um_pai)
+    
+    return num_combos, num_cebolas
+
+MUTACOES_COMBOS = np.array([-5, -3, -1, 1, 3, 5])
+MUTACOES_CEBOLAS = np.array([-3, -2, -1, 1, 2, 3])
+
+def mutate_combo_batch(num_combos, num_cebolas, sorteio, mutation_rate=0.3):
+    """
+    Mutação em lote mantendo a regra do combo.
+    `sorteio` traz 4 linhas de números uniformes em [0, 1): decisão e tamanho
+    da mutação dos combos e das cebolas.
+    """
+    # Mutar número de combos (JBC e Lata continuam iguais)
+    change = MUTACOES_COMBOS[(sorteio[1] * len(MUTACOES_COMBOS)).astype(np.intp)]
+    num_combos = np.where(sorteio[0] < mutation_rate, np.maximum(0, num_combos + change), num_combos)
+    
+    # Mutar cebolas
+    change = MUTACOES_CEBOLAS[(sorteio[3] * len(MUTACOES_CEBOLAS)).astype(np.intp)]
+    num_cebolas = np.where(sorteio[2] < mutation_rate, np.maximum(0, num_cebolas + change), num_cebolas)
+    
+    return num_combos, num_cebolas
+
+def genetic_algorithm_combo(target_value, population_size=50, generations=100, max_combos=100, seed=None):
+    """
+    Algoritmo genético com restrição de combo.
+    Fitness, seleção por torneio, crossover e mutação são feitos em lote sobre
+    a matriz da população; apenas o topo necessário para elite e pais é ordenado.
+    """
+    if target_value <= 0:
+        return {}
+    
+    rng = np.random.default_rng(seed)
+    precos = precos_itens_combo()
+    alvo = para_centavos(target_value)
+    population = create_population_combo(rng, population_size, max_combos)
+    next_population = np.empty_like(population)
+    best_individual = None
+    best_fitness = float('inf')
+    
+    elite_size = min(population_size, max(5, population_size // 10))
+    top_size = min(population_size, max(elite_size, 10))
+    num_children = population_size - elite_size
+    children_idx = np.arange(num_children)
+    tournament_size = 3
+    
+    for generation in range(generations):
+        fitness = evaluate_fitness_combo_batch(population, precos, alvo)
+        top = np.argpartition(fitness, top_size - 1)[:top_size]
+        top = top[np.argsort(fitness[top])]
+        
+        if fitness[top[0]] < best_fitness:
+            best_individual = population[top[0]].copy()
+            best_fitness = fitness[top[0]]
+        
+        if best_fitness == 0:
+            break
+        
+        # Um único sorteio por geração: torneio (3), pai do topo (1), crossover (3), mutação (4)
+        sorteio = rng.random((11, num_children))
+        
+        # Torneio: o pai 1 é o melhor de 3 sorteados, o pai 2 vem do topo 10
+        tournament = (sorteio[:tournament_size] * population_size).astype(np.intp)
+        winners = tournament[np.argmin(fitness[tournament], axis=0), children_idx]
+        parents1 = population[winners]
+        parents2 = population[top[(sorteio[3] * min(10, top_size)).astype(np.intp)]]
+        
+        num_combos, num_cebolas = crossover_combo_batch(parents1, parents2, sorteio[4:7])
+        num_combos, num_cebolas = mutate_combo_batch(num_combos, num_cebolas, sorteio[7:11])
+        
+        # Elitismo
+        next_population[:elite_size] = population[top[:elite_size]]
+        next_population[elite_size:, 0] = num_combos
+        next_population[elite_size:, 1] = num_combos
+        next_population[elite_size:, 2] = num_cebolas
+        population, next_population = next_population, population
+    
+    if best_individual is None:
+        return {}
+    
+    # Limpar valores zero
+    final_combination = {nome: int(qty) for nome, qty in zip(ITENS_COMBO, best_individual) if qty > 0}
+    
+    return final_combination
+
+def buscar_combinacao_combo(target_value, max_time_seconds=5, population_size=100, generations=200):
+    """Busca a melhor combinação respeitando a regra do combo"""
+    start_time = time.time()
+    best_global_individual = {}
+    best_global_diff = float('inf')
+    attempts = 0
+    
+    while (time.time() - start_time) < max_time_seconds:
+        attempts += 1
+        current_result = genetic_algorithm_combo(target_value, population_size, generations)
+        current_fitness = evaluate_fitness_combo(current_result, target_value)
+        
+        if current_fitness == 0:
+            return current_result, attempts
+        
+        if current_fitness < best_global_diff:
+            best_global_diff = current_fitness
+            best_global_individual = current_result
+    
+    return best_global_individual, attempts
+
+# --- BUSCA PARALELA (VÁRIOS PROCESSOS) ---
+_evento_parada = None
+
+def _init_worker_combo(evento_parada):
+    """Inicializador dos processos: guarda o evento compartilhado de parada"""
+    global _evento_parada
+    _evento_parada = evento_parada
+
+def _reinicios_combo_worker(target_value, deadline, population_size, generations, seed):
+    """
+    Executa reinícios independentes do algoritmo genético até encontrar fitness zero,
+    esgotar o prazo ou outro processo sinalizar que já encontrou a resposta.
+    Retorna (melhor combinação, melhor fitness, tentativas realizadas).
+    """
+    seeds = np.random.SeedSequence(seed)
+    best_individual = {}
+    best_fitness = float('inf')
+    attempts = 0
+    
+    while time.time() < deadline and not _evento_parada.is_set():
+        attempts += 1
+        current_result = genetic_algorithm_combo(target_value, population_size, generations,
+                                                 seed=seeds.spawn(1)[0])
+        current_fitness = evaluate_fitness_combo(current_result, target_value)
+        
+        if current_fitness < best_fitness:
+            best_fitness = current_fitness
+            best_individual = current_result
+        
+        if current_fitness == 0:
+            _evento_parada.set()
+            break
+    
+    return best_individual, best_fitness, attempts
+
+def buscar_combinacao_combo_paralelo(target_value, max_time_seconds=5, population_size=100, generations=200,
+                                     max_workers=None, seed=None):
+    """
+    Distribui reinícios independentes do algoritmo genético (cada processo com sua semente)
+    entre um ProcessPoolExecutor. Todos param assim que algum encontra fitness zero.
+    Retorna (melhor combinação, lista de tentativas por processo).
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed).generate_state(max_workers)
+    
+    ctx = multiprocessing.get_context()
+    evento_parada = ctx.Event()
+    deadline = time.time() + max_time_seconds
+    
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx,
+                             initializer=_init_worker_combo, initargs=(evento_parada,)) as executor:
+        futures = [
+            executor.submit(_reinicios_combo_worker, target_value, deadline,
+                            population_size, generations, int(worker_seed))
+            for worker_seed in seeds
+        ]
+        resultados = [future.result() for future in futures]
+    
+    best_individual, _, _ = min(resultados, key=lambda resultado: resultado[1])
+    attempts_por_worker = [attempts for _, _, attempts in resultados]
+    
+    return best_individual, attempts_por_worker
+
+# --- RESOLUÇÃO EM LOTE ---
+def _resolver_alvo_lote(target_value, metodo, max_time_seconds, population_size, generations):
+    """Resolve um alvo do lote; retorna (combinação, exato, ciclos_por_worker)"""
+    if metodo == "exato":
+        combinacao, exato = resolver_combo_exato(target_value)
+        return combinacao, exato, [1]
+    
+    combinacao, ciclos = buscar_combinacao_combo(target_value, max_time_seconds, population_size, generations)
+    return combinacao, bool(evaluate_fitness_combo(combinacao, target_value) == 0), [ciclos]
+
+def resolver_lote_combo(alvos, metodo="genetico", max_time_seconds=5, population_size=100, generations=200,
+                        max_workers=None):
+    """
+    Resolve vários valores alvo numa única chamada, na ordem recebida.
+    O modo exato roda em sequência (milissegundos por alvo); o genético
+    distribui os alvos entre os processos de um ProcessPoolExecutor.
+    """
+    alvos = list(alvos)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(alvos))
+    argumentos = (alvos, repeat(metodo), repeat(max_time_seconds), repeat(population_size), repeat(generations))
+    
+    if metodo == "exato" or max_workers <= 1:
+        return list(map(_resolver_alvo_lote, *argumentos))
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_resolver_alvo_lote, *argumentos))
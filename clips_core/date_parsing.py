@@ -0,0 +1,102 @@
+"""
+Conversão vetorizada da coluna de datas da planilha.
+
+O formato é detectado uma única vez, a partir de uma amostra, e guardado em
+cache por coluna. A conversão usa o strptime do Arrow (C++, sem laço Python),
+ao contrário de pd.to_datetime, que para formatos não-ISO como dd/mm/aaaa
+converte elemento a elemento, com ou sem formato explícito.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Ordem importa: ano com 2 dígitos antes do de 4 (o %Y do Arrow aceita "24")
+FORMATOS = [
+    '%d/%m/%y',
+    '%d/%m/%Y',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%d-%m-%Y',
+    '%d.%m.%Y',
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y/%m/%d',
+]
+TAMANHO_AMOSTRA = 500
+MINIMO_RECONHECIDO = 0.5  # fração mínima de datas que o formato em cache precisa converter
+
+_formatos_detectados = {}
+
+def _strptime(textos, formato):
+    """Converte uma série de textos com o formato dado; valores fora do formato viram NaT."""
+    datas = pc.strptime(pa.array(textos.array, type=pa.string()), format=formato, unit='s', error_is_null=True)
+    return pd.Series(datas.to_numpy(zero_copy_only=False), index=textos.index)
+
+def detectar_formato(textos):
+    """Retorna o formato de FORMATOS que converte mais valores da amostra (ou None)."""
+    amostra = textos.drop_duplicates().head(TAMANHO_AMOSTRA)
+    melhor_formato, melhor_total = None, 0
+    for formato in FORMATOS:
+        total = _strptime(amostra, formato).notna().sum()
+        if total > melhor_total:
+            melhor_formato, melhor_total = formato, total
+    return melhor_formato
+
+def parse_dates(serie, chave='Data'):
+    """
+    Converte a série para datetime com formato explícito, detectado uma vez por
+    chave e reaproveitado nas chamadas seguintes. Valores fora do padrão
+    (poucos) caem na inferência do pandas com dayfirst=True.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+
+    textos = serie.astype(str).str.strip()
+    preenchidos = serie.notna() & (textos != '')
+    if not preenchidos.any():
+        return pd.Series(pd.NaT, index=serie.index, dtype='datetime64[s]')
+
+    formato = _formatos_detectados.get(chave)
+    datas = _strptime(textos, formato) if formato else None
+    if datas is None or datas[preenchidos].notna().mean() < MINIMO_RECONHECIDO:
+        # Primeira leitura ou a planilha mudou de formato: detecta de novo
+        formato = detectar_formato(textos[preenchidos])
+        if formato is None:
+            return pd.to_datetime(serie, dayfirst=True, errors='coerce')
+        _formatos_detectados[chave] = formato
+        datas = _strptime(textos, formato)
+
+    restantes = preenchidos & datas.isna()
+    if restantes.any():
+        datas[restantes] = pd.to_datetime(textos[restantes], format='mixed', dayfirst=True, errors='coerce')
+    return datas
+
+def colunas_calendario(datas, meses_ordem, dias_semana_ordem):
+    """
+    Colunas derivadas da data em formato compacto: inteiros pequenos e
+    Categoricals montados direto dos códigos (sem strftime/map por linha).
+    Nomes e datas formatadas ficam para a hora de exibir.
+    """
+    validas = datas.notna().to_numpy()
+    ano = datas.dt.year.fillna(0).to_numpy(dtype='int64')
+    mes = datas.dt.month.fillna(0).to_numpy(dtype='int64')
+
+    # Ano-mês como um único código ordenável; categorias só dos meses presentes
+    chave = ano * 12 + mes - 1
+    presentes = np.unique(chave[validas])
+    codigos_ano_mes = np.where(validas, np.searchsorted(presentes, chave), -1)
+    categorias_ano_mes = [f"{k // 12}-{k % 12 + 1:02d}" for k in presentes]
+
+    def inteiro(componente, tipo):
+        # Inteiro nullable (Int16/Int8) só quando há datas vazias
+        return componente.astype(tipo if validas.all() else tipo.capitalize())
+
+    return pd.DataFrame({
+        'Ano': inteiro(datas.dt.year, 'int16'),
+        'Mês': inteiro(datas.dt.month, 'int8'),
+        'MêsNome': pd.Categorical.from_codes(np.where(validas, mes - 1, -1), categories=meses_ordem, ordered=True),
+        'AnoMês': pd.Categorical.from_codes(codigos_ano_mes, categories=categorias_ano_mes, ordered=True),
+        'DiaSemana': pd.Categorical.from_codes(datas.dt.dayofweek.fillna(-1).to_numpy(dtype='int64'), categories=dias_semana_ordem, ordered=True),
+        'DiaDoMes': inteiro(datas.dt.day, 'int8'),
+    }, index=datas.index)
@@ -0,0 +1,112 @@
+"""
+Espelho local (Parquet) da tabela de vendas já processada.
+
+Os dashboards leem o snapshot do disco em milissegundos e uma thread em
+segundo plano o atualiza a partir da planilha em intervalos fixos. A data
+de modificação do arquivo é o "dados de" exibido na página.
+"""
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from .vendas import build_sales_dataframe, processar_vendas
+
+INTERVALO_ATUALIZACAO = 300  # segundos
+
+class EspelhoVendas:
+    """Snapshot Parquet de um DataFrame com atualização periódica em thread daemon."""
+
+    def __init__(self, caminho, carregar, intervalo=INTERVALO_ATUALIZACAO):
+        self.caminho = caminho
+        self.carregar = carregar
+        self.intervalo = intervalo
+        self.ultimo_erro = None
+        self._df = None
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def para_leitor(cls, leitor, caminho, intervalo=INTERVALO_ATUALIZACAO):
+        """
+        Espelho das vendas lidas por um LeitorIncrementalPlanilha (None se a aba
+        não abriu), com a atualização periódica já rodando. Sem snapshot em disco,
+        tenta criá-lo antes de retornar; uma falha fica em ultimo_erro.
+        """
+        def carregar():
+            if leitor is None:
+                raise RuntimeError("Planilha de vendas indisponível.")
+            return processar_vendas(build_sales_dataframe(leitor.ler_registros()))
+
+        espelho = cls(caminho, carregar, intervalo)
+        snapshot_existe = os.path.exists(caminho)
+        if not snapshot_existe and leitor is not None:
+            try:
+                espelho.atualizar()
+            except Exception as e:
+                espelho.ultimo_erro = e  # ler_ou_carregar tenta de novo e deixa o erro subir
+        espelho.iniciar_atualizacao_periodica(imediata=snapshot_existe)
+        return espelho
+
+    def atualizar(self):
+        """Busca os dados na origem e regrava o snapshot de forma atômica."""
+        df = self.carregar()
+        # Colunas object com tipos misturados (ex.: números e "") não vão para o Parquet
+        for col in df.select_dtypes(include="object").columns:
+            df[col] = df[col].astype(str)
+
+        pasta = os.path.dirname(self.caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        temporario = self.caminho + ".tmp"
+        df.to_parquet(temporario, index=False)
+        os.replace(temporario, self.caminho)
+
+    def ler(self):
+        """Retorna (DataFrame, datetime do snapshot) ou (None, None) se ainda não existe."""
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self.caminho)
+            except OSError:
+                return None, None
+            if mtime != self._mtime:
+                self._df = pd.read_parquet(self.caminho)
+                self._mtime = mtime
+            return self._df.copy(), datetime.fromtimestamp(mtime)
+
+    def ler_ou_carregar(self):
+        """
+        Como ler(), mas sem snapshot carrega direto da origem (data None).
+        Erros da origem são propagados para a interface exibir.
+        """
+        df, dados_de = self.ler()
+        if df is None:
+            return self.carregar(), None
+        return df, dados_de
+
+    def _loop(self, imediata):
+        if not imediata and self._parar.wait(self.intervalo):
+            return
+        while True:
+            try:
+                self.atualizar()
+                self.ultimo_erro = None
+            except Exception as e:
+                # Mantém o último snapshot válido; o erro fica disponível para a interface
+                self.ultimo_erro = e
+            if self._parar.wait(self.intervalo):
+                return
+
+    def iniciar_atualizacao_periodica(self, imediata=True):
+        """Inicia (uma única vez) a thread que atualiza o snapshot a cada intervalo."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._loop, args=(imediata,),
+                                        name="espelho-vendas", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
@@ -0,0 +1,182 @@
+"""
+Fila de escrita (write-behind) para registros enviados ao Google Sheets.
+
+Cada registro é gravado primeiro num SQLite local, o que é instantâneo e
+sobrevive a quedas de rede e reinícios. Uma thread em segundo plano envia os
+pendentes em lotes com append_rows e, em caso de erro (quota, rede), tenta de
+novo com backoff exponencial. O envio é "pelo menos uma vez": se o processo
+cair entre o append_rows e a marcação no SQLite, o lote é reenviado.
+Registros enviados ficam no SQLite por RETENCAO_ENVIADOS e depois são apagados,
+para a fila não crescer sem limite.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from . import sheets_client
+
+TAMANHO_LOTE = 50
+BACKOFF_INICIAL = 2  # segundos
+BACKOFF_MAXIMO = 300
+RETENCAO_ENVIADOS = 30 * 24 * 3600  # segundos (30 dias)
+
+class FilaEscrita:
+    """Fila durável de linhas a acrescentar numa aba, descarregada em lotes por uma thread."""
+
+    def __init__(self, caminho, aba, enviar, ao_enviar=None, tamanho_lote=TAMANHO_LOTE,
+                 backoff_inicial=BACKOFF_INICIAL, backoff_maximo=BACKOFF_MAXIMO,
+                 retencao_enviados=RETENCAO_ENVIADOS):
+        self.caminho = caminho
+        self.aba = aba
+        self.enviar = enviar
+        self.ao_enviar = ao_enviar
+        self.tamanho_lote = tamanho_lote
+        self.backoff_inicial = backoff_inicial
+        self.backoff_maximo = backoff_maximo
+        self.retencao_enviados = retencao_enviados
+        self.backoff = 0
+        self.ultimo_erro = None
+        self.proxima_tentativa = None
+        self._acordar = threading.Event()
+        self._lock = threading.Lock()
+        # Protege só o par (ultimo_erro, proxima_tentativa); _lock fica preso durante o envio
+        self._lock_estado = threading.Lock()
+        self._thread = None
+
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with closing(self._conectar()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fila (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    aba TEXT NOT NULL,
+                    linha TEXT NOT NULL,
+                    criado_em REAL NOT NULL,
+                    enviado_em REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_fila_pendentes ON fila (aba, enviado_em, id)")
+
+    @classmethod
+    def para_planilha(cls, caminho, credentials_dict, aba, espelho=None, **opcoes):
+        """
+        Fila que acrescenta as linhas (append_rows) na aba da planilha e, depois de
+        cada descarga, atualiza o espelho local. A thread de envio já sai iniciada.
+        """
+        def enviar(linhas):
+            if credentials_dict is None:
+                raise RuntimeError("Credenciais do Google indisponíveis.")
+            sheets_client.get_worksheet(credentials_dict, aba).append_rows(linhas)
+
+        ao_enviar = espelho.atualizar if espelho is not None else None
+        fila = cls(caminho, aba, enviar, ao_enviar, **opcoes)
+        fila.iniciar()
+        return fila
+
+    def _conectar(self):
+        conn = sqlite3.connect(self.caminho, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def enfileirar(self, linha):
+        """Grava a linha na fila local e acorda a thread de envio; retorna o id do registro."""
+        with closing(self._conectar()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO fila (aba, linha, criado_em) VALUES (?, ?, ?)",
+                (self.aba, json.dumps(linha, ensure_ascii=False), time.time())
+            )
+        self._acordar.set()
+        return cursor.lastrowid
+
+    def status(self):
+        """Resumo para a interface: pendentes, enviados, último erro e próxima tentativa."""
+        with closing(self._conectar()) as conn:
+            pendentes, enviados = conn.execute(
+                "SELECT SUM(enviado_em IS NULL), SUM(enviado_em IS NOT NULL) FROM fila WHERE aba = ?",
+                (self.aba,)
+            ).fetchone()
+        with self._lock_estado:
+            ultimo_erro, proxima_tentativa = self.ultimo_erro, self.proxima_tentativa
+        return {
+            "pendentes": pendentes or 0,
+            "enviados": enviados or 0,
+            "ultimo_erro": ultimo_erro,
+            "proxima_tentativa": proxima_tentativa
+        }
+
+    def descarregar(self):
+        """
+        Envia os pendentes em lotes até esvaziar a fila.
+        Retorna True se tudo foi enviado; False se um lote falhou (o backoff é ajustado).
+        """
+        with self._lock:
+            enviou_algo = False
+            try:
+                while True:
+                    with closing(self._conectar()) as conn:
+                        lote = conn.execute(
+                            "SELECT id, linha FROM fila WHERE aba = ? AND enviado_em IS NULL ORDER BY id LIMIT ?",
+                            (self.aba, self.tamanho_lote)
+                        ).fetchall()
+                    if not lote:
+                        break
+
+                    try:
+                        self.enviar([json.loads(linha) for _, linha in lote])
+                    except Exception as e:
+                        self.backoff = min(max(self.backoff * 2, self.backoff_inicial), self.backoff_maximo)
+                        with self._lock_estado:
+                            self.proxima_tentativa = time.time() + self.backoff
+                            self.ultimo_erro = str(e)
+                        return False
+
+                    with closing(self._conectar()) as conn, conn:
+                        conn.executemany(
+                            "UPDATE fila SET enviado_em = ? WHERE id = ?",
+                            [(time.time(), id_registro) for id_registro, _ in lote]
+                        )
+                    enviou_algo = True
+                    self.backoff = 0
+                    with self._lock_estado:
+                        self.ultimo_erro = None
+                        self.proxima_tentativa = None
+                if enviou_algo:
+                    self._apagar_enviados_antigos()
+            finally:
+                if enviou_algo and self.ao_enviar:
+                    try:
+                        self.ao_enviar()
+                    except Exception:
+                        pass
+            return True
+
+    def _apagar_enviados_antigos(self):
+        """Apaga os registros já enviados há mais de retencao_enviados segundos."""
+        with closing(self._conectar()) as conn, conn:
+            conn.execute(
+                "DELETE FROM fila WHERE aba = ? AND enviado_em < ?",
+                (self.aba, time.time() - self.retencao_enviados)
+            )
+
+    def _loop(self):
+        while True:
+            # Respeita o backoff mesmo que novos registros cheguem nesse meio tempo
+            espera = (self.proxima_tentativa or 0) - time.time()
+            if espera > 0:
+                time.sleep(espera)
+            self._acordar.clear()
+            if self.descarregar():
+                # Fila vazia: dorme até chegar um novo registro
+                self._acordar.wait()
+
+    def iniciar(self):
+        """Inicia (uma única vez) a thread de envio; pendentes de execuções anteriores são enviados."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._loop, name=f"fila-escrita-{self.aba}", daemon=True)
+        self._thread.start()
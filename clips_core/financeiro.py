@@ -0,0 +1,90 @@
+"""
+Cálculos financeiros dos apps: custos mensais estimados e o DRE das vendas.
+
+Somas, impostos e linhas do DRE são calculados em centavos inteiros (ver
+centavos), então os totais batem ao centavo; os dicionários devolvidos trazem
+os valores em reais para a interface.
+"""
+import pandas as pd
+
+from .centavos import aplicar_percentual, dividir, para_centavos, para_reais
+
+ALIQUOTA_SIMPLES = 0.06       # Simples Nacional sobre a receita tributável
+ENCARGOS_FUNCIONARIO = 1.55   # salário + encargos e provisões (estimativa do DRE)
+
+def format_currency(value):
+    if pd.isna(value) or value is None:
+        return "R$ -"
+    return f"R$ {float(value):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+def custo_funcionario_clt(salario_minimo):
+    """Custo mensal de um funcionário CLT (em centavos): salário, FGTS, férias com 1/3 e 13º."""
+    salario = para_centavos(salario_minimo)
+    fgts = aplicar_percentual(salario, 0.08)
+    ferias = dividir(salario * 4, 36)  # (salário / 12) * 4/3
+    decimo_terceiro = dividir(salario, 12)
+    return salario + fgts + ferias + decimo_terceiro
+
+def estimar_custos(total_vendas, salario_minimo, custo_contadora):
+    """
+    Imposto, custo do funcionário, total de custos e lucro estimado do período.
+    A conta é feita em centavos inteiros; o resultado volta em reais.
+    """
+    vendas = para_centavos(total_vendas)
+    imposto_simples = aplicar_percentual(vendas, ALIQUOTA_SIMPLES)
+    custo_funcionario = custo_funcionario_clt(salario_minimo)
+    total_custos = imposto_simples + custo_funcionario + para_centavos(custo_contadora)
+    return {
+        'imposto_simples': para_reais(imposto_simples),
+        'custo_funcionario': para_reais(custo_funcionario),
+        'total_custos': para_reais(total_custos),
+        'lucro_estimado': para_reais(vendas - total_custos),
+    }
+
+def calculate_financial_results(df, salario_minimo, custo_contadora, custo_fornecedores_percentual):
+    """Calcula os resultados financeiros com base nos dados de vendas seguindo normas contábeis."""
+    results = {
+        'receita_bruta': 0, 'receita_tributavel': 0, 'receita_nao_tributavel': 0,
+        'impostos_sobre_vendas': 0, 'receita_liquida': 0, 'custo_produtos_vendidos': 0,
+        'lucro_bruto': 0, 'margem_bruta': 0, 'despesas_administrativas': 0,
+        'despesas_com_pessoal': 0, 'despesas_contabeis': custo_contadora,
+        'total_despesas_operacionais': 0, 'lucro_operacional': 0, 'margem_operacional': 0,
+        'lucro_antes_ir': 0, 'lucro_liquido': 0, 'margem_liquida': 0,
+        'diferenca_tributavel_nao_tributavel': 0
+    }
+    
+    if df.empty: 
+        return results
+    
+    # Linhas do DRE em centavos; margens e conversão para reais no fim
+    cartao, dinheiro, pix = (int(para_centavos(df[col].to_numpy()).sum()) for col in ['Cartão', 'Dinheiro', 'Pix'])
+    c = {}
+    c['receita_bruta'] = int(para_centavos(df['Total'].to_numpy()).sum())
+    c['receita_tributavel'] = cartao + pix
+    c['receita_nao_tributavel'] = dinheiro
+    c['impostos_sobre_vendas'] = aplicar_percentual(c['receita_tributavel'], ALIQUOTA_SIMPLES)
+    c['receita_liquida'] = c['receita_bruta'] - c['impostos_sobre_vendas']
+    c['custo_produtos_vendidos'] = aplicar_percentual(c['receita_bruta'], custo_fornecedores_percentual / 100)
+    c['lucro_bruto'] = c['receita_liquida'] - c['custo_produtos_vendidos']
+    
+    c['despesas_com_pessoal'] = aplicar_percentual(para_centavos(salario_minimo), ENCARGOS_FUNCIONARIO)
+    c['despesas_contabeis'] = para_centavos(custo_contadora)
+    c['despesas_administrativas'] = 0
+    c['total_despesas_operacionais'] = (
+        c['despesas_com_pessoal'] + 
+        c['despesas_contabeis'] + 
+        c['despesas_administrativas']
+    )
+    
+    c['lucro_operacional'] = c['lucro_bruto'] - c['total_despesas_operacionais']
+    c['lucro_antes_ir'] = c['lucro_operacional']
+    c['lucro_liquido'] = c['lucro_antes_ir']
+    c['diferenca_tributavel_nao_tributavel'] = c['receita_nao_tributavel']
+    
+    if c['receita_liquida'] > 0:
+        results['margem_bruta'] = (c['lucro_bruto'] / c['receita_liquida']) * 100
+        results['margem_operacional'] = (c['lucro_operacional'] / c['receita_liquida']) * 100
+        results['margem_liquida'] = (c['lucro_liquido'] / c['receita_liquida']) * 100
+    
+    results.update({linha: para_reais(valor) for linha, valor in c.items()})
+    return results
@@ -0,0 +1,232 @@
+"""
+Solvers das combinações do cardápio completo (algoritmo genético e busca local).
+
+Módulo sem dependência do Streamlit, para ser usado pelo app e pelos
+benchmarks em benchmarks/.
+"""
+import random
+
+from .centavos import para_centavos
+from .tabela_alcancaveis import consultar_tabela
+
+CARDAPIOS = {
+    "sanduiches": {
+        "X Salada Simples": 18.00,
+        "X Salada Especial": 20.00,
+        "X Bacon Simples": 22.00,
+        "X Bacon Especial": 24.00,
+        "X Hamburgão": 35.00,
+        "X Mata-Fome": 39.00,
+        "X Frango Simples": 22.00,
+        "X Frango Especial": 24.00,
+        "X Frango Bacon": 27.00,
+        "X Frango Tudo": 30.00,
+        "X Lombo Simples": 23.00,
+        "X Lombo Especial": 26.00,
+        "X Lombo Bacon": 28.00,
+        "X Lombo Tudo": 31.00,
+        "X Filé Simples": 28.00,
+        "X Filé Especial": 30.00,
+        "X Filé Bacon": 33.00,
+        "X Filé Tudo": 36.00
+    },
+    "bebidas": {
+        "Suco": 10.00,
+        "Creme": 15.00,
+        "Refri caçula": 3.50,
+        "Refri Lata": 7.00,
+        "Refri 600": 8.00,
+        "Refri 1L": 10.00,
+        "Refri 2L": 15.00,
+        "Água": 3.00,
+        "Água com Gas": 4.00
+    }
+}
+
+# Internamente os indivíduos guardam quantidades em meias unidades (int) e os
+# preços e o alvo vão em centavos, então o total e o fitness são inteiros
+# (em meios centavos) e o acerto exato é fitness == 0.
+PENALIDADE = 200_000  # passar do alvo: R$ 1.000,00 em meios centavos
+
+def meias_unidades(value):
+    """Quantidade em meias unidades, arredondada ao múltiplo de 0.50 mais próximo."""
+    return round(value * 2)
+
+def calculate_combination_value(combination, item_prices):
+    """Calcula o valor total de uma combinação."""
+    return sum(item_prices.get(name, 0) * quantity for name, quantity in combination.items())
+
+# --- FUNÇÕES PARA ALGORITMO GENÉTICO ---
+def create_individual(item_prices, combination_size):
+    """Cria um indivíduo (combinação, em meias unidades) aleatório para o algoritmo genético."""
+    if not item_prices:
+        return {}
+    
+    items = list(item_prices.keys())
+    # Garante que não tentaremos selecionar mais itens do que existem
+    size = min(combination_size, len(items))
+    
+    # Seleciona exatamente 'size' itens (sem repetição)
+    selected_items = random.sample(items, size)
+    
+    return {
+        name: meias_unidades(random.uniform(1, 100))
+        for name in selected_items 
+    }
+
+def evaluate_fitness(individual, precos_centavos, alvo_centavos):
+    """
+    Avalia a adequação de um indivíduo (meias unidades) ao valor alvo, com
+    preços e alvo em centavos. Retorna a diferença em meios centavos.
+    """
+    total = sum(precos_centavos[name] * meias for name, meias in individual.items())
+    alvo = alvo_centavos * 2
+    # Penalidade maior se exceder o valor alvo
+    if total > alvo:
+        return PENALIDADE + total - alvo
+    return alvo - total
+
+def crossover(parent1, parent2):
+    """Realiza o cruzamento entre dois pais para criar um filho."""
+    # Todas as chaves dos dois pais, em ordem fixa (um set dependeria do hash
+    # aleatório das strings e a mesma semente daria resultados diferentes)
+    all_keys = list(dict.fromkeys(list(parent1.keys()) + list(parent2.keys())))
+    child = {}
+    
+    for key in all_keys:
+        if key in parent1 and key in parent2:
+            # Se a chave existe em ambos os pais, escolhe um valor ou a média
+            if random.random() < 0.5:
+                child[key] = parent1[key]
+            else:
+                child[key] = parent2[key]
+        elif key in parent1:
+            # Se existe apenas no primeiro pai, 50% de chance de incluir
+            if random.random() < 0.5:
+                child[key] = parent1[key]
+        elif key in parent2:
+            # Se existe apenas no segundo pai, 50% de chance de incluir
+            if random.random() < 0.5:
+                child[key] = parent2[key]
+    
+    return child
+
+def mutate(individual, item_prices, mutation_rate=0.2, max_items=5):
+    """Aplica mutação a um indivíduo, respeitando o número máximo de itens."""
+    new_individual = individual.copy()
+    
+    # Possivelmente adicionar um novo item (só se ainda não atingiu o máximo)
+    if (random.random() < mutation_rate and 
+        len(new_individual) < max_items and 
+        len(new_individual) < len(item_prices)):
+        
+        possible_new_items = [item for item in item_prices.keys() if item not in new_individual]
+        if possible_new_items:
+            new_item = random.choice(possible_new_items)
+            new_individual[new_item] = meias_unidades(random.uniform(1, 100))
+    
+    # Possivelmente remover um item existente (só se tiver mais de 1 item)
+    if random.random() < mutation_rate and len(new_individual) > 1:
+        item_to_remove = random.choice(list(new_individual.keys()))
+        del new_individual[item_to_remove]
+    
+    # Modificar quantidades existentes
+    for key in list(new_individual.keys()):
+        if random.random() < mutation_rate:
+            change = random.choice([-2, -1, 1, 2])  # ±0.5 ou ±1 unidade
+            new_individual[key] = max(1, new_individual[key] + change)
+    
+    return new_individual
+
+def quantidades_inteiras(individual):
+    """Meias unidades -> quantidades inteiras (arredondadas), sem os itens zerados."""
+    return {k: round(meias / 2) for k, meias in individual.items() if round(meias / 2) > 0}
+
+def genetic_algorithm(item_prices, target_value, population_size=50, generations=100, 
+                    combination_size=5, elite_size=5, tournament_size=3, tabela=None):
+    """
+    Implementa um algoritmo genético para encontrar combinações de produtos
+    que se aproximem de um valor alvo.
+    Se a tabela de valores alcançáveis for informada, responde direto por consulta
+    e só evolui a população quando o alvo fica fora dela.
+    """
+    if not item_prices or target_value <= 0:
+        return {}
+    
+    combinacao_tabela = consultar_tabela(tabela, target_value, combination_size)
+    if combinacao_tabela is not None:
+        return combinacao_tabela
+    
+    precos = {name: para_centavos(price) for name, price in item_prices.items()}
+    alvo = para_centavos(target_value)
+    
+    # Inicializa a população
+    population = [create_individual(item_prices, combination_size) for _ in range(population_size)]
+    
+    best_individual = {}
+    best_fitness = float('inf')
+    
+    for generation in range(generations):
+        # Avalia a população
+        fitness_scores = [(individual, evaluate_fitness(individual, precos, alvo)) 
+                         for individual in population]
+        
+        # Ordena por fitness (menor é melhor)
+        fitness_scores.sort(key=lambda x: x[1])
+        
+        # Atualiza o melhor indivíduo se encontrarmos um melhor
+        if fitness_scores[0][1] < best_fitness:
+            best_individual = fitness_scores[0][0].copy()
+            best_fitness = fitness_scores[0][1]
+        
+        # Se encontramos uma combinação exata, terminamos
+        if best_fitness == 0:
+            break
+        
+        # Seleciona a elite para a próxima geração
+        next_generation = [ind[0].copy() for ind in fitness_scores[:elite_size]]
+        
+        # Completa a próxima geração com novos indivíduos
+        while len(next_generation) < population_size:
+            # Seleção de torneio
+            tournament = random.sample(fitness_scores, tournament_size)
+            tournament.sort(key=lambda x: x[1])
+            parent1 = tournament[0][0]
+            
+            tournament = random.sample(fitness_scores, tournament_size)
+            tournament.sort(key=lambda x: x[1])
+            parent2 = tournament[0][0]
+            
+            # Cruzamento
+            child = crossover(parent1, parent2)
+            
+            # Mutação (passando o combination_size como max_items)
+            child = mutate(child, item_prices, max_items=combination_size)
+            
+            next_generation.append(child)
+        
+        # Atualiza a população
+        population = next_generation
+    
+    return quantidades_inteiras(best_individual)
+
+def busca_local(item_prices, target_value, max_iterations=10000, combination_size=5):
+    """
+    Busca local aleatória: gera candidatos mutados e guarda o de menor fitness.
+    Retorna a combinação com quantidades inteiras, como genetic_algorithm.
+    """
+    precos = {name: para_centavos(price) for name, price in item_prices.items()}
+    alvo = para_centavos(target_value)
+    best = {}
+    best_diff = float('inf')
+    
+    for _ in range(max_iterations):
+        candidate = create_individual(item_prices, combination_size)
+        candidate = mutate(candidate, item_prices, mutation_rate=0.3, max_items=combination_size)
+        
+        diff = evaluate_fitness(candidate, precos, alvo)
+        if diff < best_diff:
+            best = candidate
+            best_diff = diff
+    
+    return quantidades_inteiras(best)
@@ -0,0 +1,121 @@
+"""
+Valores em reais no formato brasileiro ("1.234,56", "R$ 12,00", "-5,00",
+"(5,00)") convertidos direto para centavos inteiros.
+
+A conversão é vetorizada com o compute do Arrow sobre a coluna inteira, sem
+laço Python e sem colunas object intermediárias. Cada texto é validado contra
+o formato pt-BR completo (milhares de 3 em 3, até 2 casas); o que não casar
+vira nulo em vez de um valor inventado. Células numéricas (o gspread já converte
+"12.5") passam direto, só multiplicadas por 100.
+
+No sentido inverso, formatar_reais monta os textos "R$ 1.234,56" de uma
+coluna inteira de uma vez, para tabelas, DRE e relatórios.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Sem vírgula, um ponto seguido de 1 ou 2 dígitos no fim é decimal ("12.50");
+# nos outros casos o ponto separa milhares ("1.234", "1.234.567")
+_PONTO_DECIMAL = r'^[0-9]*\.[0-9]{1,2}$'
+# Número pt-BR completo: milhares agrupados de 3 em 3 (ou só dígitos) e até 2 casas
+_NUMERO_BRL = r'^([0-9]{1,3}(\.[0-9]{3})+|[0-9]+)(,[0-9]{1,2})?$|^,[0-9]{1,2}$'
+_SIMBOLO = 'R$ \t\xa0'  # aparados das pontas: símbolo da moeda e espaços
+
+def _sem_simbolo(textos):
+    return pc.utf8_trim(textos, characters=_SIMBOLO)
+
+def _centavos_de_textos(textos):
+    """Array Arrow de textos -> array int64 de centavos (nulo quando inválido)."""
+    # Sinal: "(5,00)" ou "-5,00", com ou sem "R$" antes ou dentro; os cortes
+    # só rodam quando a coluna tem algum negativo
+    limpo = _sem_simbolo(textos)
+    parenteses = pc.and_(pc.starts_with(limpo, '('), pc.ends_with(limpo, ')'))
+    if pc.any(parenteses).as_py():
+        limpo = _sem_simbolo(pc.if_else(parenteses, pc.utf8_slice_codeunits(limpo, 1, -1), limpo))
+    menos = pc.starts_with(limpo, '-')
+    if pc.any(menos).as_py():
+        limpo = _sem_simbolo(pc.if_else(menos, pc.utf8_slice_codeunits(limpo, 1), limpo))
+    negativo = pc.or_(parenteses, menos)
+
+    # O que não for um número bem formado vira nulo, nunca dinheiro
+    valido = pc.match_substring_regex(limpo, _NUMERO_BRL)
+    canonico = pc.replace_substring(pc.replace_substring(limpo, '.', ''), ',', '.')
+    tem_virgula = pc.match_substring(limpo, ',')
+    if not pc.all(tem_virgula).as_py():
+        ponto_decimal = pc.match_substring_regex(limpo, _PONTO_DECIMAL)
+        valido = pc.or_(valido, ponto_decimal)
+        canonico = pc.if_else(ponto_decimal, limpo, canonico)
+    numero = pc.cast(pc.if_else(valido, canonico, pa.scalar(None, pa.string())), pa.float64())
+    centavos = pc.cast(pc.round(pc.multiply(numero, 100.0), 0, round_mode='half_up'), pa.int64())
+    return pc.if_else(negativo, pc.negate(centavos), centavos)
+
+def _int64_com_nulos(centavos):
+    """Array Arrow int64 -> pandas Int64, sem passar por objetos Python."""
+    valores = pc.fill_null(centavos, 0).to_numpy()
+    return pd.arrays.IntegerArray(valores, pc.is_null(centavos).to_numpy(zero_copy_only=False))
+
+def decodificar_centavos(valores):
+    """
+    Série de valores em reais (textos pt-BR, números ou vazios) -> série Int64
+    de centavos no mesmo índice. Textos que não formam um número viram <NA>.
+    """
+    valores = pd.Series(valores)
+    if pd.api.types.is_numeric_dtype(valores):
+        return pd.Series(np.round(valores.to_numpy(dtype='float64') * 100), index=valores.index).astype('Int64')
+
+    # Planilhas misturam células numéricas e textos; só os textos passam pelo Arrow
+    textos = valores if valores.dtype != object else valores.where(valores.map(type, na_action='ignore') == str)
+    eh_texto = textos.notna().to_numpy()
+    if eh_texto.all():
+        return pd.Series(_int64_com_nulos(_centavos_de_textos(pa.array(textos.array, type=pa.string()))),
+                         index=valores.index)
+
+    resultado = pd.Series(pd.NA, index=valores.index, dtype='Int64')
+    if eh_texto.any():
+        centavos = _centavos_de_textos(pa.array(textos[eh_texto].array, type=pa.string()))
+        resultado[eh_texto] = _int64_com_nulos(centavos)
+    numeros = ~eh_texto & valores.notna().to_numpy()
+    if numeros.any():
+        resultado[numeros] = np.round(pd.to_numeric(valores[numeros]).to_numpy(dtype='float64') * 100).astype('int64')
+    return resultado
+
+def decodificar_reais(valores):
+    """Como decodificar_centavos, mas em reais (float64, NaN quando inválido)."""
+    centavos = decodificar_centavos(valores)
+    return pd.Series(centavos.to_numpy(dtype='float64', na_value=np.nan) / 100, index=centavos.index)
+
+def formatar_reais(valores, casas=2, prefixo='R$ ', vazio='R$ -'):
+    """
+    Valores em reais -> textos pt-BR ("R$ 1.234,56", "R$ -5,00"), numa passada
+    vetorizada sobre a coluna inteira. Devolve uma Series de str no índice de
+    `valores`; NaN/None viram `vazio`. `casas` é 2 (centavos) ou 0 (reais inteiros).
+    """
+    valores = pd.Series(valores)
+    numeros = pd.to_numeric(valores, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    nulo = np.isnan(numeros)
+    escala = 10 ** casas
+    unidades = np.rint(np.where(nulo, 0, np.abs(numeros)) * escala).astype('int64')
+    negativo = (numeros < 0) & (unidades > 0)
+
+    # Inteiro com zeros à esquerda, cortado em grupos de 3 e juntado com '.';
+    # depois os zeros e pontos da frente saem ("000.001.234" -> "1.234")
+    inteiros = unidades // escala
+    digitos = 3 * -(-len(str(inteiros.max(initial=0))) // 3)  # só os grupos que o maior valor usa
+    inteiro = pc.utf8_lpad(pa.array(inteiros).cast(pa.string()), digitos, padding='0')
+    grupos = [pc.utf8_slice_codeunits(inteiro, i, i + 3) for i in range(0, digitos, 3)]
+    inteiro = pc.utf8_ltrim(pc.binary_join_element_wise(*grupos, '.'), characters='0.')
+    inteiro = pc.if_else(pc.equal(inteiro, ''), '0', inteiro)
+
+    partes = [pc.if_else(pa.array(negativo), prefixo + '-', prefixo), inteiro]
+    if casas:
+        fracao = pa.array(unidades % escala).cast(pa.string())
+        partes += [',', pc.utf8_lpad(fracao, casas, padding='0')]
+    textos = pc.binary_join_element_wise(*partes, '')
+    textos = pc.if_else(pa.array(nulo), vazio, textos)
+    return textos.to_pandas().set_axis(valores.index)
+
+def formatar_colunas_reais(df, colunas, **opcoes):
+    """Cópia de df com as colunas (as que existirem) trocadas pelos textos de formatar_reais."""
+    return df.assign(**{coluna: formatar_reais(df[coluna], **opcoes) for coluna in colunas if coluna in df.columns})
@@ -0,0 +1,147 @@
+"""
+Relatório financeiro em PDF (reportlab + matplotlib).
+
+Módulo separado para que o reportlab e o matplotlib só sejam carregados
+quando alguém pede o relatório; o app importa daqui dentro do botão.
+"""
+import io
+import os
+from datetime import datetime
+from io import BytesIO
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from .moeda import formatar_reais
+
+def create_watermark(canvas, logo_path, width=400, height=400, opacity=0.1):
+    try:
+        if os.path.exists(logo_path):
+            canvas.saveState()
+            canvas.setFillColorRGB(255, 255, 255, alpha=opacity)
+            canvas.drawImage(logo_path, (A4[0] - width) / 2, (A4[1] - height) / 2, 
+                             width=width, height=height, mask='auto', preserveAspectRatio=True)
+            canvas.restoreState()
+    except Exception as e:
+        print(f"Erro ao adicionar marca d'água: {e}")
+
+def fig_to_buffer(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=300, bbox_inches='tight')
+    buf.seek(0)
+    return buf
+
+def create_pdf_report(vendas, total_vendas, imposto_simples, custo_funcionario, 
+                    custo_contadora, total_custos, lucro_estimado, logo_path):
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+    styles = getSampleStyleSheet()
+    title_style = styles['Title']
+    heading_style = styles['Heading1']
+    subheading_style = styles['Heading2']
+    normal_style = styles['Normal']
+    elements = []
+    
+    try:
+        if os.path.exists(logo_path):
+            img = Image(logo_path, width=2*inch, height=1.5*inch)
+            img.hAlign = 'CENTER'
+            elements.append(img)
+            elements.append(Spacer(1, 0.5*inch))
+    except Exception as e:
+        print(f"Erro ao adicionar logo: {e}")
+    
+    elements.append(Paragraph("Relatório Financeiro - Clips Burger", title_style))
+    elements.append(Spacer(1, 0.5*inch))
+    elements.append(Paragraph(f"Data do relatório: {datetime.now().strftime('%d/%m/%Y')}", normal_style))
+    elements.append(Spacer(1, 0.25*inch))
+    elements.append(Paragraph("Resumo Financeiro", heading_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    metricas = ["Faturamento Bruto", "Imposto Simples (6%)", "Custo Funcionário CLT",
+                "Custo Contadora", "Total de Custos", "Lucro Estimado"]
+    valores = formatar_reais([total_vendas, imposto_simples, custo_funcionario,
+                              custo_contadora, total_custos, lucro_estimado])
+    data = [["Métrica", "Valor"]] + [[metrica, valor] for metrica, valor in zip(metricas, valores)]
+    
+    table = Table(data, colWidths=[doc.width/2.5, doc.width/2.5])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (1, 0), 12),
+        ('BACKGROUND', (0, -1), (1, -1), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ]))
+    elements.append(table)
+    elements.append(Spacer(1, 0.5*inch))
+    
+    elements.append(Paragraph("Análise de Vendas", heading_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    try:
+        fig, ax = plt.subplots(figsize=(8, 5))
+        vendas.plot(kind='bar', x='Forma', y='Valor', ax=ax, color='steelblue')
+        ax.set_title('Vendas por Forma de Pagamento')
+        ax.set_ylabel('Valor (R$)')
+        ax.set_xlabel('')
+        plt.tight_layout()
+        img_buf = fig_to_buffer(fig)
+        img = Image(img_buf, width=doc.width, height=4*inch)
+        elements.append(img)
+        elements.append(Spacer(1, 0.25*inch))
+        plt.close(fig)
+    except Exception as e:
+        elements.append(Paragraph(f"Erro ao gerar gráfico de vendas: {e}", normal_style))
+    
+    try:
+        custos_df = pd.DataFrame({
+            'Item': ['Impostos', 'Funcionário', 'Contadora'],
+            'Valor': [imposto_simples, custo_funcionario, custo_contadora]
+        })
+        fig, ax = plt.subplots(figsize=(8, 5))
+        ax.pie(custos_df['Valor'], labels=custos_df['Item'], autopct='%1.1f%%', startangle=90, shadow=True)
+        ax.set_title('Composição dos Custos')
+        plt.tight_layout()
+        img_buf = fig_to_buffer(fig)
+        img = Image(img_buf, width=doc.width, height=4*inch)
+        elements.append(img)
+        plt.close(fig)
+    except Exception as e:
+        elements.append(Paragraph(f"Erro ao gerar gráfico de custos: {e}", normal_style))
+    
+    elements.append(Spacer(1, 0.5*inch))
+    elements.append(Paragraph("Detalhamento por Forma de Pagamento", subheading_style))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    data = [["Forma de Pagamento", "Valor"]]
+    data += [[forma, valor] for forma, valor in zip(vendas['Forma'], formatar_reais(vendas['Valor']))]
+    
+    table = Table(data, colWidths=[doc.width/2, doc.width/4])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ]))
+    elements.append(table)
+    elements.append(Spacer(1, inch))
+    footer_text = "Este relatório foi gerado automaticamente pelo Sistema de Gestão da Clips Burger."
+    elements.append(Paragraph(footer_text, normal_style))
+    
+    def add_watermark(canvas, doc):
+        create_watermark(canvas, logo_path, width=300, height=300, opacity=0.1)
+    
+    doc.build(elements, onFirstPage=add_watermark, onLaterPages=add_watermark)
+    buffer.seek(0)
+    return buffer
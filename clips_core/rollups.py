@@ -0,0 +1,148 @@
+"""
+Cubos de vendas pré-agregados para os dashboards.
+
+Os cubos são calculados uma vez por versão dos dados. Toda célula inclui Ano
+e Mês, então os filtros da barra lateral viram um fatiamento de poucas linhas.
+Depois, reagrupar() combina as células (somas e contagens somam, máximos
+usam o máximo) sem voltar às linhas brutas. As médias saem de soma/contagem,
+o que dá o mesmo resultado da média sobre as linhas filtradas.
+"""
+import numpy as np
+import pandas as pd
+
+MEDIDAS = ['Cartão', 'Dinheiro', 'Pix', 'Total']
+
+# Chaves de cada cubo, além de Ano e Mês (que permitem o fatiamento).
+# Não há cubo semanal: o gráfico semanal recorta uma janela de dias e reagrupa
+# a série diária (agrupar_serie), o que um cubo por semana não permitiria
+CUBOS = {
+    'dia': ['Data'],
+    'mes': [],
+    'dia_semana': ['DiaSemana'],
+}
+
+def _agregar(df, chaves):
+    """Soma e máximo de cada medida, mais o número de registros, por chave."""
+    grupos = df.groupby(chaves, observed=True, sort=True)
+    somas = grupos[MEDIDAS].sum()
+    maximos = grupos[MEDIDAS].max().add_suffix('_max')
+    cubo = somas.join(maximos)
+    cubo['Registros'] = grupos.size()
+    return cubo.reset_index()
+
+def construir_cubos(df):
+    """
+    Retorna {nome: DataFrame} com os cubos de CUBOS. Colunas de cada cubo:
+    chaves, soma de cada medida (mesmo nome da medida), '<medida>_max' e 'Registros'.
+    """
+    base = df.dropna(subset=['Data'])[['Data', 'Ano', 'Mês', 'DiaSemana'] + MEDIDAS]
+    return {nome: _agregar(base, ['Ano', 'Mês'] + chaves) for nome, chaves in CUBOS.items()}
+
+def fatiar(cubo, anos=None, meses=None):
+    """Aplica os filtros de ano/mês da barra lateral ao cubo."""
+    if anos:
+        cubo = cubo[cubo['Ano'].isin(anos)]
+    if meses:
+        cubo = cubo[cubo['Mês'].isin(meses)]
+    return cubo
+
+def reagrupar(cubo, por):
+    """
+    Combina as células do cubo por 'por' e acrescenta '<medida>_media'
+    (média por registro). Com por=[] retorna uma única linha com os totais.
+    """
+    colunas_max = [f'{m}_max' for m in MEDIDAS]
+    if por:
+        grupos = cubo.groupby(por, observed=True, sort=True)
+        resultado = grupos[MEDIDAS + ['Registros']].sum().join(grupos[colunas_max].max())
+    else:
+        resultado = pd.DataFrame([cubo[MEDIDAS + ['Registros']].sum().to_dict()
+                                  | cubo[colunas_max].max().to_dict()])
+    for medida in MEDIDAS:
+        resultado[f'{medida}_media'] = resultado[medida] / resultado['Registros'].where(resultado['Registros'] > 0)
+    return resultado
+
+# --- Heatmap anual de atividade ---
+SEMANAS_HEATMAP = 53  # colunas: (dia do ano - 1) // 7
+DIAS_HEATMAP = 7      # linhas: Dom=0, Seg=1, ..., Sáb=6
+
+def construir_heatmaps(df):
+    """
+    Grades densas 53×7 por ano para o heatmap de atividade.
+    Retorna {ano: {'datas': datetime64[D] (NaT fora do ano), 'semana', 'dia_semana',
+    e uma grade por medida com a soma do dia}}; as coordenadas já vêm calculadas.
+    """
+    base = df.dropna(subset=['Data'])
+    anos = base['Data'].dt.year.to_numpy()
+    semana = (base['Data'].dt.dayofyear.to_numpy() - 1) // 7
+    dia_semana = (base['Data'].dt.dayofweek.to_numpy() + 1) % 7
+    semana_grade, dia_grade = np.indices((SEMANAS_HEATMAP, DIAS_HEATMAP))
+
+    heatmaps = {}
+    for ano in np.unique(anos):
+        # Calendário completo do ano nas mesmas coordenadas
+        calendario = np.arange(f'{ano}-01-01', f'{ano + 1}-01-01', dtype='datetime64[D]')
+        grade_datas = np.full((SEMANAS_HEATMAP, DIAS_HEATMAP), np.datetime64('NaT'), dtype='datetime64[D]')
+        grade_datas[np.arange(len(calendario)) // 7, (pd.DatetimeIndex(calendario).dayofweek + 1) % 7] = calendario
+
+        no_ano = anos == ano
+        ano_heatmap = {'datas': grade_datas, 'semana': semana_grade, 'dia_semana': dia_grade}
+        for medida in MEDIDAS:
+            grade = np.zeros((SEMANAS_HEATMAP, DIAS_HEATMAP))
+            np.add.at(grade, (semana[no_ano], dia_semana[no_ano]), base[medida].to_numpy(dtype='float64')[no_ano])
+            ano_heatmap[medida] = grade
+        heatmaps[int(ano)] = ano_heatmap
+    return heatmaps
+
+# --- Séries temporais com resolução automática ---
+LIMITE_PONTOS = 400  # pontos por série enviados ao navegador
+RESOLUCOES = {'dia': None, 'semana': 'W', 'mes': 'M'}  # períodos do pandas ('W' vai de segunda a domingo)
+
+def serie_diaria(cubo_dia, inicio=None, fim=None):
+    """Vendas por dia (Data + medidas) a partir do cubo diário, opcionalmente numa janela de datas."""
+    serie = reagrupar(cubo_dia, ['Data'])[MEDIDAS].reset_index()
+    if inicio is not None:
+        serie = serie[serie['Data'] >= pd.Timestamp(inicio)]
+    if fim is not None:
+        serie = serie[serie['Data'] <= pd.Timestamp(fim)]
+    return serie.reset_index(drop=True)
+
+def escolher_resolucao(serie, limite=LIMITE_PONTOS):
+    """Menor agregação (dia → semana → mês) que cabe no limite de pontos."""
+    for resolucao, frequencia in RESOLUCOES.items():
+        pontos = len(serie) if frequencia is None else serie['Data'].dt.to_period(frequencia).nunique()
+        if pontos <= limite:
+            return resolucao
+    return 'mes'
+
+def agrupar_serie(serie, resolucao):
+    """Soma as medidas por semana (início na segunda) ou mês; 'Data' vira o início do período."""
+    frequencia = RESOLUCOES[resolucao]
+    if frequencia is None or serie.empty:
+        return serie
+    inicio = serie['Data'].dt.to_period(frequencia).dt.start_time
+    return serie[MEDIDAS].groupby(inicio.rename('Data')).sum().reset_index()
+
+def lttb(x, y, limite=LIMITE_PONTOS):
+    """
+    Largest-Triangle-Three-Buckets: índices de até 'limite' pontos que preservam
+    a forma da série (picos e vales), sempre incluindo o primeiro e o último.
+    """
+    n = len(y)
+    if limite >= n or limite < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    limites = np.linspace(1, n - 1, limite - 1).astype(int)  # fronteiras dos baldes internos
+    indices = [0]
+    for i in range(limite - 2):
+        inicio, fim = limites[i], limites[i + 1]
+        # Média do próximo balde (ou o último ponto)
+        prox_inicio, prox_fim = fim, limites[i + 2] if i + 2 < len(limites) else n
+        media_x = x[prox_inicio:prox_fim].mean()
+        media_y = y[prox_inicio:prox_fim].mean()
+        a = indices[-1]
+        areas = np.abs((x[a] - media_x) * (y[inicio:fim] - y[a]) - (x[a] - x[inicio:fim]) * (media_y - y[a]))
+        indices.append(inicio + int(areas.argmax()))
+    indices.append(n - 1)
+    return np.array(indices)
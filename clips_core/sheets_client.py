@@ -0,0 +1,86 @@
+"""
+Cliente Google Sheets compartilhado pelos apps.
+
+Autoriza uma única vez por processo e reaproveita a mesma sessão HTTP
+(com pool de conexões) e os handles de planilha/aba. Assim, autenticação e
+metadados (open_by_key/worksheet) não se repetem a cada rerun do Streamlit.
+"""
+import hashlib
+import json
+import threading
+
+import gspread
+from google.oauth2.service_account import Credentials
+from gspread.utils import absolute_range_name, fill_gaps, numericise_all, to_records
+from requests.adapters import HTTPAdapter
+
+SPREADSHEET_ID = '1NTScbiIna-iE7roQ9XBdjUOssRihTFFby4INAAQNXTg'
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets',
+          'https://www.googleapis.com/auth/spreadsheets.readonly',
+          'https://www.googleapis.com/auth/drive.readonly']
+TAMANHO_POOL = 10
+
+_lock = threading.RLock()
+_clientes = {}
+_planilhas = {}
+_abas = {}
+
+def _chave_credenciais(credentials_dict):
+    conteudo = json.dumps(dict(credentials_dict), sort_keys=True, default=str)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+def get_client(credentials_dict):
+    """Cliente gspread autorizado, criado uma vez por conjunto de credenciais."""
+    chave = _chave_credenciais(credentials_dict)
+    with _lock:
+        if chave not in _clientes:
+            creds = Credentials.from_service_account_info(dict(credentials_dict), scopes=SCOPES)
+            gc = gspread.authorize(creds)
+            # Sessão única com pool maior: várias sessões do Streamlit e threads usam o mesmo cliente
+            adaptador = HTTPAdapter(pool_connections=TAMANHO_POOL, pool_maxsize=TAMANHO_POOL)
+            gc.http_client.session.mount('https://', adaptador)
+            _clientes[chave] = gc
+        return _clientes[chave]
+
+def get_spreadsheet(credentials_dict, spreadsheet_id=SPREADSHEET_ID):
+    """Handle da planilha, aberto (open_by_key) uma única vez."""
+    chave = (_chave_credenciais(credentials_dict), spreadsheet_id)
+    with _lock:
+        if chave not in _planilhas:
+            _planilhas[chave] = get_client(credentials_dict).open_by_key(spreadsheet_id)
+        return _planilhas[chave]
+
+def get_worksheet(credentials_dict, worksheet_name, spreadsheet_id=SPREADSHEET_ID):
+    """Handle da aba, obtido uma única vez por planilha."""
+    chave = (_chave_credenciais(credentials_dict), spreadsheet_id, worksheet_name)
+    with _lock:
+        if chave not in _abas:
+            _abas[chave] = get_spreadsheet(credentials_dict, spreadsheet_id).worksheet(worksheet_name)
+        return _abas[chave]
+
+def valores_para_registros(valores):
+    """Converte uma matriz de valores (cabeçalho na 1ª linha) em registros, como get_all_records()."""
+    if not valores or valores == [[]]:
+        return []
+    valores = fill_gaps(valores)
+    return to_records(valores[0], [numericise_all(linha) for linha in valores[1:]])
+
+def get_all_records_batch(credentials_dict, worksheet_names, spreadsheet_id=SPREADSHEET_ID):
+    """
+    Lê várias abas numa única requisição (values_batch_get), em vez de um
+    get_all_records por aba. Retorna {nome da aba: lista de registros}.
+    """
+    planilha = get_spreadsheet(credentials_dict, spreadsheet_id)
+    resposta = planilha.values_batch_get([absolute_range_name(nome) for nome in worksheet_names])
+    faixas = resposta.get('valueRanges', [])
+    return {
+        nome: valores_para_registros(faixa.get('values', []))
+        for nome, faixa in zip(worksheet_names, faixas)
+    }
+
+def limpar_cache():
+    """Descarta clientes e handles (ex.: credenciais trocadas ou aba renomeada)."""
+    with _lock:
+        _clientes.clear()
+        _planilhas.clear()
+        _abas.clear()
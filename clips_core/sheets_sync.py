@@ -0,0 +1,80 @@
+"""
+Leitura incremental de uma aba do Google Sheets.
+
+Mantém em memória as linhas já lidas e, a cada leitura, busca numa única
+chamada (batch_get) o cabeçalho, a última linha conhecida (âncora) e apenas
+as linhas acrescentadas depois dela. Se o cabeçalho ou a âncora mudaram, a
+planilha foi editada/encurtada e os dados são recarregados por completo.
+Os registros têm o mesmo formato de worksheet.get_all_records().
+"""
+import re
+import threading
+import time
+
+from gspread.utils import numericise_all, rowcol_to_a1
+
+INTERVALO_REFRESH_COMPLETO = 600  # segundos; cobre edições no meio da planilha
+
+def _completar(linha, largura):
+    """Completa a linha com células vazias até a largura do cabeçalho."""
+    return list(linha) + [""] * (largura - len(linha))
+
+class LeitorIncrementalPlanilha:
+    """Cache local das linhas de uma worksheet que só baixa as linhas novas."""
+
+    def __init__(self, worksheet, intervalo_refresh_completo=INTERVALO_REFRESH_COMPLETO):
+        self.worksheet = worksheet
+        self.intervalo_refresh_completo = intervalo_refresh_completo
+        self.cabecalho = None
+        self.linhas = []
+        self.registros = []
+        self.ultimo_refresh_completo = 0.0
+        self._lock = threading.Lock()
+
+    def _para_registros(self, linhas):
+        valores = [numericise_all(linha) for linha in linhas]
+        return [dict(zip(self.cabecalho, linha)) for linha in valores]
+
+    def _refresh_completo(self):
+        planilha = self.worksheet.get(pad_values=True)
+        if planilha == [[]] or not planilha:
+            self.cabecalho, self.linhas, self.registros = [], [], []
+        else:
+            self.cabecalho = list(planilha[0])
+            self.linhas = [list(linha) for linha in planilha[1:]]
+            self.registros = self._para_registros(self.linhas)
+        self.ultimo_refresh_completo = time.time()
+
+    def _sincronizar(self):
+        """Busca só as linhas novas; retorna False quando é preciso recarregar tudo."""
+        largura = len(self.cabecalho)
+        if largura == 0:
+            return False
+
+        coluna_final = re.sub(r"\d+", "", rowcol_to_a1(1, largura))
+        linha_ancora = len(self.linhas) + 1  # linha 1 é o cabeçalho
+        cabecalho, ancora, novas = self.worksheet.batch_get([
+            "1:1",
+            f"A{linha_ancora}:{coluna_final}{linha_ancora}",
+            f"A{linha_ancora + 1}:{coluna_final}"
+        ])
+
+        cabecalho = _completar(cabecalho[0] if cabecalho else [], largura)
+        ancora = _completar(ancora[0] if ancora else [], largura)
+        ancora_conhecida = self.linhas[-1] if self.linhas else self.cabecalho
+        if cabecalho != self.cabecalho or ancora != ancora_conhecida:
+            return False
+
+        novas = [_completar(linha, largura) for linha in novas]
+        if novas:
+            self.linhas.extend(novas)
+            self.registros.extend(self._para_registros(novas))
+        return True
+
+    def ler_registros(self):
+        """Retorna todos os registros da aba, como worksheet.get_all_records()."""
+        with self._lock:
+            expirado = time.time() - self.ultimo_refresh_completo > self.intervalo_refresh_completo
+            if self.cabecalho is None or expirado or not self._sincronizar():
+                self._refresh_completo()
+            return list(self.registros)
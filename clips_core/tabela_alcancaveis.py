@@ -0,0 +1,118 @@
+"""
+Tabela pré-calculada de todos os totais alcançáveis de um cardápio.
+
+Para cada valor de 0 até o teto, em passos de R$ 0,50, guarda o menor número
+de itens que soma exatamente aquele valor e o último item usado (testemunha),
+o que permite reconstruir a combinação sem nova busca. As tabelas são gravadas
+em .npy e abertas com memory-map, então o app não as recalcula ao iniciar.
+"""
+import os
+
+import numpy as np
+
+from .cache_combos import fingerprint_cardapio
+from .centavos import para_centavos
+
+RESOLUCAO = 50  # centavos (R$ 0,50)
+TETO_PADRAO = 50000.00
+PASTA_TABELAS = "tabelas_combinacoes"
+INALCANCAVEL = np.iinfo(np.uint16).max
+MAX_VALORES_CONSULTADOS = 200
+
+def _para_passos(valor):
+    """Converte reais para passos de R$ 0,50 (arredondando para baixo)."""
+    return para_centavos(valor) // RESOLUCAO
+
+def construir_tabela(item_prices, teto=TETO_PADRAO):
+    """
+    Programação dinâmica de troco ilimitado, item a item, vetorizada por classe
+    de resto: para um preço p, contagem[r + k·p] = min_j≤k(contagem[r + j·p] - j) + k.
+    Retorna (contagem uint16, ultimo uint8).
+    """
+    centavos = [para_centavos(preco) for preco in item_prices.values()]
+    precos = [preco // RESOLUCAO for preco in centavos]
+    if len(precos) >= 255 or any(preco <= 0 or preco % RESOLUCAO for preco in centavos):
+        raise ValueError("Preços do cardápio precisam ser múltiplos positivos de R$ 0,50")
+
+    n = _para_passos(teto) + 1
+    contagem = np.full(n, INALCANCAVEL, dtype=np.int64)
+    contagem[0] = 0
+    ultimo = np.full(n, INALCANCAVEL % 256, dtype=np.uint8)
+
+    for i, preco in enumerate(precos):
+        linhas = -(-n // preco)
+        grade = np.full(linhas * preco, INALCANCAVEL, dtype=np.int64)
+        grade[:n] = contagem
+        grade = grade.reshape(linhas, preco)
+        k = np.arange(linhas, dtype=np.int64)[:, None]
+        nova = (np.minimum.accumulate(grade - k, axis=0) + k).ravel()[:n]
+
+        melhorou = nova < contagem
+        contagem[melhorou] = nova[melhorou]
+        ultimo[melhorou] = i
+
+    contagem = np.minimum(contagem, INALCANCAVEL).astype(np.uint16)
+    return contagem, ultimo
+
+def _caminho_tabela(item_prices, teto, pasta):
+    fingerprint = fingerprint_cardapio(item_prices)[:16]
+    base = os.path.join(pasta, f"tabela_{fingerprint}_{_para_passos(teto)}")
+    return base + "_contagem.npy", base + "_ultimo.npy"
+
+def carregar_tabela(item_prices, teto=TETO_PADRAO, pasta=PASTA_TABELAS):
+    """
+    Abre a tabela do cardápio via memory-map, construindo e gravando em disco
+    na primeira vez (ou quando os preços mudam, pois o nome inclui o fingerprint).
+    """
+    caminho_contagem, caminho_ultimo = _caminho_tabela(item_prices, teto, pasta)
+
+    if not (os.path.exists(caminho_contagem) and os.path.exists(caminho_ultimo)):
+        contagem, ultimo = construir_tabela(item_prices, teto)
+        os.makedirs(pasta, exist_ok=True)
+        # Grava em arquivo temporário e renomeia para não deixar tabela pela metade
+        for caminho, dados in ((caminho_ultimo, ultimo), (caminho_contagem, contagem)):
+            temporario = caminho + ".tmp.npy"
+            np.save(temporario, dados)
+            os.replace(temporario, caminho)
+
+    return {
+        "itens": list(item_prices.keys()),
+        "precos": [para_centavos(preco) // RESOLUCAO for preco in item_prices.values()],
+        "contagem": np.load(caminho_contagem, mmap_mode="r"),
+        "ultimo": np.load(caminho_ultimo, mmap_mode="r")
+    }
+
+def reconstruir_combinacao(tabela, passos):
+    """Segue as testemunhas a partir de um valor alcançável e monta a combinação."""
+    combinacao = {}
+    while passos > 0:
+        i = int(tabela["ultimo"][passos])
+        item = tabela["itens"][i]
+        combinacao[item] = combinacao.get(item, 0) + 1
+        passos -= tabela["precos"][i]
+    return combinacao
+
+def consultar_tabela(tabela, target_value, max_tipos=None):
+    """
+    Retorna a combinação com menos itens para o maior total alcançável que não
+    passa do valor alvo, com no máximo max_tipos itens diferentes.
+    Retorna None quando o alvo está acima do teto ou nenhum dos valores
+    consultados respeita max_tipos (o chamador usa a heurística nesses casos).
+    """
+    if tabela is None or target_value <= 0:
+        return None
+
+    passos = _para_passos(target_value)
+    contagem = tabela["contagem"]
+    if passos >= len(contagem):
+        return None
+
+    consultados = 0
+    while passos > 0 and consultados < MAX_VALORES_CONSULTADOS:
+        if contagem[passos] != INALCANCAVEL:
+            consultados += 1
+            combinacao = reconstruir_combinacao(tabela, passos)
+            if max_tipos is None or len(combinacao) <= max_tipos:
+                return combinacao
+        passos -= 1
+    return None
@@ -0,0 +1,85 @@
+"""
+Leitura dos arquivos de transações da maquininha (Tipo, Bandeira, Valor).
+
+O CSV é lido em blocos, só com as três colunas usadas, e cada bloco é somado
+por forma de pagamento antes de ler o próximo; a memória fica limitada ao
+tamanho do bloco, não ao do arquivo. O separador é detectado uma vez a partir
+do começo do arquivo, sem tentar parsers em sequência.
+"""
+import csv
+import io
+
+import pandas as pd
+
+from .moeda import decodificar_centavos
+
+COLUNAS_TRANSACOES = ['Tipo', 'Bandeira', 'Valor']
+TAMANHO_BLOCO = 50_000      # linhas por bloco
+TAMANHO_PREFIXO = 64 * 1024  # bytes lidos para detectar o separador
+SEPARADORES = ';,\t|'
+
+def detectar_separador(prefixo):
+    """Separador do CSV a partir das primeiras linhas (';' em caso de dúvida)."""
+    try:
+        return csv.Sniffer().sniff(prefixo, delimiters=SEPARADORES).delimiter
+    except csv.Error:
+        cabecalho = prefixo.splitlines()[0] if prefixo else ''
+        return ',' if cabecalho.count(',') > cabecalho.count(';') else ';'
+
+def _ler_prefixo(arquivo):
+    inicio = arquivo.read(TAMANHO_PREFIXO)
+    arquivo.seek(0)
+    if isinstance(inicio, bytes):
+        inicio = inicio.decode('utf-8-sig', errors='ignore')
+    # Descarta a última linha, que pode ter sido cortada no meio
+    linhas = inicio.splitlines()
+    return '\n'.join(linhas[:-1] if len(linhas) > 1 else linhas)
+
+def somar_bloco(bloco, formas_pagamento):
+    """Soma (em centavos) e contagem por forma de pagamento de um bloco de transações."""
+    bloco = bloco.assign(Valor=decodificar_centavos(bloco['Valor'])).dropna(subset=['Valor'])
+    # Normaliza só os pares (Tipo, Bandeira) distintos, não cada linha
+    pares = bloco.groupby(['Tipo', 'Bandeira'], dropna=False, sort=False)['Valor'].agg(['sum', 'count'])
+    tipo = pares.index.get_level_values('Tipo').str.lower().str.strip().fillna('desconhecido')
+    bandeira = pares.index.get_level_values('Bandeira').str.lower().str.strip().fillna('desconhecida')
+    formas = (tipo + ' ' + bandeira).map(formas_pagamento)
+    return pares.groupby(formas).sum()
+
+def _blocos(arquivo, nome, tamanho_bloco):
+    if not nome.endswith('.csv'):
+        # Excel não tem leitura em blocos; ainda assim só as colunas usadas
+        planilha = pd.read_excel(arquivo, dtype=str)
+        _verificar_colunas(planilha.columns)
+        yield planilha[COLUNAS_TRANSACOES]
+        return
+
+    prefixo = _ler_prefixo(arquivo)
+    separador = detectar_separador(prefixo)
+    cabecalho = next(csv.reader(io.StringIO(prefixo), delimiter=separador), [])
+    _verificar_colunas([coluna.strip() for coluna in cabecalho])
+    yield from pd.read_csv(arquivo, sep=separador, encoding='utf-8-sig', dtype=str,
+                           usecols=lambda coluna: coluna.strip() in COLUNAS_TRANSACOES,
+                           chunksize=tamanho_bloco)
+
+def _verificar_colunas(colunas):
+    if not all(coluna in colunas for coluna in COLUNAS_TRANSACOES):
+        raise ValueError(f"O arquivo precisa conter as colunas: {', '.join(COLUNAS_TRANSACOES)}")
+
+def totais_por_forma(arquivo, nome, formas_pagamento, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Total vendido por forma de pagamento (DataFrame Forma/Valor, em ordem de
+    Forma) e o número de transações válidas. Linhas sem valor numérico ou com
+    Tipo + Bandeira fora de formas_pagamento são ignoradas.
+    Levanta ValueError se faltar alguma das COLUNAS_TRANSACOES.
+    """
+    acumulado = None
+    for bloco in _blocos(arquivo, nome, tamanho_bloco):
+        bloco.columns = bloco.columns.str.strip()
+        parcial = somar_bloco(bloco, formas_pagamento)
+        acumulado = parcial if acumulado is None else acumulado.add(parcial, fill_value=0)
+
+    if acumulado is None or acumulado.empty:
+        return pd.DataFrame({'Forma': pd.Series(dtype=str), 'Valor': pd.Series(dtype=float)}), 0
+    # Soma exata em centavos; reais só no resultado
+    vendas = (acumulado['sum'].sort_index() / 100).rename_axis('Forma').rename('Valor').reset_index()
+    return vendas, int(acumulado['count'].sum())
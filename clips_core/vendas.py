@@ -0,0 +1,62 @@
+"""
+Montagem e processamento do DataFrame de vendas (Data, Cartão, Dinheiro, Pix).
+
+Funções puras, sem Streamlit: os apps guardam o resultado em cache e mostram
+as mensagens de aviso; o snapshot local e os jobs em lote chamam direto.
+"""
+import pandas as pd
+
+from .date_parsing import colunas_calendario, parse_dates
+from .moeda import decodificar_reais
+
+FORMAS_PAGAMENTO = ['Cartão', 'Dinheiro', 'Pix']
+COLUNAS_CALENDARIO = ['Ano', 'Mês', 'MêsNome', 'AnoMês', 'DataFormatada', 'DiaSemana', 'DiaDoMes']
+
+dias_semana_ordem = ["Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira", "Sexta-feira", "Sábado", "Domingo"]
+meses_ordem = ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
+
+def _garantir_numericos(df):
+    for col in FORMAS_PAGAMENTO:
+        if col in df.columns:
+            # Aceita textos pt-BR ("1.234,56", "R$ 12,00") além de números
+            df[col] = decodificar_reais(df[col]).fillna(0)
+        else:
+            df[col] = 0
+    return df
+
+def build_sales_dataframe(rows):
+    """Converte os registros da planilha no DataFrame bruto de vendas."""
+    if not rows:
+        return pd.DataFrame()
+
+    df = _garantir_numericos(pd.DataFrame(rows))
+    if 'Data' not in df.columns:
+        df['Data'] = pd.NaT
+    return df
+
+def processar_vendas(df_input):
+    """
+    Prepara as vendas para análise: formas de pagamento numéricas, Total,
+    Data convertida (linhas sem data válida saem) e as colunas de calendário.
+    Sem a coluna 'Data' as colunas de calendário vêm vazias.
+    """
+    if df_input is None or df_input.empty:
+        empty_df = pd.DataFrame({'Data': pd.Series(dtype='datetime64[ns]')})
+        for col in FORMAS_PAGAMENTO + ['Total']:
+            empty_df[col] = pd.Series(dtype='float')
+        return empty_df.join(colunas_calendario(empty_df['Data'], meses_ordem, dias_semana_ordem))
+
+    df = _garantir_numericos(df_input.copy())
+    df['Total'] = df['Cartão'] + df['Dinheiro'] + df['Pix']
+
+    if 'Data' in df.columns and not df['Data'].isnull().all():
+        # Formato detectado uma vez e reaproveitado (ver date_parsing)
+        df['Data'] = parse_dates(df['Data'])
+        df = df.dropna(subset=['Data'])
+    else:
+        df['Data'] = pd.NaT
+
+    # Ano/Mês/DiaDoMes como inteiros e MêsNome/AnoMês/DiaSemana como Categoricals;
+    # a data formatada (dd/mm/aaaa) é gerada só na exibição
+    df = df.drop(columns=COLUNAS_CALENDARIO, errors='ignore')
+    return df.join(colunas_calendario(df['Data'], meses_ordem, dias_semana_ordem))
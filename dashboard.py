@@ -1,22 +1,29 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
-import gspread
 import pandas as pd
 import altair as alt
 import numpy as np
 from datetime import datetime, timedelta
-from google.oauth2.service_account import Credentials
 from gspread.exceptions import SpreadsheetNotFound
 import warnings
+import os
+from clips_core import sheets_client
+from clips_core.sheets_sync import LeitorIncrementalPlanilha
+from clips_core.espelho_vendas import EspelhoVendas
+from clips_core.fila_escrita import FilaEscrita
+from clips_core.vendas import meses_ordem, processar_vendas
+from clips_core.financeiro import format_currency
 import json # Para carregar o manifest
 
 # Suprimir warnings específicos do pandas
 warnings.filterwarnings("ignore", category=FutureWarning, message=".*observed=False.*")
 
 # --- Configurações Globais e Constantes ---
-SPREADSHEET_ID = "1NTScbiIna-iE7roQ9XBdjUOssRihTFFby4INAAQNXTg"
 WORKSHEET_NAME = "Vendas"
 LOGO_URL = "https://raw.githubusercontent.com/lucasricardocs/clipsburger/refs/heads/main/logo.png"
+SNAPSHOT_PATH = os.path.join("dados", "vendas_dashboard.parquet")
+SNAPSHOT_REFRESH_SECONDS = 300
+QUEUE_PATH = os.path.join("dados", "fila_vendas_dashboard.sqlite")
 
 # Configuração da página Streamlit
 st.set_page_config(
@@ -32,10 +39,6 @@ alt.data_transformers.enable("json")
 # Paleta de cores otimizada para modo escuro
 CORES_MODO_ESCURO = ["#4c78a8", "#54a24b", "#f58518", "#e45756", "#72b7b2", "#ff9da6", "#9d755d", "#bab0ac"]
 
-# Define a ordem correta dos dias da semana e meses
-dias_semana_ordem = ["Segunda-feira", "Terça-feira", "Quarta-feira", "Quinta-feira", "Sexta-feira", "Sábado", "Domingo"]
-meses_ordem = ["Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
-
 # --- CSS Customizado para App-Like --- #
 def inject_custom_css():
     st.markdown("""
@@ -195,103 +198,54 @@ def inject_custom_css():
 
 inject_custom_css()
 
-# --- Funções de Cache para Acesso ao Google Sheets (sem alterações) ---
+# --- Acesso ao Google Sheets (cliente e abas compartilhados em clips_core.sheets_client) --- #
 @st.cache_resource
-def get_google_auth():
-    """Autoriza o acesso ao Google Sheets e retorna o cliente gspread."""
-    SCOPES = ["https://www.googleapis.com/auth/spreadsheets",
-              "https://www.googleapis.com/auth/spreadsheets.readonly",
-              "https://www.googleapis.com/auth/drive.readonly"]
+def get_google_credentials():
+    """Credenciais do Google: st.secrets ou, em desenvolvimento local, o arquivo credentials.json."""
+    if "google_credentials" in st.secrets:
+        credentials_dict = st.secrets["google_credentials"]
+        if credentials_dict:
+            return dict(credentials_dict)
+        st.warning("Credenciais do Google em st.secrets estão vazias. Tentando carregar de 'credentials.json'.")
+
+    # Fallback para arquivo local (útil para desenvolvimento local)
     try:
-        # Tenta carregar do st.secrets primeiro
-        if "google_credentials" in st.secrets:
-            credentials_dict = st.secrets["google_credentials"]
-            if credentials_dict:
-                creds = Credentials.from_service_account_info(credentials_dict, scopes=SCOPES)
-                gc = gspread.authorize(creds)
-                return gc
-            else:
-                st.warning("Credenciais do Google em st.secrets estão vazias. Tentando carregar de 'credentials.json'.")
-        
-        # Fallback para arquivo local (útil para desenvolvimento local)
-        try:
-            creds = Credentials.from_service_account_file("credentials.json", scopes=SCOPES)
-            gc = gspread.authorize(creds)
-            st.info("Credenciais carregadas de 'credentials.json'.")
-            return gc
-        except FileNotFoundError:
-            st.error("Erro: Arquivo 'credentials.json' não encontrado E credenciais não configuradas em st.secrets.")
-            st.info("Para configurar: 1) Crie um arquivo .streamlit/secrets.toml com suas credenciais do Google OU 2) Coloque o arquivo credentials.json na raiz do projeto.")
-            return None
-        except Exception as e_file:
-            st.error(f"Erro ao carregar 'credentials.json': {e_file}")
-            return None
-
-    except Exception as e_auth:
-        st.error(f"Erro geral de autenticação com Google: {e_auth}")
-        return None
-
-@st.cache_resource
-def get_worksheet(_gc): # Passa o cliente autorizado
-    """Retorna o objeto worksheet da planilha especificada."""
-    # gc = get_google_auth() # Não chama mais aqui para evitar loop
-    if _gc:
-        try:
-            spreadsheet = _gc.open_by_key(SPREADSHEET_ID)
-            worksheet = spreadsheet.worksheet(WORKSHEET_NAME)
-            return worksheet
-        except SpreadsheetNotFound:
-            st.error(f"Planilha com ID '{SPREADSHEET_ID}' não encontrada.")
-            return None
-        except Exception as e:
-            st.error(f"Erro ao acessar a planilha '{WORKSHEET_NAME}': {e}")
-            return None
+        with open("credentials.json", encoding="utf-8") as arquivo:
+            credentials_dict = json.load(arquivo)
+        st.info("Credenciais carregadas de 'credentials.json'.")
+        return credentials_dict
+    except FileNotFoundError:
+        st.error("Erro: Arquivo 'credentials.json' não encontrado E credenciais não configuradas em st.secrets.")
+        st.info("Para configurar: 1) Crie um arquivo .streamlit/secrets.toml com suas credenciais do Google OU 2) Coloque o arquivo credentials.json na raiz do projeto.")
+    except Exception as e_file:
+        st.error(f"Erro ao carregar 'credentials.json': {e_file}")
     return None
 
-# Modificado para aceitar o worksheet como argumento
-@st.cache_data
-def read_sales_data(_worksheet):
-    """Lê todos os registros da planilha de vendas e retorna como DataFrame."""
-    # worksheet = get_worksheet() # Não chama mais aqui
-    if _worksheet:
-        try:
-            rows = _worksheet.get_all_records()
-            if not rows:
-                # st.info("A planilha de vendas está vazia.") # Removido info daqui
-                return pd.DataFrame()
-
-            df = pd.DataFrame(rows)
-
-            for col in ["Cartão", "Dinheiro", "Pix"]:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-                else:
-                    df[col] = 0
+def get_worksheet():
+    """Retorna o objeto worksheet da planilha; autenticação e open_by_key acontecem uma vez por processo."""
+    credentials_dict = get_google_credentials()
+    if credentials_dict is None:
+        return None
+    try:
+        return sheets_client.get_worksheet(credentials_dict, WORKSHEET_NAME)
+    except SpreadsheetNotFound:
+        sheets_client.limpar_cache()
+        st.error(f"Planilha com ID '{sheets_client.SPREADSHEET_ID}' não encontrada.")
+    except Exception as e:
+        sheets_client.limpar_cache()
+        st.error(f"Erro ao acessar a planilha '{WORKSHEET_NAME}': {e}")
+    return None
 
-            if "Data" not in df.columns:
-                df["Data"] = pd.NaT
-            else:
-                 # Tentativa robusta de converter Data
-                try:
-                    # Tenta formato brasileiro primeiro
-                    df['Data'] = pd.to_datetime(df['Data'], format='%d/%m/%Y', errors='coerce')
-                    # Se falhar, tenta formato padrão
-                    if df['Data'].isnull().any():
-                        df['Data'] = pd.to_datetime(df['Data'], errors='coerce')
-                except Exception:
-                     df['Data'] = pd.to_datetime(df['Data'], errors='coerce')
-
-            return df
-        except Exception as e:
-            st.error(f"Erro ao ler dados da planilha: {e}")
-            return pd.DataFrame()
-    return pd.DataFrame()
-
-# --- Funções de Manipulação de Dados (sem alterações) ---
-def add_data_to_sheet(date, cartao, dinheiro, pix, worksheet_obj):
-    """Adiciona uma nova linha de dados à planilha Google Sheets."""
-    if worksheet_obj is None:
-        st.error("Não foi possível acessar a planilha para adicionar dados.")
+@st.cache_resource
+def get_sales_reader(_worksheet):
+    """Leitor incremental da aba de vendas, compartilhado entre sessões e reruns."""
+    return LeitorIncrementalPlanilha(_worksheet)
+
+# --- Funções de Manipulação de Dados --- #
+def add_data_to_sheet(date, cartao, dinheiro, pix, fila):
+    """Registra a venda na fila local; o envio à planilha Google Sheets é feito em segundo plano."""
+    if fila is None:
+        st.error("Não foi possível acessar a fila de registros para adicionar dados.")
         return False
     try:
         cartao_val = float(cartao) if cartao else 0.0
@@ -299,7 +253,7 @@ def add_data_to_sheet(date, cartao, dinheiro, pix, worksheet_obj):
         pix_val = float(pix) if pix else 0.0
 
         new_row = [date, cartao_val, dinheiro_val, pix_val]
-        worksheet_obj.append_row(new_row)
+        fila.enfileirar(new_row)
         # st.success("Dados registrados com sucesso! ✅") # Sucesso será mostrado no main
         return True
     except ValueError as ve:
@@ -309,68 +263,25 @@ def add_data_to_sheet(date, cartao, dinheiro, pix, worksheet_obj):
         st.error(f"Erro ao adicionar dados na planilha: {e}")
         return False
 
-@st.cache_data
-def process_data(df_input):
-    """Processa e prepara os dados de vendas para análise."""
-    if df_input is None or df_input.empty:
-        # Retorna um DataFrame vazio com a estrutura esperada
-        cols = ["Data", "Cartão", "Dinheiro", "Pix", "Total", "Ano", "Mês", "MêsNome", "AnoMês", "DataFormatada", "DiaSemana", "DiaDoMes"]
-        empty_df = pd.DataFrame(columns=cols)
-        # Definir tipos de dados para evitar problemas posteriores
-        empty_df["Data"] = pd.to_datetime(empty_df["Data"])
-        for col in ["Cartão", "Dinheiro", "Pix", "Total", "Ano", "Mês", "DiaDoMes"]:
-             empty_df[col] = pd.to_numeric(empty_df[col])
-        return empty_df
-
-    df = df_input.copy()
-
-    # Garantir colunas numéricas e preencher NaNs
-    for col in ["Cartão", "Dinheiro", "Pix"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-        else:
-            df[col] = 0
-
-    df["Total"] = df["Cartão"] + df["Dinheiro"] + df["Pix"]
-
-    # Processamento robusto da coluna 'Data'
-    if "Data" in df.columns:
-        # Tenta converter para datetime, lidando com diferentes formatos possíveis
-        try:
-            # Tenta formato brasileiro primeiro
-            df['Data'] = pd.to_datetime(df['Data'], format='%d/%m/%Y', errors='coerce')
-            # Se muitos NaNs, tenta formato padrão
-            if df['Data'].isnull().sum() > len(df) / 2:
-                 original_data = df_input['Data'].copy()
-                 df['Data'] = pd.to_datetime(original_data, errors='coerce')
-        except Exception:
-             df['Data'] = pd.to_datetime(df['Data'], errors='coerce')
-
-        df.dropna(subset=["Data"], inplace=True) # Remove linhas onde a data não pôde ser convertida
-
-        if not df.empty:
-            df["Ano"] = df["Data"].dt.year
-            df["Mês"] = df["Data"].dt.month
-            df["MêsNome"] = df["Mês"].apply(lambda x: meses_ordem[int(x)-1] if pd.notna(x) and 1 <= int(x) <= 12 else "Inválido")
-            df["AnoMês"] = df["Data"].dt.strftime("%Y-%m")
-            df["DataFormatada"] = df["Data"].dt.strftime("%d/%m/%Y")
-            day_map = {0: "Segunda-feira", 1: "Terça-feira", 2: "Quarta-feira", 3: "Quinta-feira", 4: "Sexta-feira", 5: "Sábado", 6: "Domingo"}
-            df["DiaSemana"] = df["Data"].dt.dayofweek.map(day_map)
-            df["DiaDoMes"] = df["Data"].dt.day
-
-            # Define DiaSemana como categórico ordenado
-            df["DiaSemana"] = pd.Categorical(df["DiaSemana"], categories=[d for d in dias_semana_ordem if d in df["DiaSemana"].unique()], ordered=True)
-        else:
-            # Se o DataFrame ficou vazio após tratar datas, retorna estrutura vazia
-            return process_data(pd.DataFrame()) # Chama recursivamente com df vazio
-    else:
-        st.warning("Coluna 'Data' não encontrada. Análises temporais podem ser afetadas.")
-        # Adiciona colunas de data vazias se 'Data' não existir
-        for col in ["Ano", "Mês", "MêsNome", "AnoMês", "DataFormatada", "DiaSemana", "DiaDoMes"]:
-            df[col] = pd.NA
-        df["Data"] = pd.NaT
+# --- Espelho Local (Parquet) da Tabela de Vendas --- #
+@st.cache_resource
+def get_sales_mirror(_worksheet):
+    """Snapshot local dos dados processados, atualizado em segundo plano a partir da planilha."""
+    reader = get_sales_reader(_worksheet) if _worksheet else None
+    return EspelhoVendas.para_leitor(reader, SNAPSHOT_PATH, SNAPSHOT_REFRESH_SECONDS)
+
+@st.cache_resource
+def get_write_queue(_worksheet):
+    """Fila durável de vendas a enviar, descarregada em lotes (append_rows) por uma thread."""
+    return FilaEscrita.para_planilha(QUEUE_PATH, get_google_credentials(), WORKSHEET_NAME, get_sales_mirror(_worksheet))
 
-    return df
+def load_sales_snapshot(worksheet):
+    """Retorna (dados processados, data do snapshot) lendo do disco; só vai à planilha se não houver snapshot."""
+    try:
+        return get_sales_mirror(worksheet).ler_ou_carregar()
+    except Exception as e:
+        st.error(f"Erro ao ler dados da planilha: {e}")
+        return processar_vendas(pd.DataFrame()), None
 
 # --- Funções de Gráficos Interativos em Altair (com ajuste de altura) ---
 
@@ -429,7 +340,7 @@ def create_advanced_daily_sales_chart(df):
         return None
 
     df_melted = df_sorted.melt(
-        id_vars=["Data", "DataFormatada", "Total"],
+        id_vars=["Data", "Total"],
         value_vars=["Cartão", "Dinheiro", "Pix"],
         var_name="Método",
         value_name="Valor"
@@ -447,7 +358,7 @@ def create_advanced_daily_sales_chart(df):
         y=alt.Y("Valor:Q", title="Valor (R$)", stack="zero", axis=alt.Axis(labelFontSize=12)),
         color=alt.Color("Método:N", scale=alt.Scale(range=CORES_MODO_ESCURO[:3]), legend=alt.Legend(title="Método", orient="top")),
         tooltip=[
-            alt.Tooltip("DataFormatada:N", title="Data"),
+            alt.Tooltip("Data:T", title="Data", format="%d/%m/%Y"),
             alt.Tooltip("Método:N", title="Método"),
             alt.Tooltip("Valor:Q", title="Valor (R$)", format=",.2f")
         ]
@@ -463,23 +374,19 @@ def create_advanced_daily_sales_chart(df):
 # Nota: As funções de gráfico chamadas DENTRO destas podem precisar ter a altura ajustada se forem usadas no dashboard principal.
 # Por exemplo, create_radial_plot não está no dashboard principal, então não precisa de ajuste de altura aqui.
 
-# Função para formatar valores em moeda brasileira (sem alterações)
-def format_brl(value):
-    if value is None or not isinstance(value, (int, float)):
-        return "R$ 0,00"
-    return f"R$ {value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
-
 # --- Interface Principal Refatorada para Dashboard --- #
 def main():
     # --- Conexão Inicial --- #
-    gc = get_google_auth()
-    worksheet = get_worksheet(gc) if gc else None
-    df_raw = read_sales_data(worksheet) if worksheet else pd.DataFrame()
-    df_processed = process_data(df_raw)
+    worksheet = get_worksheet()
+    # Dados vêm do snapshot local; a planilha é sincronizada em segundo plano
+    df_processed, dados_de = load_sales_snapshot(worksheet)
+    fila = get_write_queue(worksheet)
 
     # --- Sidebar para Filtros e Registro --- #
     with st.sidebar:
         st.image(LOGO_URL, width=80)
+        if dados_de is not None:
+            st.caption(f"🕒 Dados de {dados_de.strftime('%d/%m/%Y %H:%M:%S')}")
         st.header("Filtros")
         st.markdown("---")
 
@@ -529,22 +436,28 @@ def main():
         pix_val = pix_input if pix_input is not None else 0.0
         total_venda_form = cartao_val + dinheiro_val + pix_val
 
-        st.markdown(f"**Total: {format_brl(total_venda_form)}**")
+        st.markdown(f"**Total: {format_currency(total_venda_form)}**")
 
         if st.button("✅ Registrar", type="primary", use_container_width=True):
             if total_venda_form > 0:
                 formatted_date = data_input.strftime("%d/%m/%Y")
-                if worksheet and add_data_to_sheet(formatted_date, cartao_val, dinheiro_val, pix_val, worksheet):
+                # A venda vai para a fila local; caches e snapshot são recarregados após o envio
+                if add_data_to_sheet(formatted_date, cartao_val, dinheiro_val, pix_val, fila):
                     st.success("Venda registrada!")
-                    # Limpar caches para forçar recarregamento
-                    read_sales_data.clear()
-                    process_data.clear()
-                    st.rerun() # Recarrega a página para mostrar dados atualizados
-                elif not worksheet:
-                    st.error("Falha ao conectar à planilha.")
+                    st.rerun() # Recarrega a página para mostrar o status do envio
             else:
                 st.warning("Valor total deve ser maior que zero.")
 
+        status_fila = fila.status()
+        if status_fila["pendentes"]:
+            mensagem = f"⏳ {status_fila['pendentes']} venda(s) aguardando envio."
+            if status_fila["ultimo_erro"] and status_fila["proxima_tentativa"]:
+                proxima = datetime.fromtimestamp(status_fila["proxima_tentativa"]).strftime("%H:%M:%S")
+                mensagem += f" Nova tentativa às {proxima}."
+            st.warning(mensagem)
+        else:
+            st.caption("✅ Todas as vendas enviadas à planilha.")
+
     # --- Aplicação dos Filtros --- #
     df_filtered = df_processed.copy()
     if not df_filtered.empty:
@@ -574,15 +487,15 @@ def main():
         total_vendas = df_filtered["Total"].sum()
         media_diaria = df_filtered["Total"].mean()
         melhor_dia_valor = df_filtered["Total"].max()
-        melhor_dia_data = df_filtered.loc[df_filtered["Total"].idxmax(), "DataFormatada"] if not df_filtered.empty and "DataFormatada" in df_filtered.columns else "N/A"
+        melhor_dia_data = df_filtered.loc[df_filtered["Total"].idxmax(), "Data"].strftime("%d/%m/%Y") if not df_filtered.empty and "Data" in df_filtered.columns else "N/A"
 
         kpi_cols = st.columns(3)
         with kpi_cols[0]:
-            st.metric(label="💰 Faturamento Total", value=format_brl(total_vendas))
+            st.metric(label="💰 Faturamento Total", value=format_currency(total_vendas))
         with kpi_cols[1]:
-            st.metric(label="📊 Média Diária", value=format_brl(media_diaria))
+            st.metric(label="📊 Média Diária", value=format_currency(media_diaria))
         with kpi_cols[2]:
-            st.metric(label=f"🏆 Melhor Dia ({melhor_dia_data})", value=format_brl(melhor_dia_valor))
+            st.metric(label=f"🏆 Melhor Dia ({melhor_dia_data})", value=format_currency(melhor_dia_valor))
 
         st.markdown("<hr style='margin: 1.5rem 0;'>", unsafe_allow_html=True)
 
@@ -603,7 +516,7 @@ def main():
                 st.markdown(f"""
                 <div class="payment-card" style="background: linear-gradient(135deg, #4c78a8, #5a8bb8);">
                     <h3>💳 Cartão</h3>
-                    <h2>{format_brl(cartao_total)}</h2>
+                    <h2>{format_currency(cartao_total)}</h2>
                     <p>{cartao_pct:.1f}%</p>
                 </div>
                 """, unsafe_allow_html=True)
@@ -611,7 +524,7 @@ def main():
                 st.markdown(f"""
                 <div class="payment-card" style="background: linear-gradient(135deg, #54a24b, #64b25b);">
                     <h3>💵 Dinheiro</h3>
-                    <h2>{format_brl(dinheiro_total)}</h2>
+                    <h2>{format_currency(dinheiro_total)}</h2>
                     <p>{dinheiro_pct:.1f}%</p>
                 </div>
                 """, unsafe_allow_html=True)
@@ -619,7 +532,7 @@ def main():
                 st.markdown(f"""
                 <div class="payment-card" style="background: linear-gradient(135deg, #f58518, #ff9528);">
                     <h3>📱 PIX</h3>
-                    <h2>{format_brl(pix_total)}</h2>
+                    <h2>{format_currency(pix_total)}</h2>
                     <p>{pix_pct:.1f}%</p>
                 </div>
                 """, unsafe_allow_html=True)
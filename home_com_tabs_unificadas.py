@@ -3,7 +3,6 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 from datetime import datetime
-import random
 import os
 import numpy as np
 from reportlab.lib.pagesizes import letter, A4
@@ -16,6 +15,9 @@ from io import BytesIO
 import matplotlib.pyplot as plt
 import io
 import base64
+from clips_core.tabela_alcancaveis import carregar_tabela, consultar_tabela
+from clips_core.menu_solver import CARDAPIOS, busca_local, calculate_combination_value, genetic_algorithm
+from clips_core.financeiro import estimar_custos, format_currency
 
 # --- CONSTANTES E CONFIGURAÇÕES ---
 CONFIG = {
@@ -23,41 +25,8 @@ CONFIG = {
     "layout": "wide",
     "sidebar_state": "expanded",
     "excel_file": "recebimentos.xlsx",
-    "logo_path": "logo.png"
-}
-
-CARDAPIOS = {
-    "sanduiches": {
-        "X Salada Simples": 18.00,
-        "X Salada Especial": 20.00,
-        "X Bacon Simples": 22.00,
-        "X Bacon Especial": 24.00,
-        "X Hamburgão": 35.00,
-        "X Mata-Fome": 39.00,
-        "X Frango Simples": 22.00,
-        "X Frango Especial": 24.00,
-        "X Frango Bacon": 27.00,
-        "X Frango Tudo": 30.00,
-        "X Lombo Simples": 23.00,
-        "X Lombo Especial": 26.00,
-        "X Lombo Bacon": 28.00,
-        "X Lombo Tudo": 31.00,
-        "X Filé Simples": 28.00,
-        "X Filé Especial": 30.00,
-        "X Filé Bacon": 33.00,
-        "X Filé Tudo": 36.00
-    },
-    "bebidas": {
-        "Suco": 10.00,
-        "Creme": 15.00,
-        "Refri caçula": 3.50,
-        "Refri Lata": 7.00,
-        "Refri 600": 8.00,
-        "Refri 1L": 10.00,
-        "Refri 2L": 15.00,
-        "Água": 3.00,
-        "Água com Gas": 4.00
-    }
+    "logo_path": "logo.png",
+    "teto_tabela": 50000.00
 }
 
 FORMAS_PAGAMENTO = {
@@ -72,12 +41,6 @@ FORMAS_PAGAMENTO = {
 }
 
 # --- FUNÇÕES UTILITÁRIAS ---
-def format_currency(value):
-    """Formata um valor como moeda brasileira."""
-    if pd.isna(value) or value is None:
-        return "R$ -"
-    return f"R$ {float(value):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
 def init_data_file():
     """Inicializa o arquivo de dados se não existir."""
     if not os.path.exists(CONFIG["excel_file"]):
@@ -106,151 +69,10 @@ def save_data(df):
     except Exception as e:
         st.error(f"Erro ao salvar dados: {e}")
 
-def round_to_50_or_00(value):
-    """Arredonda para o múltiplo de 0.50 mais próximo."""
-    return round(value * 2) / 2
-
-def calculate_combination_value(combination, item_prices):
-    """Calcula o valor total de uma combinação."""
-    return sum(item_prices.get(name, 0) * quantity for name, quantity in combination.items())
-
-# --- FUNÇÕES PARA ALGORITMO GENÉTICO ---
-def create_individual(item_prices, combination_size):
-    """Cria um indivíduo (combinação) aleatório para o algoritmo genético."""
-    if not item_prices:
-        return {}
-    
-    items = list(item_prices.keys())
-    # Garante que não tentaremos selecionar mais itens do que existem
-    size = min(combination_size, len(items))
-    
-    # Seleciona exatamente 'size' itens (sem repetição)
-    selected_items = random.sample(items, size)
-    
-    return {
-        name: round_to_50_or_00(random.uniform(1, 100))
-        for name in selected_items 
-    }
-
-def evaluate_fitness(individual, item_prices, target_value):
-    """Avalia a adequação de um indivíduo ao valor alvo."""
-    total = calculate_combination_value(individual, item_prices)
-    # Penalidade maior se exceder o valor alvo
-    if total > target_value:
-        return 1000 + abs(total - target_value)
-    return abs(target_value - total)
-
-def crossover(parent1, parent2):
-    """Realiza o cruzamento entre dois pais para criar um filho."""
-    # Cria um conjunto com todas as chaves dos dois pais
-    all_keys = set(list(parent1.keys()) + list(parent2.keys()))
-    child = {}
-    
-    for key in all_keys:
-        if key in parent1 and key in parent2:
-            # Se a chave existe em ambos os pais, escolhe um valor ou a média
-            if random.random() < 0.5:
-                child[key] = parent1[key]
-            else:
-                child[key] = parent2[key]
-        elif key in parent1:
-            # Se existe apenas no primeiro pai, 50% de chance de incluir
-            if random.random() < 0.5:
-                child[key] = parent1[key]
-        elif key in parent2:
-            # Se existe apenas no segundo pai, 50% de chance de incluir
-            if random.random() < 0.5:
-                child[key] = parent2[key]
-    
-    return child
-
-def mutate(individual, item_prices, mutation_rate=0.2, max_items=5):
-    """Aplica mutação a um indivíduo, respeitando o número máximo de itens."""
-    new_individual = individual.copy()
-    
-    # Possivelmente adicionar um novo item (só se ainda não atingiu o máximo)
-    if (random.random() < mutation_rate and 
-        len(new_individual) < max_items and 
-        len(new_individual) < len(item_prices)):
-        
-        possible_new_items = [item for item in item_prices.keys() if item not in new_individual]
-        if possible_new_items:
-            new_item = random.choice(possible_new_items)
-            new_individual[new_item] = round_to_50_or_00(random.uniform(1, 100))
-    
-    # Possivelmente remover um item existente (só se tiver mais de 1 item)
-    if random.random() < mutation_rate and len(new_individual) > 1:
-        item_to_remove = random.choice(list(new_individual.keys()))
-        del new_individual[item_to_remove]
-    
-    # Modificar quantidades existentes
-    for key in list(new_individual.keys()):
-        if random.random() < mutation_rate:
-            change = random.choice([-1.0, -0.5, 0.5, 1.0])
-            new_value = max(0.5, round_to_50_or_00(new_individual[key] + change))
-            new_individual[key] = new_value
-    
-    return new_individual
-
-def genetic_algorithm(item_prices, target_value, population_size=50, generations=100, 
-                    combination_size=5, elite_size=5, tournament_size=3):
-    """
-    Implementa um algoritmo genético para encontrar combinações de produtos
-    que se aproximem de um valor alvo.
-    """
-    if not item_prices or target_value <= 0:
-        return {}
-    
-    # Inicializa a população
-    population = [create_individual(item_prices, combination_size) for _ in range(population_size)]
-    
-    best_individual = {}
-    best_fitness = float('inf')
-    
-    for generation in range(generations):
-        # Avalia a população
-        fitness_scores = [(individual, evaluate_fitness(individual, item_prices, target_value)) 
-                         for individual in population]
-        
-        # Ordena por fitness (menor é melhor)
-        fitness_scores.sort(key=lambda x: x[1])
-        
-        # Atualiza o melhor indivíduo se encontrarmos um melhor
-        if fitness_scores[0][1] < best_fitness:
-            best_individual = fitness_scores[0][0].copy()
-            best_fitness = fitness_scores[0][1]
-        
-        # Se encontramos uma combinação perfeita ou muito próxima, terminamos
-        if best_fitness < 0.01:
-            break
-        
-        # Seleciona a elite para a próxima geração
-        next_generation = [ind[0].copy() for ind in fitness_scores[:elite_size]]
-        
-        # Completa a próxima geração com novos indivíduos
-        while len(next_generation) < population_size:
-            # Seleção de torneio
-            tournament = random.sample(fitness_scores, tournament_size)
-            tournament.sort(key=lambda x: x[1])
-            parent1 = tournament[0][0]
-            
-            tournament = random.sample(fitness_scores, tournament_size)
-            tournament.sort(key=lambda x: x[1])
-            parent2 = tournament[0][0]
-            
-            # Cruzamento
-            child = crossover(parent1, parent2)
-            
-            # Mutação (passando o combination_size como max_items)
-            child = mutate(child, item_prices, max_items=combination_size)
-            
-            next_generation.append(child)
-        
-        # Atualiza a população
-        population = next_generation
-    
-    # Retorna combinação com valores arredondados
-    return {k: round(v) for k, v in best_individual.items() if round(v) > 0}
+@st.cache_resource
+def carregar_tabelas_cardapio(teto):
+    """Abre (ou constrói na primeira execução) a tabela de valores alcançáveis de cada categoria."""
+    return {categoria: carregar_tabela(precos, teto) for categoria, precos in CARDAPIOS.items()}
 
 # --- FUNÇÕES PARA GERAR PDF ---
 def create_watermark(canvas, logo_path, width=400, height=400, opacity=0.1):
@@ -532,7 +354,7 @@ with st.sidebar:
     st.info("Lembre-se: As combinações são aproximações heurísticas.")
 
 # --- ABAS PRINCIPAIS ---
-tab1, tab2, tab3 = st.tabs(["📈 Resumo das Vendas", "🧩 Detalhes das Combinações", "💰 Cadastro de Recebimentos", "📊 Painel de Vendas (Google Sheets)"])
+tab1, tab2, tab3, tab4 = st.tabs(["📈 Resumo das Vendas", "🧩 Detalhes das Combinações", "💰 Cadastro de Recebimentos", "📊 Painel de Vendas (Google Sheets)"])
 
 with tab1:
     # Seção de upload de arquivo
@@ -612,24 +434,19 @@ with tab1:
             # Seção de Resultados
             st.header("💰 Resultados Financeiros")
             
+            custos = estimar_custos(total_vendas, salario_minimo, custo_contadora)
+            imposto_simples, custo_funcionario = custos['imposto_simples'], custos['custo_funcionario']
+            total_custos, lucro_estimado = custos['total_custos'], custos['lucro_estimado']
+
             # Métricas Principais
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric("Faturamento Bruto", format_currency(total_vendas))
             with col2:
-                imposto_simples = total_vendas * 0.06
                 st.metric("Imposto Simples (6%)", format_currency(imposto_simples))
             with col3:
-                fgts = salario_minimo * 0.08
-                ferias = (salario_minimo / 12) * (4/3)
-                decimo_terceiro = salario_minimo / 12
-                custo_funcionario = salario_minimo + fgts + ferias + decimo_terceiro
                 st.metric("Custo Funcionário CLT", format_currency(custo_funcionario))
             
-            # Cálculo do Total de Custos
-            total_custos = imposto_simples + custo_funcionario + custo_contadora
-            lucro_estimado = total_vendas - total_custos
-            
             col1, col2 = st.columns(2)
             with col1:
                 st.metric("Total de Custos", format_currency(total_custos))
@@ -737,6 +554,7 @@ with tab2:
             st.info(f"Valor para Bebidas: {format_currency(valor_bebidas)} ({drink_percentage}%)")
         
         # Encontrar combinações
+        tabelas = carregar_tabelas_cardapio(CONFIG["teto_tabela"])
         with st.spinner("Calculando possíveis combinações..."):
             if algoritmo == "Algoritmo Genético":
                 combinacao_sanduiches = genetic_algorithm(
@@ -744,7 +562,8 @@ with tab2:
                     valor_sanduiches,
                     population_size=population_size,
                     generations=generations,
-                    combination_size=tamanho_combinacao_sanduiches
+                    combination_size=tamanho_combinacao_sanduiches,
+                    tabela=tabelas["sanduiches"]
                 )
                 
                 combinacao_bebidas = genetic_algorithm(
@@ -752,52 +571,28 @@ with tab2:
                     valor_bebidas,
                     population_size=population_size,
                     generations=generations,
-                    combination_size=tamanho_combinacao_bebidas
+                    combination_size=tamanho_combinacao_bebidas,
+                    tabela=tabelas["bebidas"]
                 )
             else:  # Busca Local
-                best_sanduiches = {}
-                best_diff_sanduiches = float('inf')
-                
-                for _ in range(max_iterations):
-                    candidate = create_individual(CARDAPIOS["sanduiches"], tamanho_combinacao_sanduiches)
-                    candidate = mutate(candidate, CARDAPIOS["sanduiches"], mutation_rate=0.3, max_items=tamanho_combinacao_sanduiches)
-                    
-                    diff = evaluate_fitness(candidate, CARDAPIOS["sanduiches"], valor_sanduiches)
-                    if diff < best_diff_sanduiches:
-                        best_sanduiches = candidate
-                        best_diff_sanduiches = diff
-                
-                combinacao_sanduiches = {k: round(v) for k, v in best_sanduiches.items() if round(v) > 0}
-                
-                # Implementação da busca local para sanduíches
-                best_sanduiches = {}
-                best_diff_sanduiches = float('inf')
-                
-                for _ in range(max_iterations):
-                    candidate = create_individual(CARDAPIOS["sanduiches"], tamanho_combinacao_sanduiches)
-                    candidate = mutate(candidate, CARDAPIOS["sanduiches"], mutation_rate=0.3)
-                    
-                    diff = evaluate_fitness(candidate, CARDAPIOS["sanduiches"], valor_sanduiches)
-                    if diff < best_diff_sanduiches:
-                        best_sanduiches = candidate
-                        best_diff_sanduiches = diff
-                
-                combinacao_sanduiches = {k: round(v) for k, v in best_sanduiches.items() if round(v) > 0}
+                # Consulta a tabela de valores alcançáveis; a busca local só roda fora dela
+                combinacao_sanduiches = consultar_tabela(
+                    tabelas["sanduiches"], valor_sanduiches, tamanho_combinacao_sanduiches
+                )
                 
-                # Implementação da busca local para bebidas
-                best_bebidas = {}
-                best_diff_bebidas = float('inf')
+                if combinacao_sanduiches is None:
+                    combinacao_sanduiches = busca_local(
+                        CARDAPIOS["sanduiches"], valor_sanduiches, max_iterations, tamanho_combinacao_sanduiches
+                    )
                 
-                for _ in range(max_iterations):
-                    candidate = create_individual(CARDAPIOS["bebidas"], tamanho_combinacao_bebidas)
-                    candidate = mutate(candidate, CARDAPIOS["bebidas"], mutation_rate=0.3)
-                    
-                    diff = evaluate_fitness(candidate, CARDAPIOS["bebidas"], valor_bebidas)
-                    if diff < best_diff_bebidas:
-                        best_bebidas = candidate
-                        best_diff_bebidas = diff
+                combinacao_bebidas = consultar_tabela(
+                    tabelas["bebidas"], valor_bebidas, tamanho_combinacao_bebidas
+                )
                 
-                combinacao_bebidas = {k: round(v) for k, v in best_bebidas.items() if round(v) > 0}
+                if combinacao_bebidas is None:
+                    combinacao_bebidas = busca_local(
+                        CARDAPIOS["bebidas"], valor_bebidas, max_iterations, tamanho_combinacao_bebidas
+                    )
         
         # Calcular valores reais
         valor_real_sanduiches = calculate_combination_value(combinacao_sanduiches, CARDAPIOS["sanduiches"])
@@ -883,205 +678,7 @@ with tab2:
         st.info("Faça o upload de dados na aba 'Resumo das Vendas' para visualizar possíveis combinações.")
 
 with tab3:
-    
-
-with tab4:
-    import streamlit as st
-    import gspread
-    import pandas as pd
-    import altair as alt
-    from datetime import datetime
-    from google.oauth2.service_account import Credentials
-    from gspread.exceptions import SpreadsheetNotFound
-
-    # Configuração da página
-
-    def read_google_sheet():
-        """Função para ler os dados da planilha Google Sheets"""
-        try:
-            SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 
-                     'https://www.googleapis.com/auth/spreadsheets.readonly', 
-                     'https://www.googleapis.com/auth/drive.readonly']
-            credentials_dict = st.secrets["google_credentials"]
-            creds = Credentials.from_service_account_info(credentials_dict, scopes=SCOPES)
-            gc = gspread.authorize(creds)
-            spreadsheet_id = '1NTScbiIna-iE7roQ9XBdjUOssRihTFFby4INAAQNXTg'
-            worksheet_name = 'Vendas'
-            try:
-                spreadsheet = gc.open_by_key(spreadsheet_id)
-                worksheet = spreadsheet.worksheet(worksheet_name)
-                rows = worksheet.get_all_records()
-                df = pd.DataFrame(rows)
-                return df, worksheet
-            except SpreadsheetNotFound:
-                st.error(f"Planilha com ID {spreadsheet_id} não encontrada.")
-                return pd.DataFrame(), None
-        except Exception as e:
-            st.error(f"Erro de autenticação: {e}")
-            return pd.DataFrame(), None
-
-    def add_data_to_sheet(date, cartao, dinheiro, pix, worksheet):
-        """Função para adicionar dados à planilha Google Sheets"""
-        if worksheet is None:
-            st.error("Não foi possível acessar a planilha.")
-            return
-        try:
-            new_row = [date, float(cartao), float(dinheiro), float(pix)]
-            worksheet.append_row(new_row)
-            st.success("Dados registrados com sucesso!")
-        except Exception as e:
-            st.error(f"Erro ao adicionar dados: {e}")
-
-    def process_data(df):
-        """Função para processar e preparar os dados"""
-        if not df.empty:
-            for col in ['Cartão', 'Dinheiro', 'Pix']:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            df['Total'] = df['Cartão'].fillna(0) + df['Dinheiro'].fillna(0) + df['Pix'].fillna(0)
-            if 'Data' in df.columns:
-                try:
-                    df['Data'] = pd.to_datetime(df['Data'], format='%d/%m/%Y', errors='coerce')
-                    df['Ano'] = df['Data'].dt.year
-                    df['Mês'] = df['Data'].dt.month
-                    df['MêsNome'] = df['Data'].dt.strftime('%B')
-                    df['AnoMês'] = df['Data'].dt.strftime('%Y-%m')
-                    df['DataFormatada'] = df['Data'].dt.strftime('%d/%m/%Y')
-                except ValueError:
-                    st.warning("Formato de data inconsistente na planilha.")
-                except Exception as e:
-                    st.error(f"Erro ao processar a coluna 'Data': {e}")
-        return df
-
-    def main():
-        st.title("📊 Sistema de Registro de Vendas")
-        tab1, tab3 = st.tabs(["Registrar Venda", "Análise Detalhada"])
-
-        with tab1:
-            st.header("Registrar Nova Venda")
-            with st.form("venda_form"):
-                data = st.date_input("Data", datetime.now())
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    cartao = st.number_input("Cartão (R$)", min_value=0.0, format="%.2f")
-                with col2:
-                    dinheiro = st.number_input("Dinheiro (R$)", min_value=0.0, format="%.2f")
-                with col3:
-                    pix = st.number_input("PIX (R$)", min_value=0.0, format="%.2f")
-                total = cartao + dinheiro + pix
-                st.markdown(f"**Total da venda: R$ {total:.2f}**")
-                submitted = st.form_submit_button("Registrar Venda")
-                if submitted:
-                    if cartao > 0 or dinheiro > 0 or pix > 0:
-                        formatted_date = data.strftime('%d/%m/%Y')
-                        _, worksheet = read_google_sheet()
-                        if worksheet:
-                            add_data_to_sheet(formatted_date, cartao, dinheiro, pix, worksheet)
-                    else:
-                        st.warning("Pelo menos um valor de venda deve ser maior que zero.")
-
-        with tab3:
-            st.header("Análise Detalhada de Vendas")
-
-            # Filtros na sidebar
-            with st.sidebar:
-                st.header("🔍 Filtros")
-
-                with st.spinner("Carregando dados..."):
-                    df_raw, _ = read_google_sheet()
-                    df = process_data(df_raw.copy()) if not df_raw.empty else pd.DataFrame()
-
-                    if not df.empty and 'Data' in df.columns:
-                        # Filtro de Ano
-                        anos = sorted(df['Ano'].unique())
-                        selected_anos = st.multiselect(
-                            "Selecione o(s) Ano(s):",
-                            options=anos,
-                            default=anos
-                        )
-
-                        # Filtro de Mês
-                        meses_disponiveis = sorted(df[df['Ano'].isin(selected_anos)]['Mês'].unique()) if selected_anos else []
-                        meses_nomes = {m: datetime(2020, m, 1).strftime('%B') for m in meses_disponiveis}
-                        meses_opcoes = [f"{m} - {meses_nomes[m]}" for m in meses_disponiveis]
-                        selected_meses_str = st.multiselect(
-                            "Selecione o(s) Mês(es):",
-                            options=meses_opcoes,
-                            default=meses_opcoes
-                        )
-                        selected_meses = [int(m.split(" - ")[0]) for m in selected_meses_str]
-
-            # Conteúdo principal da análise
-            if not df_raw.empty:
-                if 'Data' in df.columns and pd.api.types.is_datetime64_any_dtype(df['Data']):
-                    # Aplicar filtros
-                    df_filtered = df[df['Ano'].isin(selected_anos)] if selected_anos else df
-                    df_filtered = df_filtered[df_filtered['Mês'].isin(selected_meses)] if selected_meses else df_filtered
-
-                    st.subheader("Dados Filtrados")
-                    st.dataframe(df_filtered[['DataFormatada', 'Cartão', 'Dinheiro', 'Pix', 'Total']]
-                                 if 'DataFormatada' in df_filtered.columns else df_filtered, 
-                                 use_container_width=True,
-                                 height=300)
-
-                    # Gráficos
-                    st.subheader("Distribuição por Método de Pagamento")
-                    payment_filtered = pd.DataFrame({
-                        'Método': ['Cartão', 'Dinheiro', 'PIX'],
-                        'Valor': [df_filtered['Cartão'].sum(), df_filtered['Dinheiro'].sum(), df_filtered['Pix'].sum()]
-                    })
-
-                    pie_chart = alt.Chart(payment_filtered).mark_arc(innerRadius=50).encode(
-                        theta=alt.Theta("Valor:Q", stack=True),
-                        color=alt.Color("Método:N", legend=alt.Legend(title="Método")),
-                        tooltip=["Método", "Valor"]
-                    ).properties(
-                        width=700,
-                        height=500
-                    )
-                    text = pie_chart.mark_text(radius=120, size=16).encode(text="Valor:Q")
-                    st.altair_chart(pie_chart + text, use_container_width=True)
-
-                    st.subheader("Vendas Diárias por Método de Pagamento")
-                    date_column = 'DataFormatada' if 'DataFormatada' in df_filtered.columns else 'Data'
-                    daily_data = df_filtered.melt(id_vars=[date_column], 
-                                                value_vars=['Cartão', 'Dinheiro', 'Pix'],
-                                                var_name='Método', 
-                                                value_name='Valor')
-
-                    bar_chart = alt.Chart(daily_data).mark_bar(size=30).encode(
-                        x=alt.X(f'{date_column}:N', title='Data', axis=alt.Axis(labelAngle=-45)),
-                        y=alt.Y('Valor:Q', title='Valor (R$)'),
-                        color=alt.Color('Método:N', legend=alt.Legend(title="Método")),
-                        tooltip=[date_column, 'Método', 'Valor']
-                    ).properties(
-                        width=700,
-                        height=500
-                    )
-                    st.altair_chart(bar_chart, use_container_width=True)
-
-                    st.subheader("Acúmulo de Capital ao Longo do Tempo")
-                    df_accumulated = df_filtered.sort_values('Data').copy()
-                    df_accumulated['Total Acumulado'] = df_accumulated['Total'].cumsum()
-
-                    line_chart = alt.Chart(df_accumulated).mark_line(point=True, strokeWidth=3).encode(
-                        x=alt.X('Data:T', title='Data'),
-                        y=alt.Y('Total Acumulado:Q', title='Capital Acumulado (R$)'),
-                        tooltip=['DataFormatada', 'Total Acumulado']
-                    ).properties(
-                        width=700,
-                        height=500
-                    )
-                    st.altair_chart(line_chart, use_container_width=True)
-
-                else:
-                    st.info("Não há dados de data para análise.")
-            else:
-                st.info("Não há dados para exibir.")
-
-    if __name__ == "__main__":
-        main()
-st.header("💰 Cadastro e Análise de Recebimentos")
+    st.header("💰 Cadastro e Análise de Recebimentos")
     
     # Seção 1: Formulário para adicionar novos dados
     with st.expander("➕ Adicionar Novo Registro", expanded=True):
@@ -1303,6 +900,199 @@ st.header("💰 Cadastro e Análise de Recebimentos")
     else:
         st.info("Nenhum dado cadastrado ainda. Adicione seu primeiro registro acima.")
 
+
+with tab4:
+    import streamlit as st
+    import gspread
+    import pandas as pd
+    import altair as alt
+    from datetime import datetime
+    from gspread.exceptions import SpreadsheetNotFound
+    from clips_core.sheets_client import SPREADSHEET_ID, get_worksheet, limpar_cache
+
+    # Configuração da página
+
+    def read_google_sheet():
+        """Função para ler os dados da planilha Google Sheets"""
+        try:
+            credentials_dict = st.secrets["google_credentials"]
+            worksheet_name = 'Vendas'
+            try:
+                # Cliente e handles compartilhados: autenticação e open_by_key uma vez por processo
+                worksheet = get_worksheet(credentials_dict, worksheet_name)
+                rows = worksheet.get_all_records()
+                df = pd.DataFrame(rows)
+                return df, worksheet
+            except SpreadsheetNotFound:
+                limpar_cache()
+                st.error(f"Planilha com ID {SPREADSHEET_ID} não encontrada.")
+                return pd.DataFrame(), None
+        except Exception as e:
+            limpar_cache()
+            st.error(f"Erro de autenticação: {e}")
+            return pd.DataFrame(), None
+
+    def add_data_to_sheet(date, cartao, dinheiro, pix, worksheet):
+        """Função para adicionar dados à planilha Google Sheets"""
+        if worksheet is None:
+            st.error("Não foi possível acessar a planilha.")
+            return
+        try:
+            new_row = [date, float(cartao), float(dinheiro), float(pix)]
+            worksheet.append_row(new_row)
+            st.success("Dados registrados com sucesso!")
+        except Exception as e:
+            st.error(f"Erro ao adicionar dados: {e}")
+
+    def process_data(df):
+        """Função para processar e preparar os dados"""
+        if not df.empty:
+            for col in ['Cartão', 'Dinheiro', 'Pix']:
+                if col in df.columns:
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+            df['Total'] = df['Cartão'].fillna(0) + df['Dinheiro'].fillna(0) + df['Pix'].fillna(0)
+            if 'Data' in df.columns:
+                try:
+                    df['Data'] = pd.to_datetime(df['Data'], format='%d/%m/%Y', errors='coerce')
+                    df['Ano'] = df['Data'].dt.year
+                    df['Mês'] = df['Data'].dt.month
+                    df['MêsNome'] = df['Data'].dt.strftime('%B')
+                    df['AnoMês'] = df['Data'].dt.strftime('%Y-%m')
+                    df['DataFormatada'] = df['Data'].dt.strftime('%d/%m/%Y')
+                except ValueError:
+                    st.warning("Formato de data inconsistente na planilha.")
+                except Exception as e:
+                    st.error(f"Erro ao processar a coluna 'Data': {e}")
+        return df
+
+    def main():
+        st.title("📊 Sistema de Registro de Vendas")
+        tab1, tab3 = st.tabs(["Registrar Venda", "Análise Detalhada"])
+
+        with tab1:
+            st.header("Registrar Nova Venda")
+            with st.form("venda_form"):
+                data = st.date_input("Data", datetime.now())
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    cartao = st.number_input("Cartão (R$)", min_value=0.0, format="%.2f")
+                with col2:
+                    dinheiro = st.number_input("Dinheiro (R$)", min_value=0.0, format="%.2f")
+                with col3:
+                    pix = st.number_input("PIX (R$)", min_value=0.0, format="%.2f")
+                total = cartao + dinheiro + pix
+                st.markdown(f"**Total da venda: R$ {total:.2f}**")
+                submitted = st.form_submit_button("Registrar Venda")
+                if submitted:
+                    if cartao > 0 or dinheiro > 0 or pix > 0:
+                        formatted_date = data.strftime('%d/%m/%Y')
+                        _, worksheet = read_google_sheet()
+                        if worksheet:
+                            add_data_to_sheet(formatted_date, cartao, dinheiro, pix, worksheet)
+                    else:
+                        st.warning("Pelo menos um valor de venda deve ser maior que zero.")
+
+        with tab3:
+            st.header("Análise Detalhada de Vendas")
+
+            # Filtros na sidebar
+            with st.sidebar:
+                st.header("🔍 Filtros")
+
+                with st.spinner("Carregando dados..."):
+                    df_raw, _ = read_google_sheet()
+                    df = process_data(df_raw.copy()) if not df_raw.empty else pd.DataFrame()
+
+                    if not df.empty and 'Data' in df.columns:
+                        # Filtro de Ano
+                        anos = sorted(df['Ano'].unique())
+                        selected_anos = st.multiselect(
+                            "Selecione o(s) Ano(s):",
+                            options=anos,
+                            default=anos
+                        )
+
+                        # Filtro de Mês
+                        meses_disponiveis = sorted(df[df['Ano'].isin(selected_anos)]['Mês'].unique()) if selected_anos else []
+                        meses_nomes = {m: datetime(2020, m, 1).strftime('%B') for m in meses_disponiveis}
+                        meses_opcoes = [f"{m} - {meses_nomes[m]}" for m in meses_disponiveis]
+                        selected_meses_str = st.multiselect(
+                            "Selecione o(s) Mês(es):",
+                            options=meses_opcoes,
+                            default=meses_opcoes
+                        )
+                        selected_meses = [int(m.split(" - ")[0]) for m in selected_meses_str]
+
+            # Conteúdo principal da análise
+            if not df_raw.empty:
+                if 'Data' in df.columns and pd.api.types.is_datetime64_any_dtype(df['Data']):
+                    # Aplicar filtros
+                    df_filtered = df[df['Ano'].isin(selected_anos)] if selected_anos else df
+                    df_filtered = df_filtered[df_filtered['Mês'].isin(selected_meses)] if selected_meses else df_filtered
+
+                    st.subheader("Dados Filtrados")
+                    st.dataframe(df_filtered[['DataFormatada', 'Cartão', 'Dinheiro', 'Pix', 'Total']]
+                                 if 'DataFormatada' in df_filtered.columns else df_filtered, 
+                                 use_container_width=True,
+                                 height=300)
+
+                    # Gráficos
+                    st.subheader("Distribuição por Método de Pagamento")
+                    payment_filtered = pd.DataFrame({
+                        'Método': ['Cartão', 'Dinheiro', 'PIX'],
+                        'Valor': [df_filtered['Cartão'].sum(), df_filtered['Dinheiro'].sum(), df_filtered['Pix'].sum()]
+                    })
+
+                    pie_chart = alt.Chart(payment_filtered).mark_arc(innerRadius=50).encode(
+                        theta=alt.Theta("Valor:Q", stack=True),
+                        color=alt.Color("Método:N", legend=alt.Legend(title="Método")),
+                        tooltip=["Método", "Valor"]
+                    ).properties(
+                        width=700,
+                        height=500
+                    )
+                    text = pie_chart.mark_text(radius=120, size=16).encode(text="Valor:Q")
+                    st.altair_chart(pie_chart + text, use_container_width=True)
+
+                    st.subheader("Vendas Diárias por Método de Pagamento")
+                    date_column = 'DataFormatada' if 'DataFormatada' in df_filtered.columns else 'Data'
+                    daily_data = df_filtered.melt(id_vars=[date_column], 
+                                                value_vars=['Cartão', 'Dinheiro', 'Pix'],
+                                                var_name='Método', 
+                                                value_name='Valor')
+
+                    bar_chart = alt.Chart(daily_data).mark_bar(size=30).encode(
+                        x=alt.X(f'{date_column}:N', title='Data', axis=alt.Axis(labelAngle=-45)),
+                        y=alt.Y('Valor:Q', title='Valor (R$)'),
+                        color=alt.Color('Método:N', legend=alt.Legend(title="Método")),
+                        tooltip=[date_column, 'Método', 'Valor']
+                    ).properties(
+                        width=700,
+                        height=500
+                    )
+                    st.altair_chart(bar_chart, use_container_width=True)
+
+                    st.subheader("Acúmulo de Capital ao Longo do Tempo")
+                    df_accumulated = df_filtered.sort_values('Data').copy()
+                    df_accumulated['Total Acumulado'] = df_accumulated['Total'].cumsum()
+
+                    line_chart = alt.Chart(df_accumulated).mark_line(point=True, strokeWidth=3).encode(
+                        x=alt.X('Data:T', title='Data'),
+                        y=alt.Y('Total Acumulado:Q', title='Capital Acumulado (R$)'),
+                        tooltip=['DataFormatada', 'Total Acumulado']
+                    ).properties(
+                        width=700,
+                        height=500
+                    )
+                    st.altair_chart(line_chart, use_container_width=True)
+
+                else:
+                    st.info("Não há dados de data para análise.")
+            else:
+                st.info("Não há dados para exibir.")
+
+    if __name__ == "__main__":
+        main()
 # Adicionar rodapé
 st.divider()
 st.markdown(
@@ -0,0 +1,60 @@
+"""
+Testes da fila de escrita (clips_core.fila_escrita) com um envio em memória.
+"""
+import sqlite3
+import time
+from contextlib import closing
+
+from clips_core.fila_escrita import FilaEscrita
+
+def contar(caminho):
+    with closing(sqlite3.connect(caminho)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM fila").fetchone()[0]
+
+def test_descarrega_em_lotes_na_ordem(tmp_path):
+    enviados = []
+    fila = FilaEscrita(str(tmp_path / "fila.db"), "Vendas", enviados.append, tamanho_lote=2)
+    for i in range(5):
+        fila.enfileirar([i])
+    assert fila.descarregar()
+    assert enviados == [[[0], [1]], [[2], [3]], [[4]]]
+    assert fila.status()["pendentes"] == 0
+
+def test_falha_mantem_pendentes_e_agenda_nova_tentativa(tmp_path):
+    def enviar(linhas):
+        raise ConnectionError("quota")
+    fila = FilaEscrita(str(tmp_path / "fila.db"), "Vendas", enviar)
+    fila.enfileirar(["x"])
+    assert not fila.descarregar()
+    status = fila.status()
+    assert status["pendentes"] == 1 and status["ultimo_erro"] == "quota"
+    assert status["proxima_tentativa"] > time.time()
+
+def test_enviados_antigos_sao_apagados_apos_descarga(tmp_path):
+    caminho = str(tmp_path / "fila.db")
+    fila = FilaEscrita(caminho, "Vendas", lambda linhas: None, retencao_enviados=3600)
+    fila.enfileirar(["antigo"])
+    fila.descarregar()
+    # Envelhece o registro enviado para além da retenção
+    with closing(sqlite3.connect(caminho)) as conn, conn:
+        conn.execute("UPDATE fila SET enviado_em = enviado_em - 7200")
+
+    fila.enfileirar(["novo"])
+    fila.descarregar()
+    assert contar(caminho) == 1
+    assert fila.status() == {"pendentes": 0, "enviados": 1, "ultimo_erro": None, "proxima_tentativa": None}
+
+def test_pendentes_nunca_sao_apagados(tmp_path):
+    caminho = str(tmp_path / "fila.db")
+    falhar = [True]
+    def enviar(linhas):
+        if falhar[0]:
+            raise ConnectionError("rede")
+    fila = FilaEscrita(caminho, "Vendas", enviar, retencao_enviados=0)
+    fila.enfileirar(["pendente"])
+    fila.descarregar()
+    assert contar(caminho) == 1
+    falhar[0] = False
+    fila.backoff = 0
+    assert fila.descarregar()
+    assert fila.status()["enviados"] <= 1 and fila.status()["pendentes"] == 0
@@ -0,0 +1,79 @@
+"""
+Testes de propriedade do decodificador e do formatador de reais (clips_core.moeda).
+
+Os valores são sorteados com semente fixa; cada texto gerado tem o valor
+esperado conhecido, então a conferência é exata, ao centavo.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from clips_core.moeda import decodificar_centavos, decodificar_reais, formatar_reais
+
+SEMENTE = 2024
+
+def brl(centavos):
+    """Texto pt-BR sem sinal: 123456 -> "1.234,56"."""
+    inteiro, fracao = divmod(abs(int(centavos)), 100)
+    return f"{inteiro:,}".replace(',', '.') + f",{fracao:02d}"
+
+NEGATIVOS = [
+    "-{}", "({})", "R$ -{}", "R$ ({})", "-R$ {}", "(R$ {})", "R$-{}", "R$\xa0({})", " ( {} ) ",
+]
+POSITIVOS = ["{}", "R$ {}", "R${}", "R$\xa0{}", "  {}  "]
+
+@pytest.fixture(scope="module")
+def centavos():
+    rng = np.random.default_rng(SEMENTE)
+    # Mistura valores pequenos (sem milhar) e grandes (vários grupos)
+    return np.concatenate([rng.integers(0, 100_000, 500), rng.integers(0, 10**12, 500)])
+
+@pytest.mark.parametrize("modelo", POSITIVOS)
+def test_positivos_com_e_sem_simbolo(centavos, modelo):
+    textos = pd.Series([modelo.format(brl(c)) for c in centavos], dtype='str')
+    assert decodificar_centavos(textos).tolist() == centavos.tolist()
+
+@pytest.mark.parametrize("modelo", NEGATIVOS)
+def test_negativos_em_qualquer_notacao(centavos, modelo):
+    textos = pd.Series([modelo.format(brl(c)) for c in centavos], dtype='str')
+    assert decodificar_centavos(textos).tolist() == (-centavos).tolist()
+
+@pytest.mark.parametrize("texto", [
+    "12.5.6", "1.23,45", "1,234", "1.2345", "12.34.567", "1..234", "1.234,", ",", "1,2,3",
+    "(5,00", "5,00)", "--5,00", "5-", "R$", "-", "()", "estorno", "12a", "1 234,56",
+])
+def test_separadores_fora_do_lugar_viram_nulo(texto):
+    assert decodificar_centavos(pd.Series([texto, "1,00"], dtype='str')).isna().tolist() == [True, False]
+
+@pytest.mark.parametrize("vazio", ["", "   ", None, np.nan])
+def test_vazios_viram_nulo(vazio):
+    resultado = decodificar_centavos(pd.Series(["R$ 2,50", vazio], dtype=object))
+    assert resultado.iloc[0] == 250 and pd.isna(resultado.iloc[1])
+
+def test_ponto_decimal_e_milhar_sem_virgula():
+    textos = pd.Series(["12.50", "12.5", ".5", "1.234", "1.234.567", "7"], dtype='str')
+    assert decodificar_centavos(textos).tolist() == [1250, 1250, 50, 123400, 123456700, 700]
+
+def test_celulas_numericas_e_textos_misturados():
+    valores = pd.Series([12.5, "1.234,56", None, 3, "R$ (0,10)"], dtype=object)
+    assert decodificar_centavos(valores).tolist() == [1250, 123456, pd.NA, 300, -10]
+
+def test_indice_preservado():
+    valores = pd.Series(["1,00", "x", "2,00"], index=[10, 20, 30], dtype='str')
+    assert decodificar_reais(valores).index.tolist() == [10, 20, 30]
+
+def test_ida_e_volta_pelo_formatador(centavos):
+    sinais = np.where(np.random.default_rng(SEMENTE + 1).random(len(centavos)) < 0.3, -1, 1)
+    valores = centavos * sinais
+    textos = formatar_reais(valores / 100)
+    assert decodificar_centavos(textos).tolist() == valores.tolist()
+
+def test_formatador_igual_ao_formato_escalar(centavos):
+    positivos = centavos[centavos > 0]  # f"{-0.0:.2f}" dá "-0,00"; o formatador dá "0,00"
+    reais = pd.Series(np.concatenate([positivos, -positivos]) / 100)
+    esperado = [f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in reais]
+    assert formatar_reais(reais).tolist() == esperado
+
+def test_formatador_vazios_e_reais_inteiros():
+    assert formatar_reais([None, np.nan, 0]).tolist() == ["R$ -", "R$ -", "R$ 0,00"]
+    assert formatar_reais([1234.4, -5], casas=0, prefixo='').tolist() == ["1.234", "-5"]